@@ -69,6 +69,31 @@ class Log:
         # Following will get set based on the SUT DisplayName from the properties.json when the tool runs...
         # Path of SUTs destination log folder within the general logs folder
         self.SUT_log_Folder = None
+        # run statistics (connection pool etc.) reported at CLOSE, name -> dict of counters
+        self.RunStats = dict()
+        # timing percentiles and sizes of the requests of the run (rf_utility.RequestStats
+        # summary), added to the run Summary at CLOSE
+        self.RequestTimings = None
+        # per-assertion profile of the run ranked by wall time (assertion_profiler.report()),
+        # written as a table at CLOSE and added to the run Summary
+        self.AssertionProfile = None
+        # in-memory copy of the rules logged during the run, flushed to LogDataPath at assertion
+        # boundaries and merged into AssertionLogs.json at CLOSE. Both temporary files move into
+        # the SUT's log folder at OPEN, so SUTs run in parallel do not share them
+        self.LogData = None
+        self.LogDataFileName = 'log.json'
+        self.LogDataPath = self.LogDataFileName
+        # optional append-only journal of the changes made since the last flush, so that a crash
+        # between assertion boundaries loses nothing ("LogJournal" property of the SUT)
+        self.LogJournalFileName = 'log.journal'
+        self.LogJournalPath = self.LogJournalFileName
+        self.LogJournalHandle = None
+        # results of all the runs, read by the HTML log viewer
+        self.AssertionLogsPath = os.path.join('HTML_Log_Viewer', 'AssertionLogs.json')
+        # if False, the result of the run is not merged into AssertionLogsPath at CLOSE but only
+        # kept in RunResult (run key, data), for a parent process to merge
+        self.MergeAssertionLogs = True
+        self.RunResult = None
 
     ###############################################################################################
     # Name: init_xl
@@ -78,6 +103,15 @@ class Log:
     def init_xl(self):
         self.XlAssertionSheet = 0
         self.XlAssertionWb = 0
+        # changes to the workbook are made in memory and saved according to the flush policy:
+        # 'assertion' (default) at the end of each assertion, 'close' only at CLOSE, 'always' on
+        # every change. Set thru the optional "XlFlushPolicy" property of the SUT
+        self.XlFlushPolicy = 'assertion'
+        self.XlDirty = False
+        # assertion id -> row of the assertion in the spreadsheet, built by index_assertions_xl
+        self.XlRowIndex = dict()
+        # assertion id -> rows of the same id after the first one, which are never marked
+        self.XlDuplicateRows = dict()
 
         self.RedfishHyperlinkRow = 4
         self.RedfishHyperlinkCol = 2
@@ -230,16 +264,44 @@ class Log:
         # get a 'handle to the assertions sheet
         self.XlAssertionSheet = self.XlAssertionWb.active
 
+        self.index_assertions_xl()
+
         return 1
     #
     ## end open_assertions_xl()
 
+    ###############################################################################################
+    # Name: index_assertions_xl()
+    #   Reads the assertion id column of the spreadsheet once and maps each assertion id to its
+    #   row. If an id appears more than once the first row is used, as a scan of the sheet would;
+    #   the other rows are recorded in XlDuplicateRows and reported once
+    ###############################################################################################
+    def index_assertions_xl(self):
+        self.XlRowIndex = dict()
+        self.XlDuplicateRows = dict()
+        row_cnt = 1
+        for row in self.XlAssertionSheet.iter_rows(min_row=1, min_col=self.Assertion_ID_column, max_col=self.Assertion_ID_column):
+            row_assertion_id = row[0].value
+            if row_assertion_id is not None:
+                if row_assertion_id in self.XlRowIndex:
+                    self.XlDuplicateRows.setdefault(row_assertion_id, []).append(row_cnt)
+                else:
+                    self.XlRowIndex[row_assertion_id] = row_cnt
+            row_cnt += 1
+        if self.XlDuplicateRows:
+            duplicate_ids = sorted(str(row_assertion_id) for row_assertion_id in self.XlDuplicateRows)
+            print('WARN: %d Assertion IDs (%s%s) are in more than one row of the assertion xlxs file, only their first row is updated'
+                  % (len(duplicate_ids), ', '.join(duplicate_ids[:5]), ', ...' if len(duplicate_ids) > 5 else ''))
+    #
+    ## end index_assertions_xl()
+
     ##
     # save changes to the assertion file
     ##
     def save_assertions_xl(self):
         try:
             self.XlAssertionWb.save(self.SUT_XlDestPath)
+            self.XlDirty = False
             ## success
             return 1
         except Exception as e:
@@ -249,6 +311,25 @@ class Log:
             print('Exception: {}'.format(e))
             return 0
 
+    ##
+    # note a change to the assertion file, saved right away only under the 'always' flush policy
+    ##
+    def xl_changed(self):
+        self.XlDirty = True
+        if self.XlFlushPolicy == 'always':
+            return self.save_assertions_xl()
+        return 1
+
+    ##
+    # save pending changes to the assertion file at an assertion boundary or at CLOSE
+    ##
+    def flush_assertions_xl(self, log_control):
+        if not self.XlDirty:
+            return 1
+        if log_control == 'CLOSE' or self.XlFlushPolicy == 'assertion':
+            return self.save_assertions_xl()
+        return 1
+
     ###############################################################################################
     # Name: assertion_id_row(assertion_id)
     #   Takes an assertion id as a key (string), locate the row in the spreadsheet containing
@@ -259,16 +340,10 @@ class Log:
     ###############################################################################################
     def assertion_id_row(self, assertion_id):
 
-        asx_handle = self.XlAssertionSheet
-
         #find the assertion id in the xls file...
-        row_cnt=1
-        for row in asx_handle.iter_rows(min_row=1):
-            row_assertion_id = asx_handle.cell(row=row_cnt, column=self.Assertion_ID_column).value
-            if row_assertion_id == assertion_id :
-                ## success
-                return row_cnt
-            row_cnt += 1
+        if assertion_id in self.XlRowIndex:
+            ## success
+            return self.XlRowIndex[assertion_id]
 
         ## failure
         print('Operational ERROR unable to find Assertion ID %s in the assertion xlxs file' % assertion_id)
@@ -313,12 +388,101 @@ class Log:
             elif (pwf_stat == self.INFO):
                 asx_handle.cell(row=zrow, column=self.Assertion_ID_column).fill = self.xl_INFO
 
-            self.save_assertions_xl()
+            self.xl_changed()
 
         return assert_descr
     #
     ## end assert_xl()
 
+    ###############################################################################################
+    # Name: set_sut_log_folder(SUT_prop)
+    #   Sets (creating it if needed) the log folder of the SUT within the general logs folder, based
+    #   on the SUT DisplayName, and places the temporary rule data files in it
+    ###############################################################################################
+    def set_sut_log_folder(self, SUT_prop):
+        self.SUT_log_Folder = os.path.join(self.LogDestinationPath, SUT_prop['DisplayName'])
+        if not os.path.isdir(self.SUT_log_Folder):
+            try:
+                os.makedirs(self.SUT_log_Folder)
+                os.chmod(self.SUT_log_Folder,0o777)
+            except Exception as inst:
+                print('Operational ERROR - Tool was unable to create a Log folder for current SUT. Try placing a folder named: %s in the script directory: %s \
+                manually and try running the tool again.' % (SUT_prop['DisplayName'], self.LogDestinationPath))
+                print (type(inst))     # the exception instance
+                print (inst.args)
+                exit(0)
+        self.LogDataPath = os.path.join(self.SUT_log_Folder, self.LogDataFileName)
+        self.LogJournalPath = os.path.join(self.SUT_log_Folder, self.LogJournalFileName)
+
+    ###############################################################################################
+    # Name: merge_assertion_logs(run_key, data)
+    #   Adds the result data of a run to AssertionLogs.json under run_key (the run's date/time);
+    #   if another run, e.g. of another SUT, already has the same key, the SUT name is appended
+    ###############################################################################################
+    def merge_assertion_logs(self, run_key, data):
+        assertionResult = {}
+        if os.path.isfile(self.AssertionLogsPath):
+            with open(self.AssertionLogsPath, mode='r') as fr:
+                assertionResult = json.load(fr)
+        if run_key in assertionResult:
+            run_key = '%s : %s' % (run_key, data['Summary']['Description'])
+        assertionResult[run_key] = data
+
+        # Writes assertion data to a global AssertionLogs.json file that is
+        # processed by the HTML log viewer.
+        tmp_path = self.AssertionLogsPath + '.tmp'
+        with open(tmp_path, mode='w') as fw:
+            json.dump(assertionResult, fw, sort_keys=True, indent=4)
+        os.replace(tmp_path, self.AssertionLogsPath)
+
+    ###############################################################################################
+    # Name: load_log_data()
+    #   Returns the in-memory rule data of the run. On first use it is initialized from the
+    #   temporary log.json and journal a previous run may have left behind, as the tool always did.
+    ###############################################################################################
+    def load_log_data(self):
+        if self.LogData is None:
+            self.LogData = {}
+            if os.path.isfile(self.LogDataPath):
+                with open(self.LogDataPath, mode='r') as fr:
+                    self.LogData = json.load(fr)
+            if os.path.isfile(self.LogJournalPath):
+                with open(self.LogJournalPath, mode='r') as fr:
+                    for line in fr:
+                        try:
+                            key, value = json.loads(line)
+                        except ValueError:
+                            # a partly written last line
+                            break
+                        self.LogData[key] = value
+        return self.LogData
+
+    ###############################################################################################
+    # Name: journal_log_data(key)
+    #   Appends the current value of a top level key of the rule data to the journal, if the
+    #   journal is enabled
+    ###############################################################################################
+    def journal_log_data(self, key):
+        if self.LogJournalHandle:
+            self.LogJournalHandle.write(json.dumps([key, self.LogData[key]]) + '\n')
+            self.LogJournalHandle.flush()
+            os.fsync(self.LogJournalHandle.fileno())
+
+    ###############################################################################################
+    # Name: flush_log_data()
+    #   Writes the in-memory rule data to log.json and starts a new journal
+    ###############################################################################################
+    def flush_log_data(self):
+        if self.LogData is None:
+            return
+        tmp_path = self.LogDataPath + '.tmp'
+        with open(tmp_path, 'w') as fw:
+            json.dump(self.LogData, fw, sort_keys=True, indent=4)
+        os.replace(tmp_path, self.LogDataPath)
+        if self.LogJournalHandle:
+            self.LogJournalHandle.seek(0)
+            self.LogJournalHandle.truncate()
+
     ###############################################################################################
     # Name: assertion_log(log_control, log_string, SUT_prop = None, service_root = None)
     #   Takes Log control key (OPEN, CLOSE, XL_COMMENT, TX_COMMENT and line) and log message string
@@ -338,20 +502,13 @@ class Log:
     ################################################################################################
     def assertion_log(self, log_control, log_string, SUT_prop = None, service_root = None) :
 
-        # Initialized a data dictionary that stores induvidual rules per tool
-        # run.
-
-        data = {}
+        # The data dictionary that stores induvidual rules per tool run is kept in memory and
+        # written to log.json at assertion boundaries
 
-        # Checks if log.json exists, which store temporary data while the tool
-        # is still running.
-
-        if not os.path.isfile('log.json'):
-            with open('log.json', mode='w') as fw:
-                json.dump(data, fw)
+        if (log_control == 'OPEN' and SUT_prop and service_root):
+            self.set_sut_log_folder(SUT_prop)
 
-        with open('log.json', mode='r') as fr:
-            data = json.load(fr)
+        data = self.load_log_data()
 
         assertion_id = self.AssertionID
 
@@ -362,6 +519,7 @@ class Log:
 
         if not assertion_id in data:
             data[assertion_id] = singleRule
+            self.journal_log_data(assertion_id)
         else:
             singleRule = data[assertion_id]
 
@@ -374,17 +532,13 @@ class Log:
             # Set start time for assertion
             data['Start Time'] = time.time()
 
-            self.SUT_log_Folder = os.path.join(self.LogDestinationPath, SUT_prop['DisplayName'])
-            if not os.path.isdir(self.SUT_log_Folder):
+            if SUT_prop.get('LogJournal', 'no').lower() == 'yes' and not self.LogJournalHandle:
                 try:
-                    os.makedirs(self.SUT_log_Folder)
-                    os.chmod(self.SUT_log_Folder,0o777)
+                    self.LogJournalHandle = open(self.LogJournalPath, 'a')
                 except Exception as inst:
-                    print('Operational ERROR - Tool was unable to create a Log folder for current SUT. Try placing a folder named: %s in the script directory: %s \
-                    manually and try running the tool again.' % (SUT_prop['DisplayName'], self.LogDestinationPath))
-                    print (type(inst))     # the exception instance
+                    print('Operational ERROR - unable to create/open the log journal %s' % self.LogJournalPath)
                     print (inst.args)
-                    exit(0)
+            self.flush_log_data()
 
             # open the text log file
             self.TextLogPath = os.path.join(self.SUT_log_Folder, self.TxtFileName)
@@ -410,6 +564,11 @@ class Log:
                 print (inst.args)
                 exit(0)
 
+            self.XlFlushPolicy = SUT_prop.get('XlFlushPolicy', 'assertion').lower()
+            if self.XlFlushPolicy not in ('assertion', 'close', 'always'):
+                print('Operational ERROR - unknown XlFlushPolicy %s, using assertion' % self.XlFlushPolicy)
+                self.XlFlushPolicy = 'assertion'
+
             self.open_assertions_xl()
 
             if (self.XlAssertionSheet == 0):
@@ -455,6 +614,12 @@ class Log:
             #self.assertion_log('line', completion_str)
             #self.assertion_log('XL_LOG_HEADER', completion_str)
 
+            # save whatever the flush policy has held back
+            self.flush_assertions_xl(log_control)
+
+            if self.AssertionProfile:
+                self.assertion_profile_log(self.AssertionProfile)
+
             self.TextLogHandle.close()
 
             print(' Assertions check successfully completed. Please see assertion spreadsheet: %s for checked assertions summary and log files: %s and %s for detailed log\n' % (self.XlRunPath, self.SUT_XlDestPath, self.TextLogPath))
@@ -462,15 +627,6 @@ class Log:
 
             # Adds the final results as the assertions come to a completion
 
-            assertionResult = {}
-
-            if not os.path.isfile('HTML_Log_Viewer/AssertionLogs.json'):
-                with open('HTML_Log_Viewer/AssertionLogs.json', mode='w') as fw:
-                    json.dump(assertionResult, fw)
-
-            with open('HTML_Log_Viewer/AssertionLogs.json', mode='r') as fr:
-                assertionResult = json.load(fr)
-
             #datetime string and total run time calculation
             dstr = str(datetime.now().strftime("%m/%d/%Y : %H%M%S"))
             start = data['Start Time']
@@ -485,16 +641,25 @@ class Log:
             "Cached_URIs":SUT_prop['NumUrisToCache'],
             "Run_Time": runTimeStr
             }
-
-            assertionResult[dstr] = data
-
-            # Writes assertion data to a global AssertionLogs.json file that is
-            # processed by the HTML log viewer.
-
-            with open('HTML_Log_Viewer/AssertionLogs.json', mode='w') as fw:
-                json.dump(assertionResult, fw, sort_keys=True, indent=4)
-
-            os.remove('log.json')
+            if self.RequestTimings:
+                data['Summary']['Request_Timings'] = self.RequestTimings
+            if self.RunStats:
+                data['Summary']['Run_Stats'] = self.RunStats
+            if self.AssertionProfile:
+                data['Summary']['Assertion_Profile'] = self.AssertionProfile
+
+            self.RunResult = (dstr, data)
+            if self.MergeAssertionLogs:
+                self.merge_assertion_logs(dstr, data)
+
+            if os.path.isfile(self.LogDataPath):
+                os.remove(self.LogDataPath)
+            if self.LogJournalHandle:
+                self.LogJournalHandle.close()
+                self.LogJournalHandle = None
+            if os.path.isfile(self.LogJournalPath):
+                os.remove(self.LogJournalPath)
+            self.LogData = None
 
             return (1)
 
@@ -514,7 +679,7 @@ class Log:
             log_string = self.XlAssertionSheet.cell(row=self.assertion_logHeaderRow, column=self.assertion_logHeaderCol).value + ' :: ' + log_string
             self.XlAssertionSheet.cell(row=self.assertion_logHeaderRow, column=self.assertion_logHeaderCol).value = log_string
 
-            self.save_assertions_xl()
+            self.xl_changed()
 
         # pass fail to the text log file and color code the assertion row in the assertion spreadsheet
         # and increment pass/warn/fail counters
@@ -524,12 +689,14 @@ class Log:
             assertion_description = self.assert_xl(assertion_id, log_control)
 
             singleRule['Status'] = log_control
+            self.journal_log_data(assertion_id)
 
             # log pass/fail status to the text log
             if (log_control != self.PASS or log_control != self.INCOMPLETE):
                 # include the assertion description in the text log
                 log_string =  ('Assertion Description: %s\n<--- Assertion %s: %s\n' % (assertion_description.encode('utf-8'), self.AssertionID, log_control)) # Assertion Descriptn and Status
                 singleRule['Description'] = assertion_description
+                self.journal_log_data(assertion_id)
             else:
                 log_string =  ('<--- Assertion %s: %s\n' % (self.AssertionID, log_control))
 
@@ -548,7 +715,7 @@ class Log:
                     if current_cell_value == None:
                         current_cell_value = ''
                     self.XlAssertionSheet.cell(row=xl_row, column=self.Assertion_comment_column).value = current_cell_value + log_string
-                self.save_assertions_xl()
+                self.xl_changed()
 
         # write a line into the text log file and/or console
         if ((log_control == 'line') or (log_control == 'TX_COMMENT')) :
@@ -563,16 +730,46 @@ class Log:
                 print(log_string +'\n')
 
             singleRule['Comment'] = log_string
+            self.journal_log_data(assertion_id)
 
-        # Temporary storage of a rule
-        with open('log.json', 'w') as fw:
-            json.dump(data, fw, sort_keys=True, indent=4)
+        # Temporary storage of the rules and the spreadsheet at the end of each assertion
+        if log_control in (self.PASS, self.WARN, self.FAIL, self.INCOMPLETE, self.INFO):
+            self.flush_log_data()
+            self.flush_assertions_xl(log_control)
 
         # success
         return(1)
     #
     ## end _assertion_log
 
+    ###############################################################################################
+    # Name: run_stats_log(stats_name, stats)
+    #   Takes a name and a dictionary of run statistics (e.g. connection pool hits/misses), writes
+    #   them to the text log and console and keeps them for the run Summary written at CLOSE
+    ###############################################################################################
+    def run_stats_log(self, stats_name, stats):
+        self.RunStats[stats_name] = stats
+        stats_string = '%s: %s' % (stats_name, ' '.join('%s= %s' % (key, value) for key, value in stats.items()))
+        self.TextLogHandle.write('\n' + stats_string + '\n')
+        print(stats_string)
+
+    ###############################################################################################
+    # Name: assertion_profile_log(profile)
+    #   Takes the per-assertion profile of the run (assertion_profiler.report()) and writes it to
+    #   the text log and console as a table, costliest assertion first
+    ###############################################################################################
+    def assertion_profile_log(self, profile):
+        row_format = '%4s  %-10s %9s %9s  %-32s %6s %6s %11s %11s'
+        lines = ['', 'Assertion Profile:',
+                 row_format % ('Rank', 'Assertion', 'Wall s', 'CPU s', 'Requests', 'Hits', 'Misses', 'Bytes Sent', 'Bytes Recv')]
+        for rank, row in enumerate(profile, 1):
+            requests = ' '.join('%s=%s' % (method, count) for method, count in row['Requests'].items()) or '-'
+            lines.append(row_format % (rank, row['Assertion'], '%.3f' % row['Wall_Time'], '%.3f' % row['CPU_Time'], requests,
+                                       row['Cache_Hits'], row['Cache_Misses'], row['Bytes_Sent'], row['Bytes_Received']))
+        profile_string = '\n'.join(lines)
+        self.TextLogHandle.write(profile_string + '\n')
+        print(profile_string)
+
     ###############################################################################################
     # Name: schema_log()         WIP
     #   WIP, based on a log file created thru init_logfile, we can access it
@@ -0,0 +1,377 @@
+# Copyright Notice:
+# Copyright 2016-2019 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Service-Conformance-Check/blob/main/LICENSE.md
+
+###################################################################################################
+# File: rf_benchmark.py
+#   This module measures the throughput of the tool itself against generated Redfish trees of
+#   given sizes served by the simulator (rf_simulator.py) in a separate process, so that versions
+#   of the tool can be compared and performance regressions caught before a new version is used.
+#   For every tree size it measures:
+#       Crawl: SUT.collect_relative_uris over the whole tree
+#       Cache: SUT.initialize_cache filling the response cache, and http_cached_GET lookups
+#       Schema Lookup: SchemaModel type and property lookups for the cached resources
+#       Run: rf_client.setup_sut_obj and rfs_test.run, end to end (unless --skip-run)
+#   and once for the run:
+#       Schema Model: parsing the CSDL schema files, and saving/loading the schema model snapshot
+#       Assertion Log: Log.assertion_log lines and assertions logged per second
+#   The results are saved as JSON to <date-time>_benchmark.json in the logs folder (or --output)
+#   and, with --baseline, compared to an earlier results file: a rate more than --tolerance percent
+#   lower, or a time more than --tolerance percent higher, is reported as a regression and the
+#   benchmark exits with status 1.
+#
+#   Run it with e.g.:
+#       python rf_benchmark.py --resources 1000,10000,100000 --skip-run
+###################################################################################################
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import contextlib
+import multiprocessing
+from collections import OrderedDict
+from datetime import datetime
+
+import rf_client
+import rf_simulator
+import rfs_test
+import logger
+from rfs_test import assertion_registry
+from schema import SchemaModel, save_schema_model_snapshot, load_schema_model_snapshot
+from rf_schema_source import DirectorySchemaSource, ZipSchemaSource
+
+## credentials the simulator is started with
+Benchmark_Login = ('root', 'calvin')
+## file the console output of the tool goes to while it is measured, set by main()
+Console_Log = os.devnull
+
+###################################################################################################
+# Name: serve_simulator(systems, options, port_queue, stop_event)
+#   Runs in the simulator process: generates a tree with the given number of systems, serves it
+#   on a free port of 127.0.0.1 (put in port_queue along with the number of resources) until
+#   stop_event is set
+###################################################################################################
+def serve_simulator(systems, options, port_queue, stop_event):
+    resources = rf_simulator.generate_mockup(systems)
+    simulator = rf_simulator.RedfishSimulator(resources, None, Benchmark_Login[0], Benchmark_Login[1], **options)
+    port_queue.put((simulator.start(), len(resources)))
+    stop_event.wait()
+    simulator.stop()
+
+###################################################################################################
+# Name: start_simulator(resources, options)
+#   Starts a simulator process serving a generated tree of about the given number of resources
+# Returns:
+#   process, stop event, port, number of resources served
+###################################################################################################
+def start_simulator(resources, options):
+    fixed = len(rf_simulator.generate_mockup(0))
+    per_system = len(rf_simulator.generate_mockup(1)) - fixed
+    systems = max(1, (resources - fixed) // per_system)
+    port_queue = multiprocessing.Queue()
+    stop_event = multiprocessing.Event()
+    process = multiprocessing.Process(target=serve_simulator, args=(systems, options, port_queue, stop_event))
+    process.daemon = True
+    process.start()
+    port, served = port_queue.get()
+    return process, stop_event, port, served
+
+###################################################################################################
+# Name: benchmark_sut_prop(resources, port, sut_properties)
+#   Returns the properties of a SUT for the simulator on port, with the extra SUT properties
+###################################################################################################
+def benchmark_sut_prop(resources, port, sut_properties):
+    sut_prop = OrderedDict([('DisplayName', 'benchmark_%d' % resources), ('DnsName', '127.0.0.1:%d' % port),
+                            ('LoginName', Benchmark_Login[0]), ('Password', Benchmark_Login[1]), ('UseHttp', 'yes'),
+                            ('NumUrisToCache', '0'), ('AllowAction_LogServiceClearLog', 'no')])
+    sut_prop.update(sut_properties)
+    return sut_prop
+
+###################################################################################################
+# Name: timed(function, *args)
+#   Calls the function with the console output of the tool appended to Console_Log
+# Returns:
+#   seconds taken, result of the function
+###################################################################################################
+def timed(function, *args):
+    with open(Console_Log, 'a') as console, contextlib.redirect_stdout(console):
+        start = time.perf_counter()
+        result = function(*args)
+        return time.perf_counter() - start, result
+
+###################################################################################################
+# Name: rate(count, seconds)
+#   Returns count per second, rounded for the results file
+###################################################################################################
+def rate(count, seconds):
+    return round(count / seconds, 1) if seconds > 0 else None
+
+###################################################################################################
+# Name: benchmark_crawl(sut)
+#   Measures collecting the uris of the whole tree from the service root
+###################################################################################################
+def benchmark_crawl(sut):
+    seconds, result = timed(sut.collect_relative_uris, sut.Redfish_URIs['Service_Root'])
+    return OrderedDict([('Seconds', round(seconds, 3)), ('Resources', len(sut.relative_uris)),
+                        ('Resources Per Second', rate(len(sut.relative_uris), seconds))])
+
+###################################################################################################
+# Name: benchmark_cache(sut, lookups)
+#   Measures filling the response cache with the crawled uris (saving its snapshot to the log
+#   folder of the SUT, as a run does), then looking up lookups cached responses
+###################################################################################################
+def benchmark_cache(sut, lookups):
+    log = logger.Log()
+    log.set_sut_log_folder(sut.SUT_prop)
+    fill_seconds, result = timed(sut.initialize_cache, log.SUT_log_Folder)
+    rq_headers = sut.request_headers()
+    uris = list(sut.relative_uris.values())
+
+    def look_up():
+        for index in range(lookups):
+            sut.http_cached_GET(uris[index % len(uris)], rq_headers, 'on')
+
+    lookup_seconds, result = timed(look_up)
+    stats = sut.response_cache_stats()
+    return OrderedDict([('Fill Seconds', round(fill_seconds, 3)), ('Entries', stats['Entries']),
+                        ('Bytes', stats['Bytes']), ('Fill Resources Per Second', rate(stats['Entries'], fill_seconds)),
+                        ('Lookups', lookups), ('Lookup Seconds', round(lookup_seconds, 3)),
+                        ('Lookups Per Second', rate(lookups, lookup_seconds))])
+
+###################################################################################################
+# Name: benchmark_schema_lookup(sut, csdl_schema_model, passes)
+#   Measures looking up the type of every cached resource, and every property of its payload
+#   in that type, as the data model assertions do, passes times
+###################################################################################################
+def benchmark_schema_lookup(sut, csdl_schema_model, passes):
+    responses = [sut.response_cache.get(uri) for uri in sut.relative_uris.values()]
+    payloads = [response[0] for response in responses
+                if response is not None and isinstance(response[0], dict) and '@odata.type' in response[0]]
+    counts = [0, 0]
+
+    def look_up():
+        for index in range(passes):
+            for payload in payloads:
+                namespace, typename = csdl_schema_model.get_resource_namespace_typename(payload['@odata.type'])
+                counts[0] += 1
+                if namespace and typename:
+                    for key in payload:
+                        csdl_schema_model.verify_property_in_resource_recur(typename, key, namespace)
+                        counts[1] += 1
+
+    seconds, result = timed(look_up)
+    return OrderedDict([('Seconds', round(seconds, 3)), ('Type Lookups', counts[0]), ('Property Lookups', counts[1]),
+                        ('Lookups Per Second', rate(counts[0] + counts[1], seconds))])
+
+###################################################################################################
+# Name: benchmark_run(sut_prop)
+#   Measures setting up the tool for the SUT (rf_client.setup_sut_obj) and running the
+#   assertions against it (rfs_test.run). If the tool exits, the error is in Console_Log
+###################################################################################################
+def benchmark_run(sut_prop):
+    sut = rf_client.init_sut_obj(sut_prop)
+    try:
+        setup_seconds, result = timed(rf_client.setup_sut_obj, sut)
+        run_seconds, summary = timed(rfs_test.run, sut, False)
+    except SystemExit:
+        return OrderedDict([('Error', 'the tool exited, see %s' % Console_Log)])
+    return OrderedDict([('Setup Seconds', round(setup_seconds, 3)), ('Run Seconds', round(run_seconds, 3)),
+                        ('Passed', summary['Passed']), ('Warn', summary['Warn']), ('Failed', summary['Failed']),
+                        ('Info', summary['Info'])])
+
+###################################################################################################
+# Name: benchmark_schema_model(schema_source, workers)
+#   Measures parsing the CSDL schema files of the source into a SchemaModel, and saving and
+#   loading its snapshot
+# Returns:
+#   results, the SchemaModel
+###################################################################################################
+def benchmark_schema_model(schema_source, workers):
+    csdl_schema_model = SchemaModel()
+    parse_seconds, result = timed(csdl_schema_model.serialize_schema_source, schema_source, workers)
+    snapshot_path = os.path.join(tempfile.mkdtemp(), 'benchmark_' + os.path.basename(schema_source.snapshot_path))
+    save_seconds, result = timed(save_schema_model_snapshot, csdl_schema_model, snapshot_path, 'benchmark')
+    load_seconds, result = timed(load_schema_model_snapshot, snapshot_path, 'benchmark')
+    snapshot_bytes = os.path.getsize(snapshot_path)
+    os.remove(snapshot_path)
+    os.rmdir(os.path.dirname(snapshot_path))
+    return OrderedDict([('Schema Files', len(schema_source.csdl_names())), ('Parse Workers', workers),
+                        ('Parse Seconds', round(parse_seconds, 3)), ('Snapshot Save Seconds', round(save_seconds, 3)),
+                        ('Snapshot Load Seconds', round(load_seconds, 3)), ('Snapshot Bytes', snapshot_bytes)]), csdl_schema_model
+
+###################################################################################################
+# Name: benchmark_assertion_log(sut_properties, assertions, lines)
+#   Measures logging lines through Log.assertion_log in the given number of assertions, each
+#   ended with a status that flushes the log data and spreadsheet as a run does
+###################################################################################################
+def benchmark_assertion_log(sut_properties, assertions, lines):
+    sut_prop = benchmark_sut_prop(0, 0, sut_properties)
+    sut_prop['DisplayName'] = 'benchmark_log'
+    assertion_ids = [assertion_info.assertion_id for assertion_info in assertion_registry.registry.values()]
+    log = logger.Log()
+    log.MergeAssertionLogs = False
+    log.init_xl()
+    with open(Console_Log, 'a') as console, contextlib.redirect_stdout(console):
+        log.assertion_log('OPEN', None, sut_prop, '/redfish/v1/')
+
+    def log_assertions():
+        for index in range(assertions):
+            log.AssertionID = assertion_ids[index % len(assertion_ids)]
+            log.assertion_log('BEGIN_ASSERTION', None)
+            for line in range(lines):
+                log.assertion_log('line', '~ benchmark line %d of assertion %s' % (line, log.AssertionID))
+            log.assertion_log(log.PASS, None)
+
+    seconds, result = timed(log_assertions)
+    with open(Console_Log, 'a') as console, contextlib.redirect_stdout(console):
+        log.assertion_log('CLOSE', None, sut_prop)
+    return OrderedDict([('Seconds', round(seconds, 3)), ('Assertions', assertions), ('Lines', assertions * lines),
+                        ('Assertions Per Second', rate(assertions, seconds)),
+                        ('Lines Per Second', rate(assertions * lines, seconds))])
+
+###################################################################################################
+# Name: benchmark_tree(resources, args, sut_properties, csdl_schema_model)
+#   Starts the simulator with a tree of about the given number of resources and measures the
+#   tool against it
+###################################################################################################
+def benchmark_tree(resources, args, sut_properties, csdl_schema_model):
+    options = dict(latency=args.latency, jitter=args.jitter, seed=args.seed)
+    process, stop_event, port, served = start_simulator(resources, options)
+    try:
+        sut_prop = benchmark_sut_prop(resources, port, sut_properties)
+        results = OrderedDict([('Resources', resources), ('Served Resources', served)])
+        print('Benchmarking a tree of %d resources on port %d' % (served, port))
+
+        sut = rf_client.init_sut_obj(sut_prop)
+        results['Crawl'] = benchmark_crawl(sut)
+        print(' Crawl: %s' % results['Crawl'])
+        results['Cache'] = benchmark_cache(sut, args.lookups)
+        print(' Cache: %s' % results['Cache'])
+        results['Schema Lookup'] = benchmark_schema_lookup(sut, csdl_schema_model, args.lookup_passes)
+        print(' Schema Lookup: %s' % results['Schema Lookup'])
+        if not args.skip_run:
+            results['Run'] = benchmark_run(sut_prop)
+            print(' Run: %s' % results['Run'])
+        return results
+    finally:
+        stop_event.set()
+        process.join()
+
+###################################################################################################
+# Name: compare_results(results, baseline, tolerance)
+#   Takes the results of this run, those of an earlier run and a tolerance in percent, and
+#   returns the regressions found: rates ('... Per Second') more than tolerance lower, and times
+#   ('... Seconds') more than tolerance higher, than in the baseline
+###################################################################################################
+def compare_results(results, baseline, tolerance):
+    regressions = []
+
+    def compare(name, section, baseline_section):
+        for key, value in section.items():
+            old_value = baseline_section.get(key)
+            if not isinstance(value, (int, float)) or not isinstance(old_value, (int, float)) or old_value <= 0:
+                continue
+            change = 100.0 * (value - old_value) / old_value
+            if (key.endswith('Per Second') and change < -tolerance) or (key.endswith('Seconds') and change > tolerance):
+                regressions.append('%s %s: %s -> %s (%+.1f%%)' % (name, key, old_value, value, change))
+
+    for name in ('Schema Model', 'Assertion Log'):
+        if name in results and name in baseline:
+            compare(name, results[name], baseline[name])
+    baseline_trees = dict((tree['Resources'], tree) for tree in baseline.get('Trees', []))
+    for tree in results['Trees']:
+        for name, section in tree.items():
+            if isinstance(section, dict) and name in baseline_trees.get(tree['Resources'], {}):
+                compare('%d resources %s' % (tree['Resources'], name), section, baseline_trees[tree['Resources']][name])
+    return regressions
+
+###################################################################################################
+# Name: get_schema_source(schemas)
+#   Returns the schema source of a schema directory or schemas zip file, or if schemas is None,
+#   the one the properties.json settings give
+###################################################################################################
+def get_schema_source(schemas):
+    if schemas is None:
+        return rf_client.retrieve_schemas()
+    if os.path.isfile(schemas):
+        return ZipSchemaSource(schemas)
+    return DirectorySchemaSource(schemas, os.path.join(schemas, rf_client.xml_directory),
+                                 os.path.join(schemas, rf_client.json_directory))
+
+def main():
+    global Console_Log
+    arg_parser = argparse.ArgumentParser(description='Measure the throughput of the Redfish Service Conformance Check tool against simulated Redfish trees')
+    arg_parser.add_argument('--resources', default='1000', help='comma separated sizes of the trees, in resources (default 1000)')
+    arg_parser.add_argument('--schemas', help='schema directory or schemas zip file (default: the properties.json schema settings)')
+    arg_parser.add_argument('--schema-parse-workers', type=int, default=1, help='processes parsing the CSDL schema files (default 1)')
+    arg_parser.add_argument('--latency', type=float, default=0, help='simulator latency in milliseconds (default 0)')
+    arg_parser.add_argument('--jitter', type=float, default=0, help='simulator latency jitter in milliseconds (default 0)')
+    arg_parser.add_argument('--seed', type=int, default=0, help='simulator random seed (default 0)')
+    arg_parser.add_argument('--lookups', type=int, default=100000, help='cached response lookups per tree (default 100000)')
+    arg_parser.add_argument('--lookup-passes', type=int, default=10, help='passes of schema lookups over the cached resources (default 10)')
+    arg_parser.add_argument('--log-assertions', type=int, default=20, help='assertions logged in the assertion log benchmark (default 20)')
+    arg_parser.add_argument('--log-lines', type=int, default=200, help='lines logged per assertion (default 200)')
+    arg_parser.add_argument('--sut-property', action='append', default=[], metavar='NAME=VALUE',
+                            help='property of the benchmark SUTs, as in properties.json (e.g. CrawlConcurrency=8), may be repeated')
+    arg_parser.add_argument('--skip-run', action='store_true', help='do not run the assertions end to end')
+    arg_parser.add_argument('--output', help='results file (default: logs/<date-time>_benchmark.json)')
+    arg_parser.add_argument('--baseline', help='results file of an earlier run to compare with')
+    arg_parser.add_argument('--tolerance', type=float, default=20.0, help='change in percent reported as a regression (default 20)')
+    args = arg_parser.parse_args()
+
+    try:
+        sizes = [int(size) for size in args.resources.split(',') if size.strip()]
+        sut_properties = OrderedDict(item.split('=', 1) for item in args.sut_property)
+    except ValueError:
+        arg_parser.error('--resources must be comma separated numbers and --sut-property NAME=VALUE')
+
+    dstr = str(datetime.now().strftime("%Y%m%d-%H%M%S"))
+    log_destination_path = logger.Log().LogDestinationPath
+    if not os.path.isdir(log_destination_path):
+        os.makedirs(log_destination_path)
+    Console_Log = os.path.join(log_destination_path, dstr + '_benchmark-console.log')
+    print('Console output of the tool goes to %s' % Console_Log)
+    results = OrderedDict([('Tool Revision', rf_client.RedfishServiceCheck_Revision), ('Date', dstr),
+                           ('Python', platform.python_version()), ('Platform', platform.platform()),
+                           ('CPUs', multiprocessing.cpu_count()),
+                           ('Settings', OrderedDict([('Resources', sizes), ('Schemas', args.schemas),
+                                                     ('Schema Parse Workers', args.schema_parse_workers),
+                                                     ('Latency', args.latency), ('Jitter', args.jitter), ('Seed', args.seed),
+                                                     ('Lookups', args.lookups), ('Lookup Passes', args.lookup_passes),
+                                                     ('Log Assertions', args.log_assertions), ('Log Lines', args.log_lines),
+                                                     ('SUT Properties', sut_properties)]))])
+
+    schema_source = get_schema_source(args.schemas)
+    # the end-to-end runs read the schemas from the same source
+    rf_client.Schema_Source = schema_source
+    results['Schema Model'], csdl_schema_model = benchmark_schema_model(schema_source, args.schema_parse_workers)
+    print('Schema Model: %s' % results['Schema Model'])
+    results['Assertion Log'] = benchmark_assertion_log(sut_properties, args.log_assertions, args.log_lines)
+    print('Assertion Log: %s' % results['Assertion Log'])
+    results['Trees'] = [benchmark_tree(size, args, sut_properties, csdl_schema_model) for size in sizes]
+
+    output = args.output or os.path.join(log_destination_path, dstr + '_benchmark.json')
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=4)
+    print('Benchmark results saved to %s' % output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f, object_pairs_hook=OrderedDict)
+        if baseline.get('Settings') != json.loads(json.dumps(results['Settings'])):
+            print('WARN: the settings of %s differ from those of this run, the results may not be comparable' % args.baseline)
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print('Regressions compared to %s:' % args.baseline)
+            for regression in regressions:
+                print(' %s' % regression)
+            sys.exit(1)
+        print('No regressions compared to %s' % args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+# Copyright Notice:
+# Copyright 2016-2019 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Service-Conformance-Check/blob/main/LICENSE.md
+
+###################################################################################################
+# File: rf_cache.py
+#   This module contains the ResponseCache class which keeps the GET responses of the SUT sampled
+#   at the start of a run in memory for the assertions, within an optional byte budget and with an
+#   optional snapshot of them on disk (cache_uri_data.json), the JsonSchemaCache class which
+#   indexes and keeps the JSON schema documents the assertions look up, and the RequestCoalescer
+#   class which lets concurrent identical GET requests share one response
+#
+# Verified/operational Python revisions (Windows OS) :
+#       2.7.10
+#       3.4.3
+###################################################################################################
+import sys
+import json
+import copy
+import threading
+from collections import OrderedDict
+
+
+###################################################################################################
+# Class: ResponseCache
+#   Resident LRU cache of GET responses keyed by resource uri, holding the decoded payload, headers
+#   and status of every response received, not only the 200 OK ones. Entries are normalized through
+#   JSON (sorted keys) when stored and deep-copied when looked up, so callers get fresh objects
+#   exactly as they did when the assertions re-read the snapshot file. Each entry is accounted by
+#   the size of its JSON text; if max_bytes is a positive number, least recently used entries are
+#   evicted to keep the cache within that many bytes. If snapshot_path is set, write_snapshot()
+#   saves the entries to that file in the format of cache_uri_data.json.
+###################################################################################################
+class ResponseCache:
+    def __init__(self, snapshot_path = None, max_bytes = 0):
+        self.snapshot_path = snapshot_path
+        self.max_bytes = max_bytes
+        # resource uri -> (json_payload, headers, status, size), least recently used first
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.oversized = 0
+
+    ###############################################################################################
+    # Name: put(resource_uri, json_payload, headers, status)
+    #   Stores the GET response of resource_uri in the cache, evicting least recently used entries
+    #   if the byte budget is exceeded. A response larger than the whole budget is not stored.
+    # Return:
+    #   True if the response was stored, else False
+    ###############################################################################################
+    def put(self, resource_uri, json_payload, headers, status):
+        text = json.dumps([json_payload, headers, status], sort_keys=True)
+        size = len(text.encode('utf-8'))
+        json_payload, headers, status = json.loads(text)
+        with self.lock:
+            if resource_uri in self.entries:
+                self.size -= self.entries.pop(resource_uri)[3]
+            if self.max_bytes > 0 and size > self.max_bytes:
+                self.oversized += 1
+                return False
+            self.entries[resource_uri] = (json_payload, headers, status, size)
+            self.size += size
+            while self.max_bytes > 0 and self.size > self.max_bytes:
+                evicted_uri, evicted = self.entries.popitem(last=False)
+                self.size -= evicted[3]
+                self.evictions += 1
+        return True
+
+    ###############################################################################################
+    # Name: get(resource_uri)
+    #   Looks up the GET response of resource_uri, marks it most recently used and counts the hit
+    #   or miss
+    # Return:
+    #   (json_payload, headers, status) if resource_uri is cached, else None
+    ###############################################################################################
+    def get(self, resource_uri):
+        with self.lock:
+            entry = self.entries.pop(resource_uri, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries[resource_uri] = entry
+            self.hits += 1
+        json_payload, headers, status, size = entry
+        return copy.deepcopy(json_payload), copy.deepcopy(headers), status
+
+    ###############################################################################################
+    # Name: write_snapshot()
+    #   Writes all cached responses to snapshot_path, if one was given
+    ###############################################################################################
+    def write_snapshot(self):
+        if not self.snapshot_path:
+            return
+        snapshot = dict()
+        with self.lock:
+            for resource_uri, (json_payload, headers, status, size) in self.entries.items():
+                snapshot[resource_uri] = json_payload
+                snapshot[resource_uri + '_header'] = headers
+                snapshot[resource_uri + '_status'] = status
+            try:
+                with open(self.snapshot_path, 'w') as fp:
+                    json.dump(snapshot, fp, sort_keys=True, indent=4)
+            except (IOError, OSError) as err:
+                print('Error writing response cache snapshot %s: %s' % (self.snapshot_path, err))
+
+    ###############################################################################################
+    # Name: stats()
+    #   returns the number and total size of cached responses, the lookup hit/miss counts and how
+    #   many responses were evicted or too large to be cached
+    ###############################################################################################
+    def stats(self):
+        with self.lock:
+            return OrderedDict([('Entries', len(self.entries)), ('Bytes', self.size),
+                                ('Max Bytes', self.max_bytes if self.max_bytes > 0 else 'unbounded'),
+                                ('Hits', self.hits), ('Misses', self.misses),
+                                ('Evictions', self.evictions), ('Oversized', self.oversized)])
+
+
+###################################################################################################
+# Class: JsonSchemaCache
+#   Index of the JSON schema documents of a schema source (rf_schema_source) by namespace (the file
+#   name without .json, for example 'ComputerSystem' or 'ComputerSystem.v1_1_0'), built once when
+#   the cache is created, and LRU cache of the schema documents loaded from them. At most max_documents parsed
+#   documents are kept (all of them if max_documents is not a positive number). Documents are
+#   shared by all lookups and must not be changed by the callers.
+###################################################################################################
+class JsonSchemaCache:
+    def __init__(self, schema_source, max_documents = 0):
+        self.schema_source = schema_source
+        self.max_documents = max_documents
+        # namespace -> schema file name
+        self.index = dict()
+        try:
+            for schema_file in schema_source.json_names():
+                self.index[schema_file[:-len('.json')]] = schema_file
+        except (IOError, OSError) as err:
+            print('Error reading JSON schemas of %s: %s' % (schema_source.json_directory, err))
+        # namespace -> parsed schema document, least recently used first
+        self.documents = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    ###############################################################################################
+    # Name: get(namespace)
+    #   Looks up the JSON schema of namespace, loading it on a miss and marking it most recently used
+    # Return:
+    #   (schema document, schema file name), or (None, None) if there is no schema file for it
+    ###############################################################################################
+    def get(self, namespace):
+        schema_file = self.index.get(namespace)
+        if schema_file is None:
+            return None, None
+        with self.lock:
+            data = self.documents.pop(namespace, None)
+            if data is not None:
+                self.documents[namespace] = data
+                self.hits += 1
+                return data, schema_file
+            self.misses += 1
+        with self.schema_source.open_json(schema_file) as data_file:
+            data = json.load(data_file)
+        with self.lock:
+            self.documents[namespace] = data
+            while self.max_documents > 0 and len(self.documents) > self.max_documents:
+                self.documents.popitem(last=False)
+                self.evictions += 1
+        return data, schema_file
+
+    ###############################################################################################
+    # Name: stats()
+    #   returns the number of indexed schema files and cached documents, and the lookup hit/miss
+    #   and eviction counts
+    ###############################################################################################
+    def stats(self):
+        with self.lock:
+            return OrderedDict([('Schema Files', len(self.index)), ('Documents', len(self.documents)),
+                                ('Max Documents', self.max_documents if self.max_documents > 0 else 'unbounded'),
+                                ('Hits', self.hits), ('Misses', self.misses), ('Evictions', self.evictions)])
+
+
+###################################################################################################
+# Class: RequestCoalescer
+#   Single-flight coalescing of identical requests in flight at the same time. The first caller
+#   of request() for a key makes the request; callers asking for the same key before it has
+#   completed wait for it and get a deep copy of its response (or its exception) instead of
+#   making the request again. The response is only copied if a caller waited for it. Nothing is kept once the request has completed: a later call makes
+#   a new request.
+###################################################################################################
+class RequestCoalescer:
+    def __init__(self):
+        # key -> [completed event, response, exc_info, number of waiting callers] of the requests
+        # in flight
+        self.in_flight = dict()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.coalesced = 0
+
+    ###############################################################################################
+    # Name: request(key, function)
+    #   Returns function() -- or a copy of what it returned to a concurrent caller of the same key
+    ###############################################################################################
+    def request(self, key, function):
+        with self.lock:
+            flight = self.in_flight.get(key)
+            if flight is None:
+                flight = self.in_flight[key] = [threading.Event(), None, None, 0]
+                self.requests += 1
+                leader = True
+            else:
+                flight[3] += 1
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            flight[0].wait()
+            if flight[2] is not None:
+                raise flight[2][1]
+            return copy.deepcopy(flight[1])
+        response = None
+        try:
+            response = function()
+            return response
+        except:
+            flight[2] = sys.exc_info()
+            raise
+        finally:
+            with self.lock:
+                del self.in_flight[key]
+                waiting = flight[3]
+            # the caller may change the response: the waiting callers copy from a copy of their own
+            if waiting > 0 and flight[2] is None:
+                flight[1] = copy.deepcopy(response)
+            flight[0].set()
+
+    ###############################################################################################
+    # Name: stats()
+    #   returns the number of requests made and of requests saved by sharing them
+    ###############################################################################################
+    def stats(self):
+        with self.lock:
+            return OrderedDict([('Requests', self.requests), ('Coalesced', self.coalesced)])
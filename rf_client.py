@@ -23,6 +23,7 @@
 #       Please make sure that schema file version found in $metadata for SUT is the same as the
 #       version of files in the directory to get correct results...
 ###################################################################################################
+import hashlib
 import io
 import json
 import os
@@ -30,9 +31,15 @@ import requests
 import shutil
 import sys
 import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
 from urllib.parse import urljoin
 import zipfile
-from schema import SchemaModel
+from schema import SchemaModel, schema_bundle_hash, save_schema_model_snapshot, load_schema_model_snapshot
+from rf_schema_source import DirectorySchemaSource, ZipSchemaSource
+import logger
 import rfs_test
 from rf_sut import SUT
 
@@ -63,6 +70,21 @@ RedfishServiceCheck_Revision = "01.05.17"
 Server_Auth_Json_File = 'properties.json'
 json_directory = 'json-schema'
 xml_directory = 'metadata'
+## default folder (in the script directory) of the cache of downloaded schemas zip files, shared
+## by all SUTs and runs; each zip is kept as <sha256 of its content>.zip
+Schema_Zip_Cache_Folder = 'schema_zip_cache'
+## file in the zip cache folder mapping each schemas zip URL to the hash of its content and the
+## ETag / Last-Modified validators it was sent with
+Schema_Zip_Cache_Index_File = 'schema_zips.json'
+## file in the schema directory recording the URL and hash of the zip its schemas were extracted from
+Schema_Zip_Marker_File = 'schema_zip.json'
+## (connect, read) timeouts in seconds of the schemas zip download, so that a host which cannot
+## reach the server falls back to the cached zip quickly
+Schema_Zip_Timeout = (10, 60)
+## schema source (see rf_schema_source) set once the schema files have been downloaded or found
+## in place for this run, so that they are not retrieved again for each SUT (SUTs set up in
+## parallel would download them at once)
+Schema_Source = None
 
 
 ###############################################################################################
@@ -159,13 +181,72 @@ def get_sut_prop(server_index=None):
         exit(1)
 
 
+###############################################################################################
+# Name: get_sut_concurrency()
+#   Reads the optional "MaxConcurrentSUTs" setting of the SUT configuration in properties.json:
+#   the number of SUTs checked at the same time, each in its own process
+# Return:
+#   the number of SUTs to check at once, 1 (one after another) if not set or invalid
+###############################################################################################
+def get_sut_concurrency():
+    json_SUT_key = "RedfishServiceCheckTool_SUTConfiguration"
+    json_concurrency_subkey = "MaxConcurrentSUTs"
+
+    script_dir = os.path.dirname(__file__)
+    file_name = os.path.join(script_dir, Server_Auth_Json_File)
+
+    try:
+        with open(file_name) as data_file:
+            data = json.load(data_file)
+        max_concurrent = int(data[json_SUT_key].get(json_concurrency_subkey, "1"))
+    except (IOError, OSError, ValueError, KeyError, AttributeError, TypeError):
+        max_concurrent = 1
+    return max(max_concurrent, 1)
+
+
+###############################################################################################
+# Name: get_schema_parse_workers()
+#   Read properties.json for "SchemaParseWorkers" under "RedfishServiceCheckTool_SchemaFiles",
+#   the number of processes parsing the CSDL schema files
+# Return:
+#   the number of workers, by default the number of CPUs
+###############################################################################################
+def get_schema_parse_workers():
+    try:
+        workers = int(get_schema_files_setting("SchemaParseWorkers", os.cpu_count() or 1))
+    except (ValueError, TypeError):
+        workers = os.cpu_count() or 1
+    return max(workers, 1)
+
+
+###############################################################################################
+# Name: get_schema_files_setting(key, default)
+#   Read properties.json for an optional setting under "RedfishServiceCheckTool_SchemaFiles"
+# Return:
+#   the value of the setting, default if it is not set
+###############################################################################################
+def get_schema_files_setting(key, default):
+    json_schema_key = "RedfishServiceCheckTool_SchemaFiles"
+
+    script_dir = os.path.dirname(__file__)
+    file_name = os.path.join(script_dir, Server_Auth_Json_File)
+
+    try:
+        with open(file_name) as data_file:
+            data = json.load(data_file)
+        return data[json_schema_key].get(key, default)
+    except (IOError, OSError, ValueError, KeyError, AttributeError, TypeError):
+        return default
+
+
 ###############################################################################################
 # Name: get_sut_schema_settings()                                               
 #   Read properties.json for Redfish schemas directory "LocalSchemaDirectoryFolder"
 #   and "RetrieveDMTFSchemas". If RetrieveDMTFSchemas is 'Yes', then read properties.json
 #   further for SchemaRepository and ClientProxy and load it in schema_url and proxy_Dict resp.
 # Return:
-#   retrieve_dmtf_schemas: yes/no, schema directory path, schema repo url and proxy setting
+#   retrieve_dmtf_schemas: yes/no, schema directory path, schema repo url, proxy setting and
+#   the directory caching downloaded schema zip files
 #   else exits tool if any issue found in reading properties.json with error message
 ###############################################################################################
 def get_sut_schema_settings():
@@ -173,6 +254,7 @@ def get_sut_schema_settings():
     schema_repo_url = ''
     schema_zipfile = ''
     schema_zip_url = ''
+    schema_zip_cache_directory = ''
     proxy_Dict = {}
     retrieve_dmtf_schemas = ''
 
@@ -244,6 +326,11 @@ def get_sut_schema_settings():
                             schema_zip_url = urljoin(schema_repo_url, schema_zipfile)
                             print('Schemas zip URL = {}'.format(schema_zip_url))
 
+                            # optional, where downloaded schemas zip files are kept
+                            DMTFSchemas_subkey = "SchemaZipCacheFolder"
+                            schema_zip_cache_directory = data[Metadata_key][DMTFSchemas_key].get(DMTFSchemas_subkey,
+                                                                                                 Schema_Zip_Cache_Folder)
+
                             DMTFSchemas_subkey = "ClientProxy"
                             https_subkey = 'https_proxy'
                             http_subkey = 'http_proxy'
@@ -267,7 +354,7 @@ def get_sut_schema_settings():
         print('Operational ERROR: Opening/parsing the JSON configuration file %s' % file_name)
         exit(1)
 
-    return retrieve_dmtf_schemas, schema_directory, schema_zip_url, proxy_Dict
+    return retrieve_dmtf_schemas, schema_directory, schema_zip_url, proxy_Dict, schema_zip_cache_directory
 
 
 ###############################################################################################
@@ -360,13 +447,117 @@ def get_eventservice_params():
     return Event_Subscription, Submit_Test_Event
 
 
-def extract_schema_files(schema_url, zip_file, temp_dir_name, schema_path, file_ext, schema_type):
+def read_json_file(file_name):
+    """
+    Read a small JSON bookkeeping file (zip cache index or marker)
+    :param file_name: path of the file
+    :return: the JSON object read, or an empty dict if the file is missing or unreadable
+    """
+    try:
+        with open(file_name) as data_file:
+            data = json.load(data_file)
+        return data if isinstance(data, dict) else {}
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def write_json_file(file_name, data):
     """
-    Extract schema files of the given extension into a temp dir and then move them to the target dir
+    Write a small JSON bookkeeping file through a temp file, so that readers never see it half written
+    :param file_name: path of the file
+    :param data: the JSON object to write
+    """
+    tmp_name = '%s.%d.tmp' % (file_name, os.getpid())
+    try:
+        with open(tmp_name, 'w') as data_file:
+            json.dump(data, data_file, sort_keys=True, indent=4)
+        os.replace(tmp_name, file_name)
+    except (IOError, OSError) as e:
+        print('Unable to write {}. Exception is "{}"'.format(file_name, e), file=sys.stderr)
+
+
+def fetch_schema_zip(schema_zip_url, cache_directory, proxies):
+    """
+    Fetch the schemas zip file into the content-addressed cache directory, where each zip is kept as
+    <sha256 of its content>.zip and the index file maps its URL to that hash and to the ETag and
+    Last-Modified validators it was served with. If the URL was fetched before, the request is
+    conditional (If-None-Match / If-Modified-Since) and the cached zip is used when the server answers
+    304 Not Modified or cannot be reached. The zip is streamed to disk, never held in memory.
+    :param schema_zip_url: URL of the location of the schemas ZIP file
+    :param cache_directory: directory of the zip cache
+    :param proxies: proxies dictionary for downloading schemas via a proxy
+    :return: (path of the cached zip file, its sha256) on success, (None, None) otherwise
+    """
+    try:
+        if not os.path.isdir(cache_directory):
+            os.makedirs(cache_directory)
+    except OSError as e:
+        print('Error creating schema zip cache directory {}. Exception is "{}"'.format(cache_directory, e),
+              file=sys.stderr)
+        return None, None
+
+    index_file = os.path.join(cache_directory, Schema_Zip_Cache_Index_File)
+    entry = read_json_file(index_file).get(schema_zip_url)
+    cached_zip = None
+    rq_headers = {}
+    if isinstance(entry, dict) and os.path.isfile(os.path.join(cache_directory, '%s.zip' % entry.get('Sha256'))):
+        cached_zip = os.path.join(cache_directory, '%s.zip' % entry['Sha256'])
+        if entry.get('ETag'):
+            rq_headers['If-None-Match'] = entry['ETag']
+        if entry.get('Last-Modified'):
+            rq_headers['If-Modified-Since'] = entry['Last-Modified']
+
+    tmp_name = None
+    try:
+        r = requests.get(schema_zip_url, stream=True, proxies=proxies, headers=rq_headers,
+                         timeout=Schema_Zip_Timeout)
+        try:
+            if r.status_code == requests.codes.not_modified and cached_zip:
+                print('Schemas zip at {} not modified since it was cached as {}'.format(schema_zip_url, cached_zip))
+                return cached_zip, entry['Sha256']
+            if r.status_code != requests.codes.ok:
+                print('Unable to retrieve schemas zip at {}, status code = {}'
+                      .format(schema_zip_url, r.status_code), file=sys.stderr)
+            else:
+                zip_hash = hashlib.sha256()
+                fd, tmp_name = tempfile.mkstemp(suffix='.tmp', dir=cache_directory)
+                with os.fdopen(fd, 'wb') as zip_file:
+                    for chunk in r.iter_content(chunk_size=1024 * 1024):
+                        zip_hash.update(chunk)
+                        zip_file.write(chunk)
+                if not zipfile.is_zipfile(tmp_name):
+                    raise zipfile.BadZipfile('not a zip file')
+                sha256 = zip_hash.hexdigest()
+                zip_name = os.path.join(cache_directory, '%s.zip' % sha256)
+                os.replace(tmp_name, zip_name)
+                tmp_name = None
+                # re-read the index, another run may have updated it meanwhile
+                index = read_json_file(index_file)
+                index[schema_zip_url] = OrderedDict([('Sha256', sha256), ('ETag', r.headers.get('ETag')),
+                                                     ('Last-Modified', r.headers.get('Last-Modified'))])
+                write_json_file(index_file, index)
+                print('Downloaded schemas zip {} into {}'.format(schema_zip_url, zip_name))
+                return zip_name, sha256
+        finally:
+            r.close()
+    except Exception as e:
+        print('Unable to read schemas zip at {}. Exception is "{}"'.format(schema_zip_url, e), file=sys.stderr)
+    finally:
+        if tmp_name is not None and os.path.exists(tmp_name):
+            os.remove(tmp_name)
+
+    if cached_zip:
+        print('Using schemas zip {} cached for {}'.format(cached_zip, schema_zip_url))
+        return cached_zip, entry['Sha256']
+    return None, None
+
+
+def extract_schema_files(schema_url, zip_file, schema_path, file_ext, schema_type):
+    """
+    Extract schema files of the given extension from the zip straight into the target dir
     :param schema_url: the URL of the zip file holding the schemas
     :param zip_file: the ZipFile object
-    :param temp_dir_name: the name of the temp dir to extract into
-    :param schema_path: target dir to move the schema files into
+    :param schema_path: target dir to write the schema files into
     :param file_ext: the file extension of the schemas to extract
     :param schema_type: a description string for the type of schemas to be extracted
     :return: True on success, False otherwise
@@ -374,8 +565,8 @@ def extract_schema_files(schema_url, zip_file, temp_dir_name, schema_path, file_
     try:
         members = [file for file in zip_file.namelist() if file.endswith(file_ext)]
         for member in members:
-            file = zip_file.extract(member=member, path=temp_dir_name)
-            os.rename(file, os.path.join(schema_path, os.path.basename(file)))
+            with zip_file.open(member) as source, open(os.path.join(schema_path, os.path.basename(member)), 'wb') as target:
+                shutil.copyfileobj(source, target)
         print('Downloaded {} schema files into directory {}'.format(schema_type, schema_path))
     except Exception as e:
         print('Unable to extract {} schema files from zip {}. Exception is "{}"'
@@ -384,18 +575,33 @@ def extract_schema_files(schema_url, zip_file, temp_dir_name, schema_path, file_
     return True
 
 
-def download_schemas(schema_zip_url, dest_directory, proxies):
+def download_schemas(schema_zip_url, dest_directory, proxies, cache_directory, only_if_changed=False):
     """
     Download schema files into sub-dirs dest_directory/json-schema/ and dest_directory/metadata/.
     :param schema_zip_url: URL of the location of the schemas ZIP file (e.g. http://redfish.dmtf.org/schemas/DSP8010_2017.3.zip)
     :param dest_directory: local directory where the schemas will be extracted into
     :param proxies: proxies dictionary for downloading schemas via a proxy
+    :param cache_directory: directory of the cache of downloaded zip files (see fetch_schema_zip())
+    :param only_if_changed: if True, the schema files are left in place when they were extracted from
+        the same zip content
     :return: True on success, False otherwise
     """
     json_path = os.path.normpath(os.path.join(os.getcwd(), dest_directory, 'json-schema'))
     csdl_path = os.path.normpath(os.path.join(os.getcwd(), dest_directory, 'metadata'))
+    marker_file = os.path.join(dest_directory, Schema_Zip_Marker_File)
+
+    # Fetch schemas zip file into the cache if needed
+    zip_name, sha256 = fetch_schema_zip(schema_zip_url, cache_directory, proxies)
+    if zip_name is None:
+        return False
+    marker = read_json_file(marker_file)
+    if only_if_changed and marker.get('Url') == schema_zip_url and marker.get('Sha256') == sha256:
+        print('Schema files in {} are up to date with {}'.format(dest_directory, schema_zip_url))
+        return True
 
     # Remove old schemas if needed
+    if os.path.exists(marker_file):
+        os.remove(marker_file)
     if os.path.exists(json_path):
         shutil.rmtree(json_path)
     if os.path.exists(csdl_path):
@@ -412,43 +618,20 @@ def download_schemas(schema_zip_url, dest_directory, proxies):
               .format(json_path, csdl_path, e), file=sys.stderr)
         return False
 
-    # Fetch schemas zip file if needed
-    z = temp_dir = temp_dir_name = None
-    # create temp dir to hold extracted zip files
-    try:
-        temp_dir = tempfile.TemporaryDirectory(dir=os.getcwd())
-        temp_dir_name = temp_dir.name
-    except Exception as e:
-        print('Unable to create temp dir for schema extraction. Exception is "{}"'.format(e), file=sys.stderr)
-        if temp_dir is not None:
-            temp_dir.cleanup()
-        return False
-    # fetch the remote zip file
     try:
-        r = requests.get(schema_zip_url, stream=True, proxies=proxies)
-        if r.status_code != requests.codes.ok:
-            print('Unable to retrieve schemas zip at {}, status code = {}'
-                  .format(schema_zip_url, r.status_code), file=sys.stderr)
-            if temp_dir is not None:
-                temp_dir.cleanup()
-            return False
-        z = zipfile.ZipFile(io.BytesIO(r.content), mode='r')
+        with zipfile.ZipFile(zip_name, mode='r') as z:
+            # Extract JSON schemas
+            rc = extract_schema_files(schema_zip_url, z, json_path, '.json', 'JSON')
+
+            # Extract CSDL schemas
+            if rc:
+                rc = extract_schema_files(schema_zip_url, z, csdl_path, '.xml', 'CSDL')
     except Exception as e:
-        print('Unable to read schemas zip at {}. Exception is "{}"'.format(schema_zip_url, e), file=sys.stderr)
-        if temp_dir is not None:
-            temp_dir.cleanup()
+        print('Unable to read schemas zip {}. Exception is "{}"'.format(zip_name, e), file=sys.stderr)
         return False
 
-    # Extract JSON schemas
-    rc = extract_schema_files(schema_zip_url, z, temp_dir_name, json_path, '.json', 'JSON')
-
-    # Extract CSDL schemas
     if rc:
-        rc = extract_schema_files(schema_zip_url, z, temp_dir_name, csdl_path, '.xml', 'CSDL')
-
-    if temp_dir is not None:
-        temp_dir.cleanup()
-
+        write_json_file(marker_file, OrderedDict([('Url', schema_zip_url), ('Sha256', sha256)]))
     return rc
 
 
@@ -483,11 +666,11 @@ def verify_local_schemas(schema_directory):
 # Condition:
 #   If remote schema retrieval fails, tool exits with error message 
 ###############################################################################################
-def get_remote_schemas(schema_zip_url, proxy_Dict, schema_directory):
+def get_remote_schemas(schema_zip_url, proxy_Dict, schema_directory, schema_zip_cache_directory, only_if_changed=False):
     # retrieve DMTF/SPMF metadata files from the paths/url specified in properties.json
     print("Downloading schema files from %s to directory %s" % (schema_zip_url, schema_directory))
 
-    if not download_schemas(schema_zip_url, schema_directory, proxy_Dict):
+    if not download_schemas(schema_zip_url, schema_directory, proxy_Dict, schema_zip_cache_directory, only_if_changed):
         print('Error retrieving/unzipping schema files.')
         print('Either set "{}" to "no" to disable retrieval of the'.format('RetrieveDMTFSchemas'))
         print('DMTF Schemas or set "{}" to a local pathname where the'.format('LocalSchemaDirectoryFolder'))
@@ -499,39 +682,53 @@ def get_remote_schemas(schema_zip_url, proxy_Dict, schema_directory):
 
 
 ###############################################################################################
-# Name: setup_schemas(sut)                                      
-#  Takes sut's service object and sets up schemas for this SUT in the tool in the following 
-#  manner:
-#  1. gets the schema settings from properties.json such as retrieval method, uris, directory path
-#  2. depeding on the settings triggers appropriate schemas retrieval function and
-#  3. passes each schema file to a function which serializes it via schema model class. 
+# Name: retrieve_schemas()
+#   Reads the schema file settings from properties.json and, unless already done during this
+#   run, downloads the schema files or verifies the local ones as the settings ask. The schemas
+#   are read straight from the schemas zip file, without extracting it, if
+#   "LocalSchemaDirectoryFolder" is a zip file or "ExtractSchemaFiles" is "no".
 # Return:
-# True if all is good, else tool exits
-# Condition:
-#   If anything goes wrong and schemas are not set up correctly, the tool exits with error msg
+#   the schema source (rf_schema_source) to read the schemas from
 ###############################################################################################
-def setup_schemas(sut):
-    # create class instance which stores all the serialized schemas
-    csdl_schema_model = SchemaModel()
-    '''comment out for now
-    #set log file for schema
-    log = logger.Log()
-    loghandle , logfilepath = log.init_logfile('schema-run')
-    log.schema_log('OPEN', loghandle, logfilepath)
-    '''
+def retrieve_schemas():
+    global Schema_Source
     # 1.Get schema file settings from properties.json
-    retrieve_dmtf_schemas, schema_directory, schema_zip_url, proxy_Dict = get_sut_schema_settings()
+    retrieve_dmtf_schemas, schema_directory, schema_zip_url, proxy_Dict, schema_zip_cache_directory = get_sut_schema_settings()
     ## Remove the following 2 lines of script if a custom schema directory is provided in the properties.json 
     ## current script file directory, folders should be in this directory
     script_dir = os.path.dirname(__file__)
     # this is the folder where we read/write schema files
     schema_directory = os.path.join(script_dir, schema_directory)
+    # and the one where downloaded schemas zip files are cached
+    schema_zip_cache_directory = os.path.join(script_dir, schema_zip_cache_directory)
+
+    if Schema_Source is not None:
+        return Schema_Source
 
     # 2. Configuration settings successfully parsed; check if local/online metadata is to be
     # used or retrieved remotely
-    if retrieve_dmtf_schemas == 'yes':
+    extract_schema_files = str(get_schema_files_setting("ExtractSchemaFiles", "yes")).lower() != 'no'
+    if os.path.isfile(schema_directory) and zipfile.is_zipfile(schema_directory):
+        print('{} is a zip file; will read the schemas from it'.format('LocalSchemaDirectoryFolder'))
+        Schema_Source = ZipSchemaSource(schema_directory)
+        return Schema_Source
+    elif retrieve_dmtf_schemas in ['yes', 'auto'] and not extract_schema_files:
+        print('RetrieveDMTFSchemas is "{}" and ExtractSchemaFiles is "no"; will read the schemas from the schemas zip'
+              .format(retrieve_dmtf_schemas))
+        zip_name, sha256 = fetch_schema_zip(schema_zip_url, schema_zip_cache_directory, proxy_Dict)
+        if zip_name is not None:
+            Schema_Source = ZipSchemaSource(zip_name, schema_zip_url)
+            return Schema_Source
+        if retrieve_dmtf_schemas == 'yes' or not verify_local_schemas(schema_directory):
+            print('Error retrieving schemas zip {}.'.format(schema_zip_url))
+            print('Either set "{}" to "no" to disable retrieval of the'.format('RetrieveDMTFSchemas'))
+            print('DMTF Schemas or set "{}" to a local pathname where the'.format('LocalSchemaDirectoryFolder'))
+            print('metadata files can be found (see properties.json).')
+            exit(1)
+        print('Using the schema files in {}'.format(schema_directory))
+    elif retrieve_dmtf_schemas == 'yes':
         print('RetrieveDMTFSchemas is "yes"; will download schemas')
-        get_remote_schemas(schema_zip_url, proxy_Dict, schema_directory)
+        get_remote_schemas(schema_zip_url, proxy_Dict, schema_directory, schema_zip_cache_directory)
     elif retrieve_dmtf_schemas == 'no':
         print('RetrieveDMTFSchemas is "no"; will not download schemas')
         if not verify_local_schemas(schema_directory):
@@ -543,40 +740,90 @@ def setup_schemas(sut):
     else:  # 'auto' case
         print('RetrieveDMTFSchemas is "auto"; will download schemas if needed')
         if not verify_local_schemas(schema_directory):
-            get_remote_schemas(schema_zip_url, proxy_Dict, schema_directory)
-
-    # 3. Schema files successfully retrieved, walk down the directory to serialize each schema
-    # file. xml_directry is where we expect CSDL (.xml) schema files
-    xml_directory_path = os.path.join(schema_directory, xml_directory)
-    # json_directory_path
-    json_directory_path = os.path.join(schema_directory, json_directory)
-
-    # verify files are available in dir
-    if xml_directory_path:
-        if not os.listdir(xml_directory_path):
-            print(
-                'CSDL schemas not found in %s. Please make sure files are in place or proper properties.json settings are set for schema files and try running the tool again.' % (
-                    xml_directory_path))
-            exit(1)
-        else:
-            print('\nSerializing CSDL Schemas located at: %s' % (xml_directory_path))
-            for dirpath, dirnames, files in os.walk(xml_directory_path):
-                for schema_file in files:
-                    csdl_schema_model.serialize_schema(os.path.join(dirpath, schema_file))
-
-    # verify files are available in dir
-    if json_directory_path:
-        if not os.listdir(json_directory_path):
-            print(
-                'JSON schemas not found in %s. Please make sure files are in place or proper properties.json settings are set for schema files and try running the tool again.' % (
-                    json_directory_path))
-            exit(1)
+            get_remote_schemas(schema_zip_url, proxy_Dict, schema_directory, schema_zip_cache_directory)
+        elif os.path.isfile(os.path.join(schema_directory, Schema_Zip_Marker_File)):
+            # the schemas in place were downloaded by the tool; check whether the zip has changed
+            if not download_schemas(schema_zip_url, schema_directory, proxy_Dict, schema_zip_cache_directory, True):
+                if verify_local_schemas(schema_directory):
+                    print('Unable to check schemas zip {} for changes; using the schema files in {}'
+                          .format(schema_zip_url, schema_directory))
+                else:
+                    get_remote_schemas(schema_zip_url, proxy_Dict, schema_directory, schema_zip_cache_directory)
+
+    Schema_Source = DirectorySchemaSource(schema_directory, os.path.join(schema_directory, xml_directory),
+                                          os.path.join(schema_directory, json_directory))
+    return Schema_Source
+
+
+###############################################################################################
+# Name: load_schema_model(schema_source)
+#   Takes the schema source and returns the SchemaModel of its CSDL schema documents. The model
+#   is loaded from the snapshot saved for the source if that was serialized from the same
+#   documents; otherwise every document is serialized and the snapshot is saved for later runs
+# Return:
+#   SchemaModel instance holding all the serialized schemas
+###############################################################################################
+def load_schema_model(schema_source):
+    snapshot_path = schema_source.snapshot_path
+    bundle_hash = schema_bundle_hash(schema_source.content_hash())
+    csdl_schema_model = load_schema_model_snapshot(snapshot_path, bundle_hash)
+    if csdl_schema_model is not None:
+        print('\nLoaded CSDL Schemas located at: %s from %s' % (schema_source.csdl_directory, snapshot_path))
+        return csdl_schema_model
+
+    # create class instance which stores all the serialized schemas
+    csdl_schema_model = SchemaModel()
+    print('\nSerializing CSDL Schemas located at: %s' % (schema_source.csdl_directory))
+    csdl_schema_model.serialize_schema_source(schema_source, get_schema_parse_workers())
+    save_schema_model_snapshot(csdl_schema_model, snapshot_path, bundle_hash)
+    return csdl_schema_model
+
 
-    # 4. save the instance of schema model and directory paths in sut
+###############################################################################################
+# Name: setup_schemas(sut)                                      
+#  Takes sut's service object and sets up schemas for this SUT in the tool in the following 
+#  manner:
+#  1. gets the schema settings from properties.json such as retrieval method, uris, directory path
+#  2. depeding on the settings triggers appropriate schemas retrieval function and
+#  3. passes each schema file to a function which serializes it via schema model class. 
+# Return:
+# True if all is good, else tool exits
+# Condition:
+#   If anything goes wrong and schemas are not set up correctly, the tool exits with error msg
+###############################################################################################
+def setup_schemas(sut):
+    '''comment out for now
+    #set log file for schema
+    log = logger.Log()
+    loghandle , logfilepath = log.init_logfile('schema-run')
+    log.schema_log('OPEN', loghandle, logfilepath)
+    '''
+    # 1-2. Get schema file settings from properties.json and retrieve the schemas if needed
+    schema_source = retrieve_schemas()
+
+    # 3. Schemas successfully retrieved, serialize each CSDL (.xml) schema document of the source
+    # verify documents are available in the source
+    if not schema_source.csdl_names():
+        print(
+            'CSDL schemas not found in %s. Please make sure files are in place or proper properties.json settings are set for schema files and try running the tool again.' % (
+                schema_source.csdl_directory))
+        exit(1)
+    else:
+        csdl_schema_model = load_schema_model(schema_source)
+
+    # verify documents are available in the source
+    if not schema_source.json_names():
+        print(
+            'JSON schemas not found in %s. Please make sure files are in place or proper properties.json settings are set for schema files and try running the tool again.' % (
+                schema_source.json_directory))
+        exit(1)
+
+    # 4. save the instance of schema model, the schema source and its paths in sut
     sut.csdl_schema_model = csdl_schema_model
-    sut.schema_directory = schema_directory
-    sut.xml_directory = xml_directory_path
-    sut.json_directory = json_directory_path
+    sut.schema_source = schema_source
+    sut.schema_directory = schema_source.schema_directory
+    sut.xml_directory = schema_source.csdl_directory
+    sut.json_directory = schema_source.json_directory
 
     return True
 
@@ -679,23 +926,122 @@ def setup_tool(sut_prop):
         exit(1)
 
 
+###############################################################################################
+# Name: run_sut(sut_prop, worker = False, schema_source = None)
+#   Sets up the tool for a SUT and runs the assertions against it. In a worker process (worker
+#   is True) the schemas have already been retrieved by the parent into schema_source, the console output goes to
+#   console.log in the SUT's log folder, the results are returned for the parent to add to the
+#   HTML log viewer's AssertionLogs.json, and a failure is reported in the summary instead of
+#   ending the tool
+# Return:
+#   summary of the run (see rfs_test.run), with an 'Error' entry if the SUT could not be checked
+###############################################################################################
+def run_sut(sut_prop, worker = False, schema_source = None):
+    global Schema_Source
+    if not worker:
+        # initialize tool before anything else..this sets up all the necessary variables for this sut in this tool
+        sut = setup_tool(sut_prop)
+        print('Running assertions on SUT %s...' % (sut_prop['DnsName']))
+        return rfs_test.run(sut)
+
+    Schema_Source = schema_source
+    sut_log_folder = os.path.join(logger.Log().LogDestinationPath, sut_prop['DisplayName'])
+    if not os.path.isdir(sut_log_folder):
+        os.makedirs(sut_log_folder)
+    stdout = sys.stdout
+    sys.stdout = open(os.path.join(sut_log_folder, 'console.log'), 'w')
+    try:
+        sut = setup_tool(sut_prop)
+        print('Running assertions on SUT %s...' % (sut_prop['DnsName']))
+        return rfs_test.run(sut, merge_assertion_logs = False)
+    except (SystemExit, Exception) as err:
+        print('Operational ERROR - checking SUT %s failed: %s %s' % (sut_prop['DisplayName'], type(err).__name__, err))
+        return OrderedDict([('DisplayName', sut_prop['DisplayName']), ('DnsName', sut_prop['DnsName']),
+                            ('Error', '%s %s' % (type(err).__name__, err))])
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+###############################################################################################
+# Name: report_sut_summaries(summaries)
+#   Prints the consolidated results of the SUTs checked in this run and saves them to
+#   <date-time>_SUTs-summary.json in the logs folder
+###############################################################################################
+def report_sut_summaries(summaries):
+    print('\nRedfish Service Check Tool results for %d SUTs:' % len(summaries))
+    for summary in summaries:
+        if 'Error' in summary:
+            print(' %s:%s  ERROR %s' % (summary['DisplayName'], summary['DnsName'], summary['Error']))
+        else:
+            print(' %s:%s  Passed= %s Warn= %s Failed= %s Info= %s Run Time= %s' % (
+                summary['DisplayName'], summary['DnsName'], summary['Passed'], summary['Warn'],
+                summary['Failed'], summary['Info'], summary['Run_Time']))
+
+    dstr = str(datetime.now().strftime("%Y%m%d-%H%M%S"))
+    summary_path = os.path.join(logger.Log().LogDestinationPath, dstr + '_SUTs-summary.json')
+    try:
+        with open(summary_path, 'w') as fw:
+            json.dump(summaries, fw, indent=4)
+        print(' Summary saved to %s\n' % summary_path)
+    except (IOError, OSError) as err:
+        print('Operational ERROR - unable to save the SUTs summary %s: %s' % (summary_path, err))
+
+
 ###############################################################################################
 # Name: main
 # Start up function. Invokes appropriate setup functions to run Redfish Service Check Tool
+# against each SUT of properties.json; with "MaxConcurrentSUTs" set, that many SUTs are
+# checked at once in separate processes
 ###############################################################################################
 def main():
     # step through the json server configuration file, checking the assertions against each server/SUT...
-    SUTs = get_sut_prop()
-    for sut_prop in SUTs:
-        if sut_prop:
-            # initialize tool before anything else..this sets up all the necessary variables for this sut in this tool
-            sut = setup_tool(sut_prop)
-            print('Running assertions on SUT %s...' % (sut_prop['DnsName']))
-            rfs_test.run(sut)
-        else:
-            print(
-                'No SUT found in properties.json. Please add an SUT following the format provided in readme.txt and try running the Redfish Service Check Tool again')
+    SUTs = list(get_sut_prop())
+    if not SUTs or not all(SUTs):
+        print(
+            'No SUT found in properties.json. Please add an SUT following the format provided in readme.txt and try running the Redfish Service Check Tool again')
+        exit(1)
+
+    max_concurrent = min(get_sut_concurrency(), len(SUTs))
+    summaries = []
+    if max_concurrent <= 1:
+        for sut_prop in SUTs:
+            summaries.append(run_sut(sut_prop))
+    else:
+        display_names = [sut_prop['DisplayName'] for sut_prop in SUTs]
+        if len(set(display_names)) != len(display_names):
+            print('SUTs checked at the same time write to the log folder named after their DisplayName, which must be unique in properties.json. \
+            Correct the DisplayName values or set MaxConcurrentSUTs to 1 and try running the tool again.')
             exit(1)
+        # retrieve the schemas and save the snapshot of their model once, before the SUTs are
+        # set up in parallel
+        schema_source = retrieve_schemas()
+        if schema_source.csdl_names():
+            load_schema_model(schema_source)
+        print('Running assertions on %d SUTs, %d at a time; see console.log in the log folder of each SUT for its progress'
+              % (len(SUTs), max_concurrent))
+        log = logger.Log()
+        results = dict()
+        start = time.time()
+        with ProcessPoolExecutor(max_workers=max_concurrent) as executor:
+            futures = dict((executor.submit(run_sut, sut_prop, True, schema_source), index) for index, sut_prop in enumerate(SUTs))
+            for future in as_completed(futures):
+                sut_prop = SUTs[futures[future]]
+                try:
+                    summary = future.result()
+                except Exception as err:
+                    summary = OrderedDict([('DisplayName', sut_prop['DisplayName']), ('DnsName', sut_prop['DnsName']),
+                                           ('Error', '%s %s' % (type(err).__name__, err))])
+                if 'Run Key' in summary:
+                    # only this process writes AssertionLogs.json
+                    log.merge_assertion_logs(summary.pop('Run Key'), summary.pop('Run Data'))
+                results[futures[future]] = summary
+                print('SUT %s:%s %s (%d of %d, %d sec)' % (sut_prop['DisplayName'], sut_prop['DnsName'],
+                      'ERROR' if 'Error' in summary else 'completed', len(results), len(SUTs), time.time() - start))
+        summaries = [results[index] for index in range(len(SUTs))]
+
+    if len(summaries) > 1:
+        report_sut_summaries(summaries)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+# Copyright Notice:
+# Copyright 2016-2019 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Service-Conformance-Check/blob/main/LICENSE.md
+
+###################################################################################################
+# File: rf_schema_source.py
+#   This module contains the schema sources the tool reads the CSDL (.xml) and JSON (.json) schema
+#   documents from: DirectorySchemaSource for the files in the metadata/ and json-schema/ folders of
+#   the schema directory, and ZipSchemaSource for the members of a schemas zip file (DSP8010), read
+#   on demand without extracting them. Both offer the same functions:
+#       csdl_names() / json_names(): names of the CSDL / JSON schema documents
+#       csdl_uri(name): the path recorded as SchemaUri of a serialized CSDL document
+#       open_csdl(name) / open_json(name): binary file object with the content of a document
+#       content_hash(): hash of the CSDL documents, used to key the schema model snapshot
+#       snapshot_path: file the schema model snapshot of the source is saved to
+#       schema_directory, csdl_directory, json_directory: where the documents are, for messages
+#       key: string identifying the source
+###################################################################################################
+
+import io
+import os
+import zipfile
+import hashlib
+import threading
+
+## name of the schema model snapshot saved in a schema directory / next to a schemas zip file
+SnapshotFileName = 'csdl_schema_model.pickle'
+
+###################################################################################################
+# Class: DirectorySchemaSource
+#   The schema files in a local directory: every file below csdl_directory (in os.walk order) is a
+#   CSDL document named by its path, and every .json file at the top of json_directory is a JSON
+#   schema document named by its file name
+###################################################################################################
+class DirectorySchemaSource:
+    def __init__(self, schema_directory, csdl_directory, json_directory):
+        self.schema_directory = schema_directory
+        self.csdl_directory = csdl_directory
+        self.json_directory = json_directory
+        self.key = json_directory
+        self.snapshot_path = os.path.join(schema_directory, SnapshotFileName)
+
+    def csdl_names(self):
+        return [os.path.join(dirpath, schema_file) for dirpath, dirnames, files in os.walk(self.csdl_directory)
+                for schema_file in files]
+
+    def json_names(self):
+        if not os.path.isdir(self.json_directory):
+            return []
+        return [schema_file for schema_file in os.listdir(self.json_directory)
+                if schema_file.endswith('.json') and os.path.isfile(os.path.join(self.json_directory, schema_file))]
+
+    def csdl_uri(self, name):
+        return name
+
+    def open_csdl(self, name):
+        return open(name, 'rb')
+
+    def open_json(self, name):
+        return open(os.path.join(self.json_directory, name), 'rb')
+
+    ###############################################################################################
+    # Name: content_hash()
+    #   Returns a hex digest of the names and contents of the CSDL files, in csdl_names() order
+    ###############################################################################################
+    def content_hash(self):
+        bundle_hash = hashlib.sha256()
+        for schema_file in self.csdl_names():
+            bundle_hash.update(os.path.basename(schema_file).encode('utf-8') + b'\x00')
+            with open(schema_file, 'rb') as f:
+                bundle_hash.update(hashlib.sha256(f.read()).digest())
+        return bundle_hash.hexdigest()
+
+###################################################################################################
+# Class: ZipSchemaSource
+#   The schema files in a schemas zip file, read from it when they are needed. As when the zip is
+#   extracted, every .xml member is a CSDL document and every .json member a JSON schema document,
+#   named by their file name whatever folder of the zip they are in (the last member of a name
+#   wins). The zip is opened once per process; members are read under a lock so that assertions
+#   running on several threads can share the source.
+###################################################################################################
+class ZipSchemaSource:
+    def __init__(self, zip_path, zip_url = None):
+        self.zip_path = zip_path
+        self.zip_url = zip_url
+        self.schema_directory = self.csdl_directory = self.json_directory = zip_path
+        self.key = zip_path
+        self.snapshot_path = '%s_%s' % (os.path.splitext(zip_path)[0], SnapshotFileName)
+        # file name -> zip member, in the order of the members in the zip
+        self.csdl_members = dict()
+        self.json_members = dict()
+        with zipfile.ZipFile(zip_path) as zip_file:
+            for member in zip_file.namelist():
+                if member.endswith('.xml'):
+                    self.csdl_members.pop(os.path.basename(member), None)
+                    self.csdl_members[os.path.basename(member)] = member
+                elif member.endswith('.json'):
+                    self.json_members.pop(os.path.basename(member), None)
+                    self.json_members[os.path.basename(member)] = member
+        self.zip_file = None
+        self.zip_file_pid = None
+        self.lock = threading.Lock()
+
+    # the open zip file and lock are not sent to the processes parsing the CSDL documents
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['zip_file'] = state['zip_file_pid'] = None
+        state['lock'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def csdl_names(self):
+        return list(self.csdl_members)
+
+    def json_names(self):
+        return list(self.json_members)
+
+    def csdl_uri(self, name):
+        return os.path.join(self.zip_path, self.csdl_members[name])
+
+    ###############################################################################################
+    # Name: read_member(member)
+    #   Returns the content of a zip member, opening the zip on first use in this process (a
+    #   forked process must not share the position in the file with its parent)
+    ###############################################################################################
+    def read_member(self, member):
+        with self.lock:
+            if self.zip_file is None or self.zip_file_pid != os.getpid():
+                self.zip_file = zipfile.ZipFile(self.zip_path)
+                self.zip_file_pid = os.getpid()
+            return self.zip_file.read(member)
+
+    def open_csdl(self, name):
+        return io.BytesIO(self.read_member(self.csdl_members[name]))
+
+    def open_json(self, name):
+        return io.BytesIO(self.read_member(self.json_members[name]))
+
+    ###############################################################################################
+    # Name: content_hash()
+    #   Returns a hex digest of the zip file
+    ###############################################################################################
+    def content_hash(self):
+        bundle_hash = hashlib.sha256()
+        with open(self.zip_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                bundle_hash.update(chunk)
+        return bundle_hash.hexdigest()
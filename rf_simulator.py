@@ -0,0 +1,703 @@
+# Copyright Notice:
+# Copyright 2016-2019 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Service-Conformance-Check/blob/main/LICENSE.md
+
+###################################################################################################
+# File: rf_simulator.py
+#   This module contains a Redfish service simulator which serves a Redfish resource tree over HTTP
+#   or HTTPS, so that the tool can be run (and its crawl, cache and assertions timed) without a
+#   live service. The tree is read from a mockup directory (every resource is an index.json file
+#   in the folder of its uri, as in the DMTF mockups) or generated with a given number of systems.
+#   The simulator supports:
+#       Basic authentication and sessions (X-Auth-Token) created in the SessionService
+#       collections, with $skip/$top and Members@odata.nextLink paging
+#       GET, HEAD, PATCH, POST (sessions, accounts, subscriptions and actions), DELETE, OPTIONS
+#       gzip content encoding when the request accepts it
+#       a per-request latency with random jitter, and a rate of injected error responses, drawn
+#       from a seeded random number generator so that runs can be repeated
+#
+#   Run it with e.g.:
+#       python rf_simulator.py --port 8000 --mockup <mockup directory>
+#   and point a SUT of properties.json at it with "DnsName": "127.0.0.1:8000" and "UseHttp": "yes"
+#   (or leave "UseHttp" out and start the simulator with --https).
+###################################################################################################
+
+import os
+import re
+import ssl
+import sys
+import copy
+import gzip
+import json
+import time
+import uuid
+import base64
+import random
+import hashlib
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import OrderedDict
+from xml.sax.saxutils import quoteattr
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse, parse_qs
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse, parse_qs
+
+## uri of the service root and of the resources every client may read without credentials
+Service_Root = '/redfish/v1'
+Unauthenticated_Uris = ('/redfish', '/redfish/v1', '/redfish/v1/odata', '/redfish/v1/$metadata')
+## collections that members can be created in (POST) and deleted from (DELETE)
+Writable_Collections = ('Sessions', 'Accounts', 'Subscriptions')
+
+###################################################################################################
+# Name: normalize_uri(uri)
+#   Takes a request path or @odata.id and returns the key of the resource in the tree: the path
+#   without query, fragment and trailing '/'
+###################################################################################################
+def normalize_uri(uri):
+    uri = uri.split('#')[0].split('?')[0]
+    if len(uri) > 1:
+        uri = uri.rstrip('/')
+    return uri
+
+###################################################################################################
+# Name: load_mockup(mockup_directory)
+#   Takes a mockup directory and returns its resources and $metadata document. Every index.json
+#   file below the directory is a resource whose uri is the path of its folder; the $metadata
+#   document is the index.xml file of the redfish/v1/$metadata folder, if there is one. Mockups
+#   whose top folder is the service root itself (index.json next to Systems/, Chassis/, ...) are
+#   served under /redfish/v1
+# Returns:
+#   OrderedDict uri -> payload, $metadata document (bytes) or None
+###################################################################################################
+def load_mockup(mockup_directory):
+    if os.path.isfile(os.path.join(mockup_directory, 'redfish', 'v1', 'index.json')):
+        uri_prefix = ''
+    elif os.path.isfile(os.path.join(mockup_directory, 'index.json')):
+        uri_prefix = Service_Root
+    else:
+        print('SIMULATOR ERROR: No service root (redfish/v1/index.json or index.json) found in mockup directory %s' % mockup_directory)
+        return None, None
+
+    resources = OrderedDict()
+    metadata = None
+    for dirpath, dirnames, files in os.walk(mockup_directory):
+        dirnames.sort()
+        relative_path = os.path.relpath(dirpath, mockup_directory)
+        uri = normalize_uri(uri_prefix + ('' if relative_path == '.' else '/' + relative_path.replace(os.sep, '/')))
+        if 'index.json' in files:
+            try:
+                with open(os.path.join(dirpath, 'index.json'), 'rb') as f:
+                    resources[uri] = json.loads(f.read().decode('utf-8'), object_pairs_hook=OrderedDict)
+            except ValueError as err:
+                print('SIMULATOR ERROR: Unable to load %s: %s' % (os.path.join(dirpath, 'index.json'), err))
+        elif 'index.xml' in files and uri == Service_Root + '/$metadata':
+            with open(os.path.join(dirpath, 'index.xml'), 'rb') as f:
+                metadata = f.read()
+
+    return resources, metadata
+#
+## end load_mockup
+
+###################################################################################################
+# Name: generate_mockup(systems)
+#   Takes a number of computer systems and returns a resource tree with that many systems (each
+#   with two processors), as many chassis, a manager, an AccountService with one account and a
+#   SessionService, for benchmarks which need a tree of a given size
+# Returns:
+#   OrderedDict uri -> payload
+###################################################################################################
+def generate_mockup(systems):
+    resources = OrderedDict()
+
+    def add(uri, resource_type, version, payload):
+        resource = OrderedDict([('@odata.id', uri),
+                                ('@odata.type', '#%s.%s%s' % (resource_type, version + '.' if version else '', resource_type)),
+                                ('@odata.context', '%s/$metadata#%s.%s' % (Service_Root, resource_type, resource_type))])
+        resource.update(payload)
+        resources[normalize_uri(uri)] = resource
+        return resource
+
+    def add_collection(uri, member_type, member_uris):
+        add(uri, member_type + 'Collection', None, [('Name', '%s Collection' % member_type),
+                                                     ('Members@odata.count', len(member_uris)),
+                                                     ('Members', [OrderedDict([('@odata.id', member_uri)]) for member_uri in member_uris])])
+
+    def add_member(uri, member_type, member_id, payload = ()):
+        add(uri, member_type, 'v1_0_0', [('Id', member_id), ('Name', '%s %s' % (member_type, member_id))] + list(payload))
+
+    status = OrderedDict([('State', 'Enabled'), ('Health', 'OK')])
+    add(Service_Root + '/', 'ServiceRoot', 'v1_0_0', [
+        ('Id', 'RootService'), ('Name', 'Root Service'), ('RedfishVersion', '1.0.0'),
+        ('UUID', str(uuid.UUID(int=systems))),
+        ('Systems', {'@odata.id': Service_Root + '/Systems'}),
+        ('Chassis', {'@odata.id': Service_Root + '/Chassis'}),
+        ('Managers', {'@odata.id': Service_Root + '/Managers'}),
+        ('AccountService', {'@odata.id': Service_Root + '/AccountService'}),
+        ('SessionService', {'@odata.id': Service_Root + '/SessionService'}),
+        ('Links', {'Sessions': {'@odata.id': Service_Root + '/SessionService/Sessions'}})])
+
+    system_uris = ['%s/Systems/%d' % (Service_Root, index) for index in range(systems)]
+    chassis_uris = ['%s/Chassis/%d' % (Service_Root, index) for index in range(systems)]
+    manager_uri = Service_Root + '/Managers/BMC'
+    add_collection(Service_Root + '/Systems', 'ComputerSystem', system_uris)
+    for index, system_uri in enumerate(system_uris):
+        processor_uris = ['%s/Processors/%d' % (system_uri, processor) for processor in range(2)]
+        add_member(system_uri, 'ComputerSystem', str(index), [
+            ('SystemType', 'Physical'), ('PowerState', 'On'), ('Status', status),
+            ('Processors', {'@odata.id': system_uri + '/Processors'}),
+            ('Links', {'Chassis': [{'@odata.id': chassis_uris[index]}], 'ManagedBy': [{'@odata.id': manager_uri}]})])
+        add_collection(system_uri + '/Processors', 'Processor', processor_uris)
+        for processor, processor_uri in enumerate(processor_uris):
+            add_member(processor_uri, 'Processor', str(processor), [('ProcessorType', 'CPU'), ('TotalCores', 8), ('Status', status)])
+
+    add_collection(Service_Root + '/Chassis', 'Chassis', chassis_uris)
+    for index, chassis_uri in enumerate(chassis_uris):
+        add_member(chassis_uri, 'Chassis', str(index), [
+            ('ChassisType', 'RackMount'), ('Status', status),
+            ('Links', {'ComputerSystems': [{'@odata.id': system_uris[index]}], 'ManagedBy': [{'@odata.id': manager_uri}]})])
+
+    add_collection(Service_Root + '/Managers', 'Manager', [manager_uri])
+    add_member(manager_uri, 'Manager', 'BMC', [('ManagerType', 'BMC'), ('Status', status),
+                                               ('Links', {'ManagerForServers': [{'@odata.id': uri} for uri in system_uris],
+                                                          'ManagerForChassis': [{'@odata.id': uri} for uri in chassis_uris]})])
+
+    account_uri = Service_Root + '/AccountService/Accounts/1'
+    add_member(Service_Root + '/AccountService', 'AccountService', 'AccountService', [
+        ('ServiceEnabled', True), ('AuthFailureLoggingThreshold', 3), ('MinPasswordLength', 8),
+        ('AccountLockoutThreshold', 5), ('AccountLockoutDuration', 30), ('AccountLockoutCounterResetAfter', 30),
+        ('Accounts', {'@odata.id': Service_Root + '/AccountService/Accounts'})])
+    add_collection(Service_Root + '/AccountService/Accounts', 'ManagerAccount', [account_uri])
+    add_member(account_uri, 'ManagerAccount', '1', [('Password', None), ('UserName', 'Administrator'),
+                                                    ('RoleId', 'Administrator'), ('Enabled', True), ('Locked', False)])
+
+    add_member(Service_Root + '/SessionService', 'SessionService', 'SessionService', [
+        ('ServiceEnabled', True), ('SessionTimeout', 600), ('Status', status),
+        ('Sessions', {'@odata.id': Service_Root + '/SessionService/Sessions'})])
+    add_collection(Service_Root + '/SessionService/Sessions', 'Session', [])
+
+    return resources
+#
+## end generate_mockup
+
+###################################################################################################
+# Name: build_metadata(resources)
+#   Takes the resources of a tree and returns a $metadata document (bytes) referencing the DMTF
+#   schema of every resource type in the tree, for mockups which have none
+###################################################################################################
+def build_metadata(resources):
+    namespaces = OrderedDict()
+    service_root_namespace = 'ServiceRoot.v1_0_0'
+    for resource in resources.values():
+        odata_type = resource.get('@odata.type') if isinstance(resource, dict) else None
+        if not odata_type:
+            continue
+        namespace = odata_type.lstrip('#').rsplit('.', 1)[0]
+        unversioned_namespace = namespace.split('.')[0]
+        namespaces.setdefault(unversioned_namespace, set()).add(namespace)
+        if unversioned_namespace == 'ServiceRoot':
+            service_root_namespace = namespace
+
+    document = ['<?xml version="1.0" encoding="UTF-8"?>',
+                '<edmx:Edmx xmlns:edmx="http://docs.oasis-open.org/odata/ns/edmx" Version="4.0">']
+    for unversioned_namespace, included_namespaces in namespaces.items():
+        document.append('  <edmx:Reference Uri=%s>' % quoteattr('http://redfish.dmtf.org/schemas/v1/%s_v1.xml' % unversioned_namespace))
+        for namespace in sorted(included_namespaces | set([unversioned_namespace])):
+            document.append('    <edmx:Include Namespace=%s/>' % quoteattr(namespace))
+        document.append('  </edmx:Reference>')
+    document += ['  <edmx:DataServices>',
+                 '    <Schema xmlns="http://docs.oasis-open.org/odata/ns/edm" Namespace="Service">',
+                 '      <EntityContainer Name="Service" Extends=%s/>' % quoteattr(service_root_namespace + '.ServiceContainer'),
+                 '    </Schema>',
+                 '  </edmx:DataServices>',
+                 '</edmx:Edmx>']
+    return '\n'.join(document).encode('utf-8')
+#
+## end build_metadata
+
+###################################################################################################
+# Name: build_service_document(service_root)
+#   Takes the service root payload and returns the OData service document (/redfish/v1/odata)
+#   listing its navigation properties, for mockups which have none
+###################################################################################################
+def build_service_document(service_root):
+    value = [OrderedDict([('name', 'Service'), ('kind', 'Singleton'), ('url', Service_Root + '/')])]
+    for name, property_value in service_root.items():
+        if isinstance(property_value, dict) and '@odata.id' in property_value:
+            value.append(OrderedDict([('name', name), ('kind', 'Singleton'), ('url', property_value['@odata.id'])]))
+    return OrderedDict([('@odata.context', Service_Root + '/$metadata'), ('value', value)])
+
+###################################################################################################
+# Name: error_payload(code, message)
+#   Returns a Redfish error response payload
+###################################################################################################
+def error_payload(code, message):
+    return OrderedDict([('error', OrderedDict([('code', 'Base.1.0.%s' % code), ('message', message),
+                        ('@Message.ExtendedInfo', [OrderedDict([('MessageId', 'Base.1.0.%s' % code), ('Message', message)])])]))])
+
+###################################################################################################
+# Name: create_self_signed_certificate(directory)
+#   Creates a self-signed certificate and key for localhost in the directory using the openssl
+#   command, for --https without --cert/--key
+# Returns:
+#   certificate file, key file, or None, None if openssl failed
+###################################################################################################
+def create_self_signed_certificate(directory):
+    cert_file = os.path.join(directory, 'rf_simulator_cert.pem')
+    key_file = os.path.join(directory, 'rf_simulator_key.pem')
+    try:
+        subprocess.check_output(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '30',
+                                 '-subj', '/CN=localhost', '-keyout', key_file, '-out', cert_file],
+                                stderr=subprocess.STDOUT)
+    except (OSError, subprocess.CalledProcessError) as err:
+        print('SIMULATOR ERROR: Unable to create a self-signed certificate with openssl: %s' % err)
+        return None, None
+    return cert_file, key_file
+
+###################################################################################################
+# Class: RedfishSimulator
+#   A simulated Redfish service. The resources are kept in memory and changed by the PATCH, POST
+#   and DELETE requests, under a lock since each request is handled on its own thread. Latency,
+#   jitter and injected errors are drawn, request by request, from a random number generator
+#   seeded with the seed given.
+#       resources: OrderedDict uri -> payload (see load_mockup / generate_mockup)
+#       metadata: $metadata document (bytes), built from the resources if None
+#       username, password: the credentials accepted for Basic authentication and new sessions
+#       page_size: if a positive number, collections return at most that many members per
+#           response, with a Members@odata.nextLink to the next page
+#       latency, jitter: each response is delayed by latency plus a random 0..jitter milliseconds
+#       error_rate, error_status: fraction of the requests answered with error_status instead
+#       use_gzip: compress responses of requests which accept gzip
+###################################################################################################
+class RedfishSimulator:
+    def __init__(self, resources, metadata = None, username = 'root', password = 'calvin', page_size = 0,
+                 latency = 0, jitter = 0, error_rate = 0.0, error_status = 503, seed = 0, use_gzip = True):
+        self.resources = resources
+        self.metadata = metadata if metadata else build_metadata(resources)
+        self.username = username
+        self.password = password
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.use_gzip = use_gzip
+        self.random = random.Random(seed)
+        if Service_Root + '/odata' not in self.resources and Service_Root in self.resources:
+            self.resources[Service_Root + '/odata'] = build_service_document(self.resources[Service_Root])
+        if '/redfish' not in self.resources:
+            self.resources['/redfish'] = OrderedDict([('v1', Service_Root + '/')])
+        # X-Auth-Token -> uri of the session resource
+        self.sessions = dict()
+        self.lock = threading.Lock()
+        self.server = None
+        self.server_thread = None
+        self.requests = 0
+        self.injected_errors = 0
+        self.bytes_sent = 0
+
+    ###############################################################################################
+    # Name: sessions_uri()
+    #   Returns the uri of the sessions collection, as linked from the service root
+    ###############################################################################################
+    def sessions_uri(self):
+        service_root = self.resources.get(Service_Root, {})
+        try:
+            return normalize_uri(service_root['Links']['Sessions']['@odata.id'])
+        except (KeyError, TypeError):
+            return Service_Root + '/SessionService/Sessions'
+
+    ###############################################################################################
+    # Name: allowed_methods(uri)
+    #   Returns the methods allowed on a resource, for the Allow header and 405 responses
+    ###############################################################################################
+    def allowed_methods(self, uri):
+        if uri in Unauthenticated_Uris:
+            return 'GET, HEAD'
+        parent, name = uri.rsplit('/', 1)
+        if name in Writable_Collections:
+            return 'GET, HEAD, POST'
+        if parent.rsplit('/', 1)[-1] in Writable_Collections:
+            return 'GET, HEAD, PATCH, DELETE'
+        return 'GET, HEAD, PATCH'
+
+    ###############################################################################################
+    # Name: authorized(rq_headers)
+    #   Returns True if the request carries the Basic credentials or the token of a session
+    ###############################################################################################
+    def authorized(self, rq_headers):
+        token = rq_headers.get('X-Auth-Token')
+        if token:
+            with self.lock:
+                return token in self.sessions
+        authorization = rq_headers.get('Authorization', '')
+        if authorization.startswith('Basic '):
+            try:
+                credentials = base64.b64decode(authorization[len('Basic '):].strip()).decode('utf-8')
+            except (ValueError, TypeError, UnicodeDecodeError):
+                return False
+            return credentials == '%s:%s' % (self.username, self.password)
+        return False
+
+    ###############################################################################################
+    # Name: draw_delay_and_error()
+    #   Returns the delay (seconds) of the next response and whether it is an injected error
+    ###############################################################################################
+    def draw_delay_and_error(self):
+        with self.lock:
+            self.requests += 1
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+            error = self.error_rate > 0 and self.random.random() < self.error_rate
+            if error:
+                self.injected_errors += 1
+        return delay / 1000.0, error
+
+    ###############################################################################################
+    # Name: page(uri, payload, query)
+    #   Takes a collection payload and the request query and returns the payload with the members
+    #   selected by $skip/$top and the page size, and a Members@odata.nextLink to the rest
+    ###############################################################################################
+    def page(self, uri, payload, query):
+        members = payload['Members']
+        try:
+            skip = max(int(query.get('$skip', ['0'])[0]), 0)
+            top = int(query['$top'][0]) if '$top' in query else len(members)
+        except ValueError:
+            return payload
+        if self.page_size > 0:
+            top = min(top, self.page_size)
+        if skip == 0 and top >= len(members):
+            return payload
+        payload = copy.copy(payload)
+        payload['Members'] = members[skip:skip + max(top, 0)]
+        payload['Members@odata.count'] = len(members)
+        payload.pop('Members@odata.nextLink', None)
+        if skip + len(payload['Members']) < len(members):
+            payload['Members@odata.nextLink'] = '%s?$skip=%d' % (payload.get('@odata.id', uri), skip + len(payload['Members']))
+            if '$top' in query:
+                payload['Members@odata.nextLink'] += '&$top=%d' % top
+        return payload
+
+    ###############################################################################################
+    # Name: handle(method, path, rq_headers, rq_body)
+    #   Takes a request and returns the response to it
+    # Returns:
+    #   status, list of (header, value), payload (dict, bytes or None)
+    ###############################################################################################
+    def handle(self, method, path, rq_headers, rq_body):
+        uri = normalize_uri(path)
+        query = parse_qs(urlparse(path).query)
+
+        # a new session may be requested without credentials
+        if method == 'POST' and uri == self.sessions_uri():
+            return self.create_session(uri, rq_body)
+        if uri not in Unauthenticated_Uris and not self.authorized(rq_headers):
+            return 401, [('WWW-Authenticate', 'Basic realm="Redfish"')], error_payload('NoValidSession', 'Authentication is required to access %s' % uri)
+
+        if method in ('GET', 'HEAD'):
+            if uri == Service_Root + '/$metadata':
+                return 200, [('Content-Type', 'application/xml')], self.metadata
+            with self.lock:
+                payload = self.resources.get(uri)
+                if payload is not None and isinstance(payload.get('Members'), list):
+                    payload = self.page(uri, payload, query)
+                payload = json.dumps(payload).encode('utf-8') if payload is not None else None
+            if payload is None:
+                return 404, [], error_payload('ResourceMissingAtURI', 'The resource at %s was not found' % uri)
+            rs_headers = [('ETag', 'W/"%s"' % hashlib.sha1(payload).hexdigest()[:16]), ('Allow', self.allowed_methods(uri))]
+            if rq_headers.get('If-None-Match') == rs_headers[0][1]:
+                return 304, rs_headers, None
+            return 200, rs_headers, payload
+
+        if method == 'OPTIONS':
+            return 200, [('Allow', self.allowed_methods(uri))], None
+
+        if method == 'POST' and '/Actions/' in uri:
+            with self.lock:
+                found = uri.split('/Actions/')[0] in self.resources
+            if not found:
+                return 404, [], error_payload('ResourceMissingAtURI', 'The action %s was not found' % uri)
+            return 204, [], None
+
+        allowed = self.allowed_methods(uri)
+        if method not in allowed.split(', '):
+            return 405, [('Allow', allowed)], error_payload('OperationNotAllowed', '%s is not allowed on %s' % (method, uri))
+        try:
+            body = json.loads(rq_body.decode('utf-8'), object_pairs_hook=OrderedDict) if rq_body else OrderedDict()
+        except ValueError:
+            return 400, [], error_payload('MalformedJSON', 'The request body is not valid JSON')
+        if method == 'PATCH':
+            return self.patch_resource(uri, rq_headers, body)
+        elif method == 'POST':
+            return self.create_member(uri, body)
+        else:
+            return self.delete_member(uri)
+
+    ###############################################################################################
+    # Name: create_session(uri, rq_body)
+    #   Creates a session for the credentials in the request body
+    ###############################################################################################
+    def create_session(self, uri, rq_body):
+        try:
+            body = json.loads(rq_body.decode('utf-8')) if rq_body else {}
+        except ValueError:
+            return 400, [], error_payload('MalformedJSON', 'The request body is not valid JSON')
+        if not isinstance(body, dict) or body.get('UserName') != self.username or body.get('Password') != self.password:
+            return 401, [], error_payload('NoValidSession', 'Invalid user name or password')
+        status, rs_headers, payload = self.create_member(uri, OrderedDict([('UserName', self.username)]), 'Session')
+        if status == 201:
+            with self.lock:
+                token = uuid.UUID(int=self.random.getrandbits(128)).hex
+                self.sessions[token] = normalize_uri(payload['@odata.id'])
+            rs_headers.append(('X-Auth-Token', token))
+        return status, rs_headers, payload
+
+    ###############################################################################################
+    # Name: create_member(uri, body, member_type = None)
+    #   Adds a member with the properties of the request body to a collection
+    ###############################################################################################
+    def create_member(self, uri, body, member_type = None):
+        with self.lock:
+            collection = self.resources.get(uri)
+            if collection is None or not isinstance(collection.get('Members'), list):
+                return 404, [], error_payload('ResourceMissingAtURI', 'The collection %s was not found' % uri)
+            if member_type is None:
+                member_type = re.sub(r'^#?([^.]*?)(Collection)?\..*$', r'\1', collection.get('@odata.type', '#Resource.Resource'))
+            member_ids = [member['@odata.id'].rstrip('/').rsplit('/', 1)[-1] for member in collection['Members']]
+            member_id = str(max([int(member_id) for member_id in member_ids if member_id.isdigit()] + [0]) + 1)
+            member_uri = '%s/%s' % (collection.get('@odata.id', uri).rstrip('/'), member_id)
+            payload = OrderedDict([('@odata.id', member_uri),
+                                   ('@odata.type', '#%s.v1_0_0.%s' % (member_type, member_type)),
+                                   ('@odata.context', '%s/$metadata#%s.%s' % (Service_Root, member_type, member_type)),
+                                   ('Id', member_id), ('Name', '%s %s' % (member_type, member_id))])
+            payload.update((key, value) for key, value in body.items() if not key.startswith('@odata.') and key != 'Id')
+            self.resources[normalize_uri(member_uri)] = payload
+            collection['Members'].append(OrderedDict([('@odata.id', member_uri)]))
+            collection['Members@odata.count'] = len(collection['Members'])
+            # the password of a new account is not returned
+            if 'Password' in payload:
+                payload['Password'] = None
+            return 201, [('Location', member_uri)], payload
+
+    ###############################################################################################
+    # Name: patch_resource(uri, rq_headers, body)
+    #   Updates the properties of a resource with the request body, if its If-Match header (when
+    #   there is one) matches the ETag of the resource
+    ###############################################################################################
+    def patch_resource(self, uri, rq_headers, body):
+        def merge(target, update):
+            for key, value in update.items():
+                if isinstance(value, dict) and isinstance(target.get(key), dict):
+                    merge(target[key], value)
+                else:
+                    target[key] = value
+
+        with self.lock:
+            payload = self.resources.get(uri)
+            if payload is None:
+                return 404, [], error_payload('ResourceMissingAtURI', 'The resource at %s was not found' % uri)
+            etag = 'W/"%s"' % hashlib.sha1(json.dumps(payload).encode('utf-8')).hexdigest()[:16]
+            if rq_headers.get('If-Match') not in (None, '*', etag):
+                return 412, [], error_payload('PreconditionFailed', 'The ETag of %s does not match If-Match' % uri)
+            merge(payload, OrderedDict((key, value) for key, value in body.items() if not key.startswith('@odata.')))
+            return 200, [], copy.deepcopy(payload)
+
+    ###############################################################################################
+    # Name: delete_member(uri)
+    #   Removes a member from its collection, ending the session if the member is a session
+    ###############################################################################################
+    def delete_member(self, uri):
+        with self.lock:
+            if uri not in self.resources:
+                return 404, [], error_payload('ResourceMissingAtURI', 'The resource at %s was not found' % uri)
+            del self.resources[uri]
+            collection = self.resources.get(uri.rsplit('/', 1)[0])
+            if collection is not None and isinstance(collection.get('Members'), list):
+                collection['Members'] = [member for member in collection['Members'] if normalize_uri(member.get('@odata.id', '')) != uri]
+                collection['Members@odata.count'] = len(collection['Members'])
+            for token in [token for token, session_uri in self.sessions.items() if session_uri == uri]:
+                del self.sessions[token]
+        return 204, [], None
+
+    ###############################################################################################
+    # Name: stats()
+    #   Returns a dictionary of request/injected error/byte counts
+    ###############################################################################################
+    def stats(self):
+        with self.lock:
+            return OrderedDict([('Requests', self.requests), ('Injected Errors', self.injected_errors),
+                                ('Bytes Sent', self.bytes_sent), ('Sessions', len(self.sessions))])
+
+    ###############################################################################################
+    # Name: start(host, port, cert_file = None, key_file = None)
+    #   Starts serving on host:port in a background thread, over HTTPS if a certificate and key
+    #   are given. Port 0 picks a free port
+    # Returns:
+    #   the port the simulator serves on
+    ###############################################################################################
+    def start(self, host = '127.0.0.1', port = 0, cert_file = None, key_file = None):
+        self.server = SimulatorServer((host, port), SimulatorRequestHandler)
+        self.server.simulator = self
+        if cert_file:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(cert_file, key_file)
+            self.server.ssl_context = context
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        return self.server.server_address[1]
+
+    ###############################################################################################
+    # Name: stop()
+    #   Stops serving and closes the listening socket
+    ###############################################################################################
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server_thread.join()
+            self.server = self.server_thread = None
+
+## end RedfishSimulator
+
+###################################################################################################
+# Class: SimulatorServer
+#   Threading HTTP server of the simulator. With an ssl_context, the TLS handshake of each
+#   connection is made on the thread handling it, so that a slow client does not hold up the
+#   others. Connections reset or closed by the client are not reported as errors.
+###################################################################################################
+class SimulatorServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    ssl_context = None
+
+    def finish_request(self, request, client_address):
+        if self.ssl_context is None:
+            return HTTPServer.finish_request(self, request, client_address)
+        try:
+            request = self.ssl_context.wrap_socket(request, server_side=True)
+        except (ssl.SSLError, OSError):
+            return
+        try:
+            HTTPServer.finish_request(self, request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def handle_error(self, request, client_address):
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        HTTPServer.handle_error(self, request, client_address)
+
+###################################################################################################
+# Class: SimulatorRequestHandler
+#   Hands each HTTP request to the RedfishSimulator of the server and sends back its response,
+#   after the drawn latency, as JSON (gzip'd if the request accepts it)
+###################################################################################################
+class SimulatorRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def handle_request(self):
+        simulator = self.server.simulator
+        content_length = int(self.headers.get('Content-Length') or 0)
+        rq_body = self.rfile.read(content_length) if content_length > 0 else b''
+
+        delay, error = simulator.draw_delay_and_error()
+        if delay > 0:
+            time.sleep(delay)
+        if error:
+            status, rs_headers, payload = simulator.error_status, [('Retry-After', '1')], \
+                error_payload('ServiceTemporarilyUnavailable', 'Injected error response')
+        else:
+            status, rs_headers, payload = simulator.handle(self.command, self.path, self.headers, rq_body)
+
+        content_type = 'application/json;charset=utf-8'
+        for header, value in rs_headers:
+            if header == 'Content-Type':
+                content_type = value
+        if isinstance(payload, dict):
+            payload = json.dumps(payload).encode('utf-8')
+        payload = payload or b''
+        if payload and simulator.use_gzip and 'gzip' in self.headers.get('Accept-Encoding', ''):
+            payload = gzip.compress(payload)
+            rs_headers = rs_headers + [('Content-Encoding', 'gzip')]
+
+        self.send_response(status)
+        self.send_header('OData-Version', '4.0')
+        if payload or status not in (204, 304):
+            self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        for header, value in rs_headers:
+            if header != 'Content-Type':
+                self.send_header(header, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(payload)
+            with simulator.lock:
+                simulator.bytes_sent += len(payload)
+
+    do_GET = do_HEAD = do_POST = do_PATCH = do_PUT = do_DELETE = do_OPTIONS = do_TRACE = handle_request
+
+    # the console is left to the summary printed at the end
+    def log_message(self, format, *args):
+        pass
+
+## end SimulatorRequestHandler
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Serve a simulated Redfish service for the Redfish Service Conformance Check tool')
+    arg_parser.add_argument('--mockup', help='mockup directory to serve (default: a generated tree)')
+    arg_parser.add_argument('--systems', type=int, default=4, help='number of systems of the generated tree (default 4)')
+    arg_parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default 127.0.0.1)')
+    arg_parser.add_argument('--port', type=int, default=8000, help='port to listen on (default 8000)')
+    arg_parser.add_argument('--https', action='store_true', help='serve HTTPS (with a self-signed certificate unless --cert/--key are given)')
+    arg_parser.add_argument('--cert', help='certificate file (PEM) for HTTPS')
+    arg_parser.add_argument('--key', help='private key file (PEM) for HTTPS')
+    arg_parser.add_argument('--username', default='root', help='user name accepted (default root)')
+    arg_parser.add_argument('--password', default='calvin', help='password accepted (default calvin)')
+    arg_parser.add_argument('--page-size', type=int, default=0, help='maximum number of members per collection response (default 0, no paging)')
+    arg_parser.add_argument('--latency', type=float, default=0, help='latency added to every response in milliseconds (default 0)')
+    arg_parser.add_argument('--jitter', type=float, default=0, help='random latency of up to this many milliseconds added to every response (default 0)')
+    arg_parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of the requests answered with --error-status (default 0)')
+    arg_parser.add_argument('--error-status', type=int, default=503, help='status of the injected error responses (default 503)')
+    arg_parser.add_argument('--seed', type=int, default=0, help='seed of the latency jitter and injected errors (default 0)')
+    arg_parser.add_argument('--no-gzip', action='store_true', help='never gzip the responses')
+    args = arg_parser.parse_args()
+
+    if args.mockup:
+        resources, metadata = load_mockup(args.mockup)
+        if resources is None:
+            sys.exit(1)
+    else:
+        resources, metadata = generate_mockup(args.systems), None
+
+    cert_file, key_file = args.cert, args.key
+    if (args.https or cert_file) and not cert_file:
+        cert_file, key_file = create_self_signed_certificate(tempfile.mkdtemp())
+        if cert_file is None:
+            sys.exit(1)
+
+    simulator = RedfishSimulator(resources, metadata, args.username, args.password, args.page_size, args.latency,
+                                 args.jitter, args.error_rate, args.error_status, args.seed, not args.no_gzip)
+    port = simulator.start(args.host, args.port, cert_file, key_file)
+    print('Serving %d resources on %s://%s:%d%s/ (Ctrl-C to stop)' % (len(resources), 'https' if cert_file else 'http',
+                                                                       args.host, port, Service_Root))
+    print('properties.json SUT settings: "DnsName": "%s:%d"%s' % (args.host, port, '' if cert_file else ', "UseHttp": "yes"'))
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    simulator.stop()
+    for key, value in simulator.stats().items():
+        print('%s: %s' % (key, value))
+
+
+if __name__ == "__main__":
+    main()
@@ -19,9 +19,11 @@
 import sys
 from schema import SchemaModel
 import rf_utility
+import rf_cache
 from collections import OrderedDict
 import os.path
 import random
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # map python 2 vs 3 imports
 if (sys.version_info < (3, 0)):
@@ -78,6 +80,9 @@ class SUT():
         self.relative_uris = OrderedDict()
         # placeholder for relative uris minus resource 'Members'
         self.relative_uris_no_members = OrderedDict()
+        # normalized form (rf_utility.normalize_resource_uri) of every uri placed in relative_uris,
+        # so the crawler can tell in constant time whether a link has already been traversed
+        self.visited_uris = set()
 
         #service root uri
         self.service_root = None
@@ -119,10 +124,20 @@ class SUT():
         self.csdl_directory = None
         self.json_directory = None
         self.xml_directory = None
+        # the schema source (rf_schema_source) the schema files are read from
+        self.schema_source = None
 
         # holds cached URIs
         self.uris = []
         self.uris_no_members = []
+        # GET responses of the cached URIs, filled by initialize_cache()
+        self.response_cache = rf_cache.ResponseCache()
+        # shares the response of a GET with the concurrent identical ones (see http_GET)
+        self.request_coalescer = rf_cache.RequestCoalescer()
+
+        # GET responses fetched concurrently ahead of the resource walk in collect_relative_uris,
+        # normalized uri -> (json_payload, headers, status)
+        self.crawl_responses = dict()
 
     ###############################################################################################
     # Name: self.request_headers()                                                
@@ -132,21 +147,81 @@ class SUT():
     def request_headers(self): 
         return rf_utility.create_request_headers()
 
-    def get_and_cache_uris(self, relative_uris, k, payload):
+    ###############################################################################################
+    # Name: self.connection_pool_stats()
+    #   returns the hit/miss/reconnect counts of this SUT's keep-alive connection pool
+    ###############################################################################################
+    def connection_pool_stats(self):
+        return rf_utility.get_connection_pool(self.SUT_prop).stats()
+
+    ###############################################################################################
+    # Name: self.tls_session_stats()
+    #   returns the full vs. resumed TLS handshake counts for this SUT
+    ###############################################################################################
+    def tls_session_stats(self):
+        return rf_utility.get_tls_session_cache(self.SUT_prop).stats()
+
+    ###############################################################################################
+    # Name: self.response_cache_stats()
+    #   returns the entry count and hit/miss counts of this SUT's response cache
+    ###############################################################################################
+    def response_cache_stats(self):
+        return self.response_cache.stats()
+
+    ###############################################################################################
+    # Name: self.request_coalescer_stats()
+    #   returns the number of GET requests made and of those saved by coalescing identical ones
+    ###############################################################################################
+    def request_coalescer_stats(self):
+        return self.request_coalescer.stats()
+
+    ###############################################################################################
+    # Name: self.json_schema_cache_stats()
+    #   returns the indexed file count and hit/miss counts of the JSON schema documents cache
+    ###############################################################################################
+    def json_schema_cache_stats(self):
+        return rf_utility.get_json_schema_cache(self.schema_source).stats()
+
+    ###############################################################################################
+    # Name: self.session_auth_stats()
+    #   returns the session logins/re-authentications/logouts of this SUT, None unless its
+    #   "AuthMode" is "Session"
+    ###############################################################################################
+    def session_auth_stats(self):
+        if rf_utility.auth_mode(self.SUT_prop) != 'session':
+            return None
+        return rf_utility.get_session_auth(self.SUT_prop).stats()
+
+    ###############################################################################################
+    # Name: self.close_session()
+    #   deletes the session authenticated requests were made with, if "AuthMode" is "Session"
+    ###############################################################################################
+    def close_session(self):
+        if rf_utility.auth_mode(self.SUT_prop) == 'session':
+            rf_utility.get_session_auth(self.SUT_prop).logout()
+
+    ###############################################################################################
+    # Name: self.request_stats()
+    #   returns the request statistics (timings and sizes of every request) of this SUT
+    ###############################################################################################
+    def request_stats(self):
+        return rf_utility.get_request_stats(self.SUT_prop)
+
+    def get_and_cache_uris(self, relative_uris, k, cache):
         authorization = 'on'
         rq_headers = self.request_headers()
         uris = []
         k = min(k, len(relative_uris))
         if k <= 0:
             k = len(relative_uris)  # cache all the URIs
-        sample_keys = random.sample(relative_uris.keys(), k)
+        sample_keys = random.sample(list(relative_uris.keys()), k)
         for key in sample_keys:
             json_payload, headers, status = self.http_GET(
                 relative_uris[key], rq_headers, authorization)
+            # error responses are cached too, only the successful ones are handed to the assertions
+            if status and isinstance(headers, dict):
+                cache.put(relative_uris[key], json_payload, headers, status)
             if status == rf_utility.HTTP_OK and isinstance(json_payload, dict) and isinstance(headers, dict):
-                payload[relative_uris[key]] = json_payload
-                payload[relative_uris[key] + '_header'] = headers
-                payload[relative_uris[key] + '_status'] = status
                 uris.append(key)
             else:
                 print('Error retrieving URI {} - status {}, JSON payload type {}, headers type {}'
@@ -154,25 +229,38 @@ class SUT():
         return uris
 
     ###################################################################################
-    # Name: initialize_cache(self)
-    #   Returns a list of URI's cached by the http GET requests for Redfish API 
+    # Name: initialize_cache(self, snapshot_directory = '')
+    #   Returns a list of URI's cached by the http GET requests for Redfish API. The responses
+    #   are kept in memory, within the "CacheMaxBytes" property of the SUT if it is set, and
+    #   unless the "CacheSnapshot" property of the SUT is "no", also saved to
+    #   cache_uri_data.json in snapshot_directory (the log folder of the SUT)
     # Returns:
     #   - URI's list: Cached URI's List                                                
     ###################################################################################
-    def initialize_cache(self):
+    def initialize_cache(self, snapshot_directory = ''):
         try:
             # default is zero, meaning cache all the URIs
             num_uris = int(self.SUT_prop.get('NumUrisToCache', "0"))
         except:
             num_uris = 0
+        try:
+            # default is zero, meaning no limit on the memory used by the cache
+            max_bytes = int(self.SUT_prop.get('CacheMaxBytes', "0"))
+        except:
+            max_bytes = 0
         print('Getting {} URIs to sample and cache'.format("all" if num_uris <= 0 else num_uris))
+        self.request_stats().phase = 'Cache'
         relative_uris = self.relative_uris
         relative_uris_no_members = self.relative_uris_no_members
-        cache_payload = {}
-        with open('cache_uri_data.json', 'w') as fp:
-            self.uris = self.get_and_cache_uris(relative_uris, num_uris, cache_payload)
-            self.uris_no_members = self.get_and_cache_uris(relative_uris_no_members, num_uris, cache_payload)
-            json.dump(cache_payload, fp, sort_keys=True, indent=4)
+        snapshot_path = None
+        if self.SUT_prop.get('CacheSnapshot', 'yes').lower() != 'no':
+            snapshot_path = os.path.join(snapshot_directory, 'cache_uri_data.json')
+        self.response_cache = rf_cache.ResponseCache(snapshot_path, max_bytes)
+        self.uris = self.get_and_cache_uris(relative_uris, num_uris, self.response_cache)
+        self.uris_no_members = self.get_and_cache_uris(relative_uris_no_members, num_uris, self.response_cache)
+        self.response_cache.write_snapshot()
+        # the requests that follow are made for the assertions
+        self.request_stats().phase = 'Assertions'
         print('')
         
     ###############################################################################################
@@ -186,13 +274,11 @@ class SUT():
     #   - Response Status code: http status code returned from the request                                                 
     ###############################################################################################
     def http_cached_GET(self, relative_uri, rq_headers, auth_on_off):      
-        cache = {} 
-        with open('cache_uri_data.json', 'r') as fp:
-            cache = json.load(fp)
-        try:
-            return cache[relative_uri], cache[relative_uri+'_header'], cache[relative_uri+'_status']
-        except:
-            return self.http_GET(relative_uri, rq_headers, auth_on_off)
+        response = self.response_cache.get(relative_uri)
+        self.request_stats().record_cache_lookup(response is not None)
+        if response is not None:
+            return response
+        return self.http_GET(relative_uri, rq_headers, auth_on_off)
     #
     ## end http_GET
 
@@ -200,7 +286,8 @@ class SUT():
     ###############################################################################################
     # Name: http_GET(resource_uri, rq_headers, auth_on_off)                                              
     #   Issue a GET request for resource uri thru base HTTP__GET() in rf_utility by passing SUT
-    #   HTTP connection properties to it.
+    #   HTTP connection properties to it. Concurrent GETs of the same uri with the same
+    #   authorization, auth mode and request headers (Accept etc.) share one request.
     #   Takes resource uri, request header dict, and authorization 'on' or 'off' option
     # Returns:
     #   - Response json_payload dict or string depending on 'content-type' in request header. If
@@ -211,8 +298,10 @@ class SUT():
     def http_GET(self, resource_uri, rq_headers, auth_on_off) :      
         if (rq_headers == None):
             rq_headers = self.request_headers()
+        key = ('GET', resource_uri, auth_on_off, rf_utility.auth_mode(self.SUT_prop),
+               tuple(sorted((str(name).lower(), str(value)) for name, value in rq_headers.items())))
         # issue the GET on the resource...
-        return rf_utility.http__GET(self.SUT_prop, resource_uri, rq_headers, auth_on_off, self.cookie_info)
+        return self.request_coalescer.request(key, lambda: rf_utility.http__GET(self.SUT_prop, resource_uri, rq_headers, auth_on_off, self.cookie_info))
                                                             
     #
     ## end http_GET
@@ -536,7 +625,7 @@ class SUT():
         elif (status != rf_utility.HTTP_OK):
             print('line', "~ GET for resource %s failed: FAIL (HTTP status %s)" % (metadata_uri, status)) 
         elif xml_payload:  
-            csdl_schema_model.serialize_schema(schema_payload = xml_payload, schema_uri= metadata_uri)
+            csdl_schema_model.serialize_schema_stream(schema_payload = xml_payload, schema_uri= metadata_uri)
             # there will be only one element in this case ans we only need that
             if csdl_schema_model.FullRedfishSchemas[0]:
                 return csdl_schema_model.FullRedfishSchemas[0]
@@ -550,8 +639,80 @@ class SUT():
     def collect_relative_uris(self, service_root):
         self.relative_uris['Root Service'] = service_root
         self.relative_uris_no_members['Root Service'] = service_root
+        self.visited_uris.add(rf_utility.normalize_resource_uri(service_root))
 
+        # fetch the whole resource tree concurrently first, then walk it in the usual order so
+        # that relative_uris are keyed the same way regardless of the order responses came in
+        self.request_stats().phase = 'Crawl'
+        self.crawl_responses = self.fetch_resource_tree(service_root)
         self.process_uri(service_root, 'Root Service')
+        self.crawl_responses = dict()
+        self.request_stats().phase = 'Setup'
+
+    ###############################################################################################
+    # Name: crawl_concurrency()
+    #   Returns the number of concurrent GETs allowed while crawling the SUT, set through the
+    #   optional "CrawlConcurrency" property of the SUT (default 4, 1 crawls serially)
+    ###############################################################################################
+    def crawl_concurrency(self):
+        try:
+            concurrency = int(self.SUT_prop.get('CrawlConcurrency', "4"))
+        except:
+            concurrency = 4
+        return max(concurrency, 1)
+
+    ###############################################################################################
+    # Name: fetch_resource_tree(service_root)
+    #   Takes service root uri and GETs every resource reachable from it breadth-first, keeping at
+    #   most crawl_concurrency() requests in flight. Links are followed the same way process_uri
+    #   follows them, each resource is fetched once however its links are spelled.
+    # Returns:
+    #   dictionary of normalized uri -> (json_payload, headers, status)
+    ###############################################################################################
+    def fetch_resource_tree(self, service_root):
+        responses = dict()
+        root_key = rf_utility.normalize_resource_uri(service_root)
+        with ThreadPoolExecutor(max_workers=self.crawl_concurrency()) as executor:
+            pending = {executor.submit(self.http_GET, service_root, self.request_headers(), 'on') : root_key}
+            fetched = set([root_key])
+            while pending:
+                done, not_done = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    uri_key = pending.pop(future)
+                    responses[uri_key] = future.result()
+                    for url_ in self.linked_uris(*responses[uri_key]):
+                        uri_key_ = rf_utility.normalize_resource_uri(url_)
+                        if uri_key_ not in fetched:
+                            fetched.add(uri_key_)
+                            pending[executor.submit(self.http_GET, url_, self.request_headers(), 'on')] = uri_key_
+        return responses
+
+    ###############################################################################################
+    # Name: linked_uris(json_payload, headers, status)
+    #   Takes a GET response and yields the '@odata.id' links process_uri would follow from it
+    ###############################################################################################
+    def linked_uris(self, json_payload, headers, status):
+        if not (headers and status) or status != rf_utility.HTTP_OK or not isinstance(json_payload, dict):
+            return
+        for key in json_payload:
+            if 'Oem' in key or 'JsonSchemas' in key:
+                continue
+            if isinstance(json_payload[key], dict):
+                for url_, nested_key_ in self.process_dict(json_payload[key], key):
+                    yield url_
+            elif isinstance(json_payload[key], list):
+                for url_, nested_key_ in self.process_list(json_payload[key], key):
+                    yield url_
+
+    ###############################################################################################
+    # Name: crawl_GET(url)
+    #   Returns the response fetched for url by fetch_resource_tree, GETs it if it was not fetched
+    ###############################################################################################
+    def crawl_GET(self, url):
+        uri_key = rf_utility.normalize_resource_uri(url)
+        if uri_key in self.crawl_responses:
+            return self.crawl_responses[uri_key]
+        return self.http_GET(url, self.request_headers(), 'on')
 
     ###############################################################################################
     # Name: process_uri(url, nested_key = None)
@@ -561,8 +722,7 @@ class SUT():
     #   the dictionary or list recursively
     ###############################################################################################
     def process_uri(self, url, nested_key = None):
-        rq_headers = self.request_headers()      
-        json_payload, headers, status = self.http_GET(url, rq_headers, 'on')
+        json_payload, headers, status = self.crawl_GET(url)
         if not (headers and status):
             return
         elif (status != rf_utility.HTTP_OK) :
@@ -578,13 +738,8 @@ class SUT():
                         nested_key_ = key
                     result = self.process_dict(json_payload[key], nested_key_)
                     for url_, nested_key_ in result:
-                        skip = False
                         # make sure urls not already been traversed, if so skip it
-                        for relative_uri in self.relative_uris.values():
-                            if url_ == relative_uri:
-                                skip = True
-                                break
-                        if not skip:
+                        if self.mark_visited(url_):
                             self.relative_uris[nested_key_] = url_
                             self.relative_uris_no_members[nested_key_] = url_
                             print('%s :%s' % (nested_key_, url_))
@@ -599,13 +754,8 @@ class SUT():
                     url = self.process_list(json_payload[key], nested_key_)
                     count = 0
                     for url_, nested_key_ in url:
-                        skip = False
                         # make sure urls not already been traversed, if so skip it
-                        for relative_uri in self.relative_uris.values():
-                            if url_ == relative_uri:
-                                skip = True
-                                break
-                        if not skip:
+                        if self.mark_visited(url_):
                             count+=1
                             nested_key__ = nested_key_ + '_' + str(count)                       
                             self.relative_uris[nested_key__] = url_
@@ -613,6 +763,19 @@ class SUT():
                             self.process_uri(url_, nested_key__)      
                                
 
+    ###############################################################################################
+    # Name: mark_visited(url)
+    #   Takes a resource uri found while crawling and records it in the visited index
+    # Return:
+    #   True if the uri had not been traversed yet, else False
+    ###############################################################################################
+    def mark_visited(self, url):
+        uri_key = rf_utility.normalize_resource_uri(url)
+        if uri_key in self.visited_uris:
+            return False
+        self.visited_uris.add(uri_key)
+        return True
+
     ###############################################################################################
     # Name: process_dict(json_payload, nested_key)
     #   Takes json json_payload of a resource, searches base condition: a '@odata.id' within json_payload that
@@ -28,7 +28,7 @@ if (sys.version_info < (3, 0)):
     from urlparse import urlparse
     from urlparse import urljoin
     from StringIO import StringIO
-    from httplib import HTTPSConnection, HTTPConnection, responses
+    from httplib import HTTPSConnection, HTTPConnection, HTTPException, responses
     import urllib2
     from urllib import URLopener
 
@@ -38,11 +38,15 @@ else:
     from urllib.parse import urlparse
     from urllib.parse import urljoin
     from io import StringIO, BytesIO
-    from http.client import HTTPSConnection, HTTPConnection, responses
+    from http.client import HTTPSConnection, HTTPConnection, HTTPException, responses
     import urllib.request
     from urllib.request import URLopener
 
 import ssl
+import math
+import socket
+import threading
+from timeit import default_timer
 import json
 import argparse
 import base64
@@ -55,6 +59,7 @@ import os
 import zipfile
 import re
 import requests
+import rf_cache
 from bs4 import BeautifulSoup
 
 
@@ -96,6 +101,186 @@ HTTP_NOTACCEPTABLE = 406
    
 default_odata_version = '4.0'
 
+###############################################################################################
+# Class: TLSSessionCache
+#   Per-SUT TLS state: a single unverified SSLContext built once for all https connections to the
+#   SUT, plus the last TLS session negotiated with each host. New connections offer the cached
+#   session so that the service can do an abbreviated (resumed) handshake instead of a full one.
+###############################################################################################
+class TLSSessionCache:
+    def __init__(self):
+        try:
+            self.context = ssl._create_unverified_context()
+        except:
+            self.context = None
+        # netloc -> SSLSession
+        self.sessions = dict()
+        self.lock = threading.Lock()
+        # handshake statistics
+        self.full_handshakes = 0
+        self.resumed_handshakes = 0
+
+    ###############################################################################################
+    # Name: get(netloc)
+    #   Returns the TLS session cached for the host, else None
+    ###############################################################################################
+    def get(self, netloc):
+        with self.lock:
+            return self.sessions.get(netloc)
+
+    ###############################################################################################
+    # Name: handshake_done(netloc, tls_sock)
+    #   Takes host and freshly wrapped socket, counts the handshake as full or resumed and caches
+    #   the session for the next connection
+    ###############################################################################################
+    def handshake_done(self, netloc, tls_sock):
+        with self.lock:
+            if tls_sock.session_reused:
+                self.resumed_handshakes += 1
+            else:
+                self.full_handshakes += 1
+        self.remember(netloc, tls_sock)
+
+    ###############################################################################################
+    # Name: remember(netloc, tls_sock)
+    #   Caches the TLS session of the socket for the host. TLS 1.3 services only hand out the
+    #   session ticket after the handshake, so this is also called once a response has been read
+    ###############################################################################################
+    def remember(self, netloc, tls_sock):
+        tls_session = getattr(tls_sock, 'session', None)
+        if tls_session is None:
+            return
+        # a TLS 1.3 session is only resumable once its ticket has arrived
+        if tls_sock.version() == 'TLSv1.3' and not tls_session.has_ticket:
+            return
+        with self.lock:
+            self.sessions[netloc] = tls_session
+
+    ###############################################################################################
+    # Name: stats()
+    #   Returns a dictionary of full/resumed handshake counts
+    ###############################################################################################
+    def stats(self):
+        with self.lock:
+            return OrderedDict([('Full Handshakes', self.full_handshakes), ('Resumed Handshakes', self.resumed_handshakes)])
+
+###############################################################################################
+# Class: TimedConnection
+#   Mixin for the HTTP(S) connections which records how long the name resolution, TCP connect
+#   and TLS handshake of the connection took, in connect_timings (seconds), for the request the
+#   connection is opened for. Python 2 connections do not resolve through _create_connection,
+#   so their name resolution is counted in the TCP connect.
+###############################################################################################
+class TimedConnection:
+    def init_timings(self):
+        self._create_connection = self.timed_create_connection
+        self.connect_timings = None
+
+    ###############################################################################################
+    # Name: timed_create_connection(address, timeout, source_address)
+    #   Same as socket.create_connection, recording the name resolution and TCP connect times
+    ###############################################################################################
+    def timed_create_connection(self, address, timeout = socket._GLOBAL_DEFAULT_TIMEOUT, source_address = None):
+        start = default_timer()
+        host, port = address
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        resolved = default_timer()
+        self.connect_timings['DNS'] = resolved - start
+        error = socket.error('getaddrinfo returned no address for %s' % host)
+        for family, socktype, proto, canonname, sockaddr in addresses:
+            sock = None
+            try:
+                sock = socket.socket(family, socktype, proto)
+                if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+                    sock.settimeout(timeout)
+                if source_address:
+                    sock.bind(source_address)
+                sock.connect(sockaddr)
+                self.connect_timings['Connect'] = default_timer() - resolved
+                return sock
+            except socket.error as err:
+                error = err
+                if sock is not None:
+                    sock.close()
+        raise error
+
+    ###############################################################################################
+    # Name: timed_connect(connect)
+    #   Calls the connect function of the connection class; whatever time it took beyond the name
+    #   resolution and TCP connect is the TLS handshake
+    ###############################################################################################
+    def timed_connect(self, connect):
+        self.connect_timings = OrderedDict([('DNS', 0.0), ('Connect', 0.0)])
+        start = default_timer()
+        connect(self)
+        elapsed = default_timer() - start
+        if isinstance(self, HTTPSConnection):
+            self.connect_timings['TLS'] = max(elapsed - self.connect_timings['DNS'] - self.connect_timings['Connect'], 0.0)
+        else:
+            self.connect_timings['Connect'] = elapsed - self.connect_timings['DNS']
+
+###############################################################################################
+# Class: TimedHTTPConnection
+#   HTTPConnection recording its connect timings (see TimedConnection)
+###############################################################################################
+class TimedHTTPConnection(TimedConnection, HTTPConnection):
+    def __init__(self, host):
+        HTTPConnection.__init__(self, host)
+        self.init_timings()
+
+    def connect(self):
+        self.timed_connect(HTTPConnection.connect)
+
+###############################################################################################
+# Class: ResumableHTTPSConnection
+#   HTTPSConnection which offers the TLS session cached for its host when it connects and records
+#   whether the service resumed it, and its connect timings (see TimedConnection). Python
+#   versions without TLS session support (< 3.6) fall back to a regular full handshake
+###############################################################################################
+class ResumableHTTPSConnection(TimedConnection, HTTPSConnection):
+    def __init__(self, host, context = None, tls_sessions = None):
+        HTTPSConnection.__init__(self, host, context=context)
+        self.tls_sessions = tls_sessions
+        self.netloc = host
+        self.init_timings()
+
+    def connect(self):
+        self.timed_connect(ResumableHTTPSConnection.resumable_connect)
+
+    def resumable_connect(self):
+        if self.tls_sessions is None or sys.version_info[0:2] < (3, 6):
+            return HTTPSConnection.connect(self)
+        # TCP connect (and proxy tunnel, if any), then TLS handshake offering the cached session
+        HTTPConnection.connect(self)
+        if self._tunnel_host:
+            server_hostname = self._tunnel_host
+        else:
+            server_hostname = self.host
+        self.sock = self._context.wrap_socket(self.sock, server_hostname=server_hostname, session=self.tls_sessions.get(self.netloc))
+        self.tls_sessions.handshake_done(self.netloc, self.sock)
+
+# TLS state of all SUTs, (DisplayName, DnsName) -> TLSSessionCache
+tls_session_caches = dict()
+tls_session_caches_lock = threading.Lock()
+
+###############################################################################################
+# Name: get_tls_session_cache(sut_prop)
+#   Takes SUT properties and returns the TLS context/session cache for that SUT, creating it on
+#   first use
+###############################################################################################
+def get_tls_session_cache(sut_prop):
+    with tls_session_caches_lock:
+        if sut_key(sut_prop) not in tls_session_caches:
+            tls_session_caches[sut_key(sut_prop)] = TLSSessionCache()
+        return tls_session_caches[sut_key(sut_prop)]
+
+###############################################################################################
+# Name: sut_key(sut_prop)
+#   Takes SUT properties and returns the key under which per-SUT state is kept in this module
+###############################################################################################
+def sut_key(sut_prop):
+    return (sut_prop.get('DisplayName'), sut_prop['DnsName'])
+
 ###############################################################################################
 # Name: Connect_Server_NoSSL                                               
 # Description:   
@@ -136,15 +321,11 @@ def Connect_Server_NoSSL(sut_prop, host_ip_addr) :
                 exc_str = sys.exc_info()[0]
                 svr_conn = 0 # failure
         else:
-            # Python 3.4.3 or later
-            try:
-                cntxt = ssl._create_unverified_context()
-            except:
-                exc_str = sys.exc_info()[0]
-                cntxt = None  # failure
-
+            # Python 3.4.3 or later: all connections to this SUT share one context and resume
+            # the TLS sessions it caches
+            tls_sessions = get_tls_session_cache(sut_prop)
             try:
-                svr_conn = HTTPSConnection(host_ip_addr, context=cntxt)
+                svr_conn = ResumableHTTPSConnection(host_ip_addr, context=tls_sessions.context, tls_sessions=tls_sessions)
             except:
                 exc_str = sys.exc_info()[0]
                 svr_conn = 0 # failure
@@ -169,7 +350,7 @@ def Connect_Server_NoSSL(sut_prop, host_ip_addr) :
 def Connect_Server_NoSSL_NoHTTPS(sut_prop, host_ip_addr) :
 
     try:
-        svr_conn = HTTPConnection(host=host_ip_addr)
+        svr_conn = TimedHTTPConnection(host_ip_addr)
     except:
         exc_str = sys.exc_info()[0]
         svr_conn = 0  # failure
@@ -185,7 +366,303 @@ def Connect_Server_NoSSL_NoHTTPS(sut_prop, host_ip_addr) :
 ## end Connect Server No SSL
 
 ###############################################################################################
-# Name: http__set_auth_header()                                              
+# Class: ConnectionPool
+#   Per-SUT pool of keep-alive HTTP(S) connections keyed by (scheme, netloc). A connection is
+#   checked out for a single request/response exchange and handed back once the response payload
+#   has been read, so the next request to the same host reuses the open socket instead of paying
+#   for a new TCP and TLS handshake. Idle connections that the service has closed in the meantime
+#   are detected on reuse and transparently replaced with a fresh connection.
+###############################################################################################
+class ConnectionPool:
+    # requests which can be sent again safely if the connection fails after they were sent
+    Idempotent_Methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, sut_prop, max_idle = 8):
+        self.sut_prop = sut_prop
+        # maximum number of idle connections kept per (scheme, netloc)
+        self.max_idle = max_idle
+        # idle connections, (scheme, netloc) -> list of connections
+        self.idle = dict()
+        self.lock = threading.Lock()
+        # pool statistics
+        self.hits = 0
+        self.misses = 0
+        self.reconnects = 0
+
+    ###############################################################################################
+    # Name: connect(scheme, netloc)
+    #   Takes url scheme and network location and returns a new (not yet pooled) connection
+    ###############################################################################################
+    def connect(self, scheme, netloc):
+        # handle http, for conformance test purpose, sometimes we use http
+        if scheme == 'http':
+            server_connection = Connect_Server_NoSSL_NoHTTPS(self.sut_prop, netloc)
+        else:
+            server_connection = Connect_Server_NoSSL(self.sut_prop, netloc)
+        # remember where the connection belongs when it is released back to the pool
+        server_connection.pool_key = (scheme, netloc)
+        return server_connection
+
+    ###############################################################################################
+    # Name: checkout(scheme, netloc)
+    #   Takes url scheme and network location and returns an idle keep-alive connection for it if
+    #   one is available, else a new connection
+    # Returns:
+    #   connection, True if the connection was reused from the pool
+    ###############################################################################################
+    def checkout(self, scheme, netloc):
+        with self.lock:
+            idle = self.idle.get((scheme, netloc))
+            if idle:
+                self.hits += 1
+                return idle.pop(), True
+            self.misses += 1
+        return self.connect(scheme, netloc), False
+
+    ###############################################################################################
+    # Name: release(server_connection, response)
+    #   Takes a connection along with the response last received on it and puts it back in the
+    #   pool. Connections whose response has not been read completely or which the service asked
+    #   to close cannot carry another request and are closed instead
+    ###############################################################################################
+    def release(self, server_connection, response):
+        if isinstance(server_connection, ResumableHTTPSConnection) and server_connection.tls_sessions:
+            # pick up a TLS 1.3 session ticket that arrived with the response
+            server_connection.tls_sessions.remember(server_connection.netloc, server_connection.sock)
+        if response is not None and response.isclosed() and not response.will_close:
+            with self.lock:
+                idle = self.idle.setdefault(server_connection.pool_key, [])
+                if len(idle) < self.max_idle:
+                    idle.append(server_connection)
+                    return
+        server_connection.close()
+
+    ###############################################################################################
+    # Name: request(scheme, netloc, http_req, url_path, rq_headers, rq_body)
+    #   Issues the request on a pooled connection and receives the response. If a reused connection
+    #   turns out to be stale (closed by the service while idle), the request is retried once on a
+    #   fresh connection -- unless it changes the service (POST, PATCH, PUT, DELETE...) and had been
+    #   sent already, since the service may have acted on it; the error is raised then. The response is given the time the request started (request_start), the
+    #   timings of the request up to the first byte of the response (timings, seconds) and the
+    #   approximate size of the request line, headers and body (request_bytes) for
+    #   http__req_common to account
+    # Returns:
+    #   response, connection the response was received on
+    ###############################################################################################
+    def request(self, scheme, netloc, http_req, url_path, rq_headers, rq_body):
+        start = default_timer()
+        server_connection, reused = self.checkout(scheme, netloc)
+        sent = False
+        try:
+            server_connection.request(http_req, url_path, headers=rq_headers, body=rq_body)
+            sent = True
+            response = server_connection.getresponse()
+        except (socket.error, HTTPException):
+            server_connection.close()
+            if not reused or (sent and http_req not in self.Idempotent_Methods):
+                raise
+            with self.lock:
+                self.reconnects += 1
+            server_connection = self.connect(scheme, netloc)
+            server_connection.request(http_req, url_path, headers=rq_headers, body=rq_body)
+            response = server_connection.getresponse()
+
+        # the connect timings belong to the request the connection was opened for
+        timings = getattr(server_connection, 'connect_timings', None) or OrderedDict()
+        if hasattr(server_connection, 'connect_timings'):
+            server_connection.connect_timings = None
+        timings['First Byte'] = max(default_timer() - start - sum(timings.values()), 0.0)
+        response.request_start = start
+        response.timings = timings
+        response.request_bytes = len(http_req) + len(url_path) + 12 + len(rq_body or '') + \
+            sum(len(str(key)) + len(str(value)) + 4 for key, value in (rq_headers or {}).items())
+        return response, server_connection
+
+    ###############################################################################################
+    # Name: close()
+    #   Closes all idle connections in the pool
+    ###############################################################################################
+    def close(self):
+        with self.lock:
+            for idle in self.idle.values():
+                for server_connection in idle:
+                    server_connection.close()
+            self.idle = dict()
+
+    ###############################################################################################
+    # Name: stats()
+    #   Returns a dictionary of pool hit/miss/reconnect counts
+    ###############################################################################################
+    def stats(self):
+        with self.lock:
+            return OrderedDict([('Hits', self.hits), ('Misses', self.misses), ('Reconnects', self.reconnects)])
+
+# connection pools of all SUTs, (DisplayName, DnsName) -> ConnectionPool
+connection_pools = dict()
+connection_pools_lock = threading.Lock()
+
+###############################################################################################
+# Name: get_connection_pool(sut_prop)
+#   Takes SUT properties and returns the connection pool for that SUT, creating it on first use
+###############################################################################################
+def get_connection_pool(sut_prop):
+    with connection_pools_lock:
+        if sut_key(sut_prop) not in connection_pools:
+            connection_pools[sut_key(sut_prop)] = ConnectionPool(sut_prop)
+        return connection_pools[sut_key(sut_prop)]
+
+# name of what the requests of the current thread are made for (the assertion running on it)
+request_context = threading.local()
+
+###############################################################################################
+# Name: set_request_context(name)
+#   Attributes the requests made from now on by the current thread to name (e.g. the ID of the
+#   assertion running on it); None attributes them to the phase of the run again
+###############################################################################################
+def set_request_context(name):
+    request_context.name = name
+
+###############################################################################################
+# Name: percentiles(values)
+#   Returns the 50th, 95th and 99th percentiles (nearest rank) of a list of seconds, in
+#   milliseconds, or None if the list is empty
+###############################################################################################
+def percentiles(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return OrderedDict([('p%d' % p, round(1000 * values[max(int(math.ceil(p * len(values) / 100.0)) - 1, 0)], 3))
+                        for p in (50, 95, 99)])
+
+###############################################################################################
+# Class: RequestStats
+#   Per-SUT record of every request made through http__req_common: its method, the type of the
+#   resource returned, what it was made for (the assertion of the thread, else the phase of the
+#   run: Setup, Crawl, Cache or Assertions), its timings (seconds) and sizes. summary() groups
+#   the timings in percentiles by method, resource type and assertion. The lookups in the
+#   response cache are counted by what they were made for too.
+###############################################################################################
+class RequestStats:
+    # timings recorded for a request, the connection ones only for requests that opened one
+    Timings = ('DNS', 'Connect', 'TLS', 'First Byte', 'Total', 'Decompress', 'JSON')
+
+    def __init__(self):
+        self.phase = 'Setup'
+        # (method, resource type, made for, timings dict, request bytes, response bytes, decoded bytes)
+        self.requests = []
+        # made for -> [hits, misses] of the response cache
+        self.cache_lookups = dict()
+        # made for -> [OrderedDict of request counts by method, bytes sent, bytes received]
+        self.made_for_totals = dict()
+        self.lock = threading.Lock()
+
+    # what the requests of the current thread are made for
+    def made_for(self):
+        return getattr(request_context, 'name', None) or self.phase
+
+    def record(self, method, resource_type, timings, request_bytes, response_bytes, decoded_bytes):
+        made_for = self.made_for()
+        with self.lock:
+            self.requests.append((method, resource_type, made_for, timings, request_bytes, response_bytes, decoded_bytes))
+            totals = self.made_for_totals.setdefault(made_for, [OrderedDict(), 0, 0])
+            totals[0][method] = totals[0].get(method, 0) + 1
+            totals[1] += request_bytes
+            totals[2] += response_bytes
+
+    def record_cache_lookup(self, hit):
+        made_for = self.made_for()
+        with self.lock:
+            self.cache_lookups.setdefault(made_for, [0, 0])[0 if hit else 1] += 1
+
+    ###############################################################################################
+    # Name: made_for_summary(made_for)
+    #   Returns the number of requests of each method, the bytes sent and received and the
+    #   response cache hits and misses of the requests made for an assertion (or phase of the run)
+    ###############################################################################################
+    def made_for_summary(self, made_for):
+        with self.lock:
+            by_method, bytes_sent, bytes_received = self.made_for_totals.get(made_for, (OrderedDict(), 0, 0))
+            by_method = OrderedDict(by_method)
+            hits, misses = self.cache_lookups.get(made_for, (0, 0))
+        return OrderedDict([('Requests', by_method), ('Bytes_Sent', bytes_sent), ('Bytes_Received', bytes_received),
+                            ('Cache_Hits', hits), ('Cache_Misses', misses)])
+
+    ###############################################################################################
+    # Name: group_summary(requests)
+    #   Returns the request count, timing percentiles and byte counts of a list of requests
+    ###############################################################################################
+    def group_summary(self, requests):
+        summary = OrderedDict([('Requests', len(requests)),
+                               ('New_Connections', len([request for request in requests if 'Connect' in request[3]]))])
+        for timing in self.Timings:
+            summary[timing.replace(' ', '_') + '_ms'] = percentiles([request[3][timing] for request in requests if timing in request[3]])
+        summary['Request_Bytes'] = sum(request[4] for request in requests)
+        summary['Response_Bytes'] = sum(request[5] for request in requests)
+        summary['Decoded_Bytes'] = sum(request[6] for request in requests)
+        summary['Compression_Ratio'] = round(float(summary['Decoded_Bytes']) / summary['Response_Bytes'], 3) if summary['Response_Bytes'] else None
+        return summary
+
+    ###############################################################################################
+    # Name: summary()
+    #   Returns the summary of all the requests, and of those of each method, resource type and
+    #   assertion (or phase of the run)
+    ###############################################################################################
+    def summary(self):
+        with self.lock:
+            requests = list(self.requests)
+        summary = self.group_summary(requests)
+        for group_name, index in (('By_Method', 0), ('By_Resource_Type', 1), ('By_Assertion', 2)):
+            groups = OrderedDict()
+            for request in requests:
+                groups.setdefault(request[index], []).append(request)
+            summary[group_name] = OrderedDict((name, self.group_summary(groups[name])) for name in sorted(groups))
+        return summary
+
+    ###############################################################################################
+    # Name: stats()
+    #   Returns a dictionary of request count, total time percentiles and byte counts
+    ###############################################################################################
+    def stats(self):
+        with self.lock:
+            requests = list(self.requests)
+        total = percentiles([request[3]['Total'] for request in requests]) or OrderedDict()
+        return OrderedDict([('Requests', len(requests))] + [('Total %s ms' % p, value) for p, value in total.items()] +
+                           [('Bytes Sent', sum(request[4] for request in requests)),
+                            ('Bytes Received', sum(request[5] for request in requests)),
+                            ('Bytes Decoded', sum(request[6] for request in requests))])
+
+# request statistics of all SUTs, (DisplayName, DnsName) -> RequestStats
+request_stats = dict()
+request_stats_lock = threading.Lock()
+
+###############################################################################################
+# Name: get_request_stats(sut_prop)
+#   Takes SUT properties and returns the request statistics of that SUT, creating them on first
+#   use
+###############################################################################################
+def get_request_stats(sut_prop):
+    with request_stats_lock:
+        if sut_key(sut_prop) not in request_stats:
+            request_stats[sut_key(sut_prop)] = RequestStats()
+        return request_stats[sut_key(sut_prop)]
+
+###############################################################################################
+# Name: response_resource_type(resource_uri, payload)
+#   Returns the resource type a response is accounted under: the type name of its @odata.type,
+#   else '$metadata' / 'odata' for those documents, else 'Other'
+###############################################################################################
+def response_resource_type(resource_uri, payload):
+    if isinstance(payload, dict) and isinstance(payload.get('@odata.type'), str):
+        return payload['@odata.type'].rsplit('.', 1)[-1].lstrip('#')
+    path = urlparse(resource_uri).path.rstrip('/')
+    if path.endswith('$metadata'):
+        return '$metadata'
+    if path.endswith('/odata'):
+        return 'odata'
+    return 'Other'
+
+###############################################################################################
+# Name: http__set_auth_header()                                            
 # Description:  
 #  common code for the http requests -- this function:
 #  sets up the authorization header and centralizes code to ease
@@ -234,6 +711,145 @@ def get_auth_encoded(login, password) :
  
 ## end get_auth_encoded
 
+###############################################################################################
+# Name: auth_mode(sut_prop)
+#   Returns how requests made with authorization 'on' are authenticated, set through the
+#   optional "AuthMode" property of the SUT: 'session' for "Session", else 'basic'
+###############################################################################################
+def auth_mode(sut_prop):
+    return 'session' if str(sut_prop.get('AuthMode', 'Basic')).lower() == 'session' else 'basic'
+
+###############################################################################################
+# Class: SessionAuth
+#   Redfish session of a SUT in the 'session' auth mode. The session is created with the login
+#   name and password of the SUT on the first authenticated request, and its X-Auth-Token is sent
+#   instead of Basic credentials on every authenticated request after that. If the service
+#   rejects the token (the session timed out or was deleted), a new session is created and the
+#   request is sent again. If no session can be created, requests fall back to Basic
+#   authentication. logout() deletes the session.
+###############################################################################################
+class SessionAuth:
+    # Sessions collection used if the service root does not link to one
+    Default_Sessions_Uri = '/redfish/v1/SessionService/Sessions'
+
+    def __init__(self, sut_prop):
+        self.sut_prop = sut_prop
+        self.token = None
+        self.session_uri = None
+        # set once creating a session failed, requests use Basic authentication from then on
+        self.failed = False
+        self.lock = threading.Lock()
+        self.logins = 0
+        self.reauthentications = 0
+        self.logouts = 0
+
+    ###############################################################################################
+    # Name: sessions_uri()
+    #   Returns the URI of the Sessions collection linked from the service root
+    ###############################################################################################
+    def sessions_uri(self):
+        json_payload, headers, status = http__req_common(self.sut_prop, 'GET', '/redfish/v1/', create_request_headers(), None, 'off')
+        try:
+            return json_payload['Links']['Sessions']['@odata.id']
+        except (KeyError, TypeError):
+            return self.Default_Sessions_Uri
+
+    ###############################################################################################
+    # Name: login()
+    #   Creates a session with the login name and password of the SUT; called with the lock held
+    ###############################################################################################
+    def login(self):
+        sessions_uri = self.sessions_uri()
+        rq_body = json.dumps({'UserName': self.sut_prop['LoginName'], 'Password': self.sut_prop['Password']})
+        json_payload, headers, status = http__req_common(self.sut_prop, 'POST', sessions_uri, create_request_headers(), rq_body, 'off')
+        if status in [HTTP_OK, HTTP_CREATED] and headers and 'x-auth-token' in headers:
+            self.token = headers['x-auth-token']
+            if 'location' in headers:
+                self.session_uri = urlparse(headers['location']).path
+            elif isinstance(json_payload, dict):
+                self.session_uri = json_payload.get('@odata.id')
+            self.logins += 1
+        else:
+            print('ERROR: Could not create a session thru POST %s (HTTP status %s), using Basic authentication instead' % (sessions_uri, status))
+            self.failed = True
+
+    ###############################################################################################
+    # Name: set_auth_header(rq_headers)
+    #   Sets the X-Auth-Token header of the session in rq_headers, creating the session first if
+    #   there is none, or the Basic authorization header if no session could be created
+    # Returns:
+    #   the token set, or None if Basic authentication is used
+    ###############################################################################################
+    def set_auth_header(self, rq_headers):
+        with self.lock:
+            if self.token is None and not self.failed:
+                self.login()
+            token = self.token
+        if token is None:
+            http__set_auth_header(rq_headers, self.sut_prop['LoginName'], self.sut_prop['Password'])
+            return None
+        rq_headers.pop('Authorization', None)
+        rq_headers['X-Auth-Token'] = token
+        return token
+
+    ###############################################################################################
+    # Name: reauthenticate(token)
+    #   Takes a token the service rejected and creates a new session, unless another request
+    #   already replaced that token
+    ###############################################################################################
+    def reauthenticate(self, token):
+        with self.lock:
+            if self.token == token:
+                self.token = None
+                self.session_uri = None
+                self.reauthentications += 1
+                self.login()
+
+    ###############################################################################################
+    # Name: logout()
+    #   Deletes the session, if one was created
+    ###############################################################################################
+    def logout(self):
+        with self.lock:
+            token, session_uri = self.token, self.session_uri
+            self.token = None
+            self.session_uri = None
+            self.failed = False
+        if token is None or session_uri is None:
+            return
+        rq_headers = create_request_headers()
+        rq_headers['X-Auth-Token'] = token
+        json_payload, headers, status = http__req_common(self.sut_prop, 'DELETE', session_uri, rq_headers, None, 'off')
+        if status in [HTTP_OK, HTTP_NO_CONTENT, HTTP_ACCEPTED]:
+            self.logouts += 1
+        else:
+            print('WARN: Could not delete the session %s (HTTP status %s)' % (session_uri, status))
+
+    ###############################################################################################
+    # Name: stats()
+    #   Returns a dictionary of session logins, re-authentications after a rejected token and
+    #   logouts
+    ###############################################################################################
+    def stats(self):
+        with self.lock:
+            return OrderedDict([('Logins', self.logins), ('Reauthentications', self.reauthentications),
+                                ('Logouts', self.logouts)])
+
+# sessions of all SUTs, (DisplayName, DnsName) -> SessionAuth
+session_auths = dict()
+session_auths_lock = threading.Lock()
+
+###############################################################################################
+# Name: get_session_auth(sut_prop)
+#   Takes SUT properties and returns the session authentication of that SUT, creating it on
+#   first use
+###############################################################################################
+def get_session_auth(sut_prop):
+    with session_auths_lock:
+        if sut_key(sut_prop) not in session_auths:
+            session_auths[sut_key(sut_prop)] = SessionAuth(sut_prop)
+        return session_auths[sut_key(sut_prop)]
+
 
 ###############################################################################################
 # Name: http__req_resp()                                              
@@ -249,14 +865,33 @@ def get_auth_encoded(login, password) :
 #   rq_headers: the reqeuest headers
 #   rq_body: the body of the request in json format
 #   auth_on_off: if set to 'on' then authorization is enabled for the request 
-#       by adding the 'Authorization' header to the request; else the request
-#       is made without this function adding authorization parameters into 
-#       the request headers
+#       by adding the 'Authorization' header to the request, or the 'X-Auth-Token'
+#       header of the SUT's session if its "AuthMode" is "Session"; 'basic' always
+#       adds the 'Authorization' header; else the request is made without this
+#       function adding authorization parameters into the request headers
 #
 # Returns:
-#   response:  the response recieved                                                  
+#   response:  the response recieved
 ###############################################################################################
 def http__req_resp(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth_on_off) :
+    # the caller owns the response from here on, so the connection is not handed back to the pool
+    response, server_connection = http__req_resp_pooled(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth_on_off)
+    return response
+#
+## end http__req_resp
+
+###############################################################################################
+# Name: http__req_resp_pooled()
+# Description:
+#   same as http__req_resp() but also returns the pooled connection the response was received
+#   on, so that the caller can release it back to the SUT's connection pool once the response
+#   has been read
+#
+# Returns:
+#   response:  the response recieved
+#   server_connection: the connection the response was received on
+###############################################################################################
+def http__req_resp_pooled(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth_on_off) :
 
     if (rq_headers == None):
         rq_headers = create_request_headers()
@@ -281,40 +916,40 @@ def http__req_resp(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth_o
     else:
         url_ip = url.netloc
         url_path = url.path
-
-        if url.scheme == 'https':
-        ### get fresh connection
-            server_connection = Connect_Server_NoSSL(sut_prop, url_ip)
-            # handle http, for conformance test purpose, sometimes we use http
-        elif url.scheme == 'http':
-            server_connection = Connect_Server_NoSSL_NoHTTPS(sut_prop, url_ip)
-        else:
-            server_connection = Connect_Server_NoSSL(sut_prop, url_ip)
-
-        # setup auth header: set login name and password for the sut_prop...
-        if (auth_on_off == 'on'):
+        # anything other than plain http goes over https
+        url_scheme = 'http' if url.scheme == 'http' else 'https'
+
+        # setup auth header: the session token or the login name and password for the sut_prop...
+        session_auth = None
+        token = None
+        if (auth_on_off == 'on') and auth_mode(sut_prop) == 'session':
+            session_auth = get_session_auth(sut_prop)
+            token = session_auth.set_auth_header(rq_headers)
+        elif (auth_on_off in ['on', 'basic']):
             http__set_auth_header(rq_headers, sut_prop['LoginName'], sut_prop['Password'])
 
-        # issue the http request
+        # issue the http request and receive the response on a pooled keep-alive connection
         try:
-            server_connection.request(http_req, url_path, headers=rq_headers, body=rq_body)
+            response, server_connection = get_connection_pool(sut_prop).request(url_scheme, url_ip, http_req, url_path, rq_headers, rq_body)
+            # the session expired or was deleted: create a new one and send the request again
+            if token is not None and response.status == HTTP_UNAUTHORIZED:
+                response.read()
+                get_connection_pool(sut_prop).release(server_connection, response)
+                session_auth.reauthenticate(token)
+                session_auth.set_auth_header(rq_headers)
+                response, server_connection = get_connection_pool(sut_prop).request(url_scheme, url_ip, http_req, url_path, rq_headers, rq_body)
         except:
             exc_str = sys.exc_info()[0]
-            print ('OPERATIONAL ERROR: %s Request for %s FAILED with exeption: %s' % (http_req, url_path, exc_str)) 
-            return     
+            print ('OPERATIONAL ERROR: %s Request for %s FAILED with exeption: %s' % (http_req, url_path, exc_str))
+            return None, None
         else:
-            # receive the response and payload
-            try:
-                response = server_connection.getresponse()
-            except:
-                exc_str = sys.exc_info()[0]
-                print ('OPERATIONAL ERROR: %s getresponse() for %s failed with exeption: %s - exiting test..' % (http_req, url_path, exc_str))
-                return
-            else:
-                return(response)
+            return response, server_connection
 #
-## end http__req_resp
+## end http__req_resp_pooled
+
 
+# guards updates of the cookie info shared by all requests of a SUT
+cookie_info_lock = threading.Lock()
 
 ###############################################################################################
 # Name: http__req_common()                                              
@@ -341,26 +976,36 @@ def http__req_resp(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth_o
 ###############################################################################################
 def http__req_common(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth_on_off, cookie_info = None) :
     ## issue the base request/get the response
-    r_response = http__req_resp(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth_on_off)
+    r_response, server_connection = http__req_resp_pooled(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth_on_off)
     if r_response:
         try:
             r_payload = r_response.read()
         except:
             exc_str = sys.exc_info()[0]
             print("Error trying to read http response: %s" % exc_str)
+            server_connection.close()
         else:
+            # response has been read completely, the connection can carry the next request
+            get_connection_pool(sut_prop).release(server_connection, r_response)
+
             # get the headers associated with the resp
             # convert the keys to lowercase so that string searches can be made w/o concern for case..    
             r_headers = dict()
+            response_bytes = len(r_payload)
             for key, value in r_response.getheaders():
+                response_bytes += len(key) + len(value) + 4
                 key = key.lower()
                 if key in r_headers:
                     r_headers[key] += ',' + value
                 else:
                     r_headers[key] = value
+            timings = r_response.timings
+            decoded_bytes = len(r_payload)
 
             #handle any http redirect... recursive call here...  
             if ("location" in r_headers.keys()) and (r_headers['location'] != resource_uri and r_response.status>= 300 and r_response.status < 400):
+                timings['Total'] = default_timer() - r_response.request_start
+                get_request_stats(sut_prop).record(http_req, 'Other', timings, r_response.request_bytes, response_bytes, decoded_bytes)
                 redirected_resource_uri = urlparse(r_headers['location'])
                 return(http__req_common(sut_prop, http_req, redirected_resource_uri.path, rq_headers, rq_body, auth_on_off, cookie_info))
 
@@ -371,17 +1016,20 @@ def http__req_common(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth
                 cookie_detail = tuple()
                 #set cookie True if Set-Cookie is found, service is not expected to return Cookies in the header
                 if 'set-cookie' in r_headers.keys():
-                    cookie_info[0] = True
-                    cookie_info[2] += 1
-                    # set details of request type and url where cookie was found
-                    cookie_detail = (http_req , resource_uri)
-                    cookie_info[1].append(cookie_detail)
+                    # requests to a SUT may be issued from several threads
+                    with cookie_info_lock:
+                        cookie_info[0] = True
+                        cookie_info[2] += 1
+                        # set details of request type and url where cookie was found
+                        cookie_detail = (http_req , resource_uri)
+                        cookie_info[1].append(cookie_detail)
         
 
             # check to  see if the payload is gzip'd - if so un-gzip it
             if ('content-encoding' in r_headers.keys()):
                 if (r_headers['content-encoding'] == 'gzip'):
                     #un-gzip the payload
+                    decompress_start = default_timer()
                     try:
                         if (Python3 == True):
                             gz_payload = gzip.GzipFile(fileobj=BytesIO(r_payload))
@@ -390,10 +1038,12 @@ def http__req_common(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth
                             gz_payload = gzip.GzipFile(fileobj=StringIO(r_payload))
                 
                         r_payload = gz_payload.read()
+                        decoded_bytes = len(r_payload)
 
                     except:
                         exc_str = sys.exc_info()[0]
                         print("Error trying to un-gzip payload: %s" % exc_str)
+                    timings['Decompress'] = default_timer() - decompress_start
 
             # if a payload is returned in json format then load it into a json dictionary here...
             is_json = False
@@ -401,11 +1051,13 @@ def http__req_common(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth
                 if ('application/json' in r_headers['content-type']):
                     is_json = True
                     if (r_payload) : # if there is a resp payload ...
+                        json_start = default_timer()
                         try:
                             r_payload = json.loads(r_payload.decode('utf-8'))
                         except:
                             exc_str = sys.exc_info()[0]
                             print ("Error trying load %s payload to JSON: %s" % (resource_uri, exc_str))
+                        timings['JSON'] = default_timer() - json_start
             ''' 
             #log dump                   
                 # dump the response headers and payload to the text log file
@@ -422,6 +1074,10 @@ def http__req_common(sut_prop, http_req, resource_uri, rq_headers, rq_body, auth
                         print("response: %s" % r_headers)   
             '''
 
+            timings['Total'] = default_timer() - r_response.request_start
+            get_request_stats(sut_prop).record(http_req, response_resource_type(resource_uri, r_payload), timings,
+                                               r_response.request_bytes, response_bytes, decoded_bytes)
+
             return (r_payload, r_headers, r_response.status)
 
     else:
@@ -713,19 +1369,47 @@ def parse_unversioned_odata_type(odata_type):
     return typename
 
 ###############################################################################################
-# Name: get_resource_json_metadata(namespace, json_directory)
-#   Takes namespace string and directory path for json schemas. Walks the direcotry to find the
-#   json schema for that namespace and loads json in a string
+# Name: normalize_resource_uri(resource_uri)
+#   Takes a resource uri as found in an '@odata.id' and reduces it to the form used to tell
+#   whether two links refer to the same resource: scheme and host of an absolute uri, the
+#   fragment and a trailing slash are dropped, the query string is kept
+# Return:
+#   normalized uri string
+###############################################################################################
+def normalize_resource_uri(resource_uri):
+    url = urlparse(resource_uri)
+    path = url.path
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+    if url.query:
+        path += '?' + url.query
+    return path
+
+## number of parsed JSON schema documents kept by the cache of each json-schema directory
+JsonSchemaCacheDocuments = 256
+
+# JSON schema caches, schema source key -> rf_cache.JsonSchemaCache
+json_schema_caches = dict()
+json_schema_caches_lock = threading.Lock()
+
+###############################################################################################
+# Name: get_json_schema_cache(schema_source)
+#   Takes the schema source (rf_schema_source) and returns the index/cache of its JSON schema
+#   documents, creating it on first use
+###############################################################################################
+def get_json_schema_cache(schema_source):
+    with json_schema_caches_lock:
+        if schema_source.key not in json_schema_caches:
+            json_schema_caches[schema_source.key] = rf_cache.JsonSchemaCache(schema_source, JsonSchemaCacheDocuments)
+        return json_schema_caches[schema_source.key]
+
+###############################################################################################
+# Name: get_resource_json_metadata(namespace, schema_source)
+#   Takes namespace string and the schema source of the json schemas. Looks up the json schema
+#   for that namespace in the index of the source and loads it, or takes it from the cache of
+#   the documents already loaded (which must not be changed)
 # Return:
-#   If found, returns string loaded with json schema and schema file path
+#   If found, returns string loaded with json schema and schema file name, else None, None
 ###############################################################################################  
-def get_resource_json_metadata(namespace, json_directory):                            
-    for dirpath, dirnames, files in os.walk(json_directory):
-        for schema_file in files:
-            if (namespace + '.json') == schema_file:
-                json_file = os.path.join(dirpath, schema_file)
-                if json_file:
-                    with open(json_file) as data_file:    
-                        data = json.load(data_file)
-                        return data, schema_file
-        return None, None
+def get_resource_json_metadata(namespace, schema_source):                            
+    return get_json_schema_cache(schema_source).get(namespace)
@@ -24,6 +24,8 @@ from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
 import time
 from time import gmtime, strftime
+from rfs_test import assertion_executor
+from rfs_test import assertion_registry
 
 accSerData = None
 testAccountId = None
@@ -102,6 +104,7 @@ def isLocked(self):
 # AUTH connections.
 ###################################################################################################
 
+@assertion_registry.register('ACCO101', section='AccountService', mutates=True, resources=['AccountService'])
 def Assertion_ACCO101(self, log):
 
     log.AssertionID = 'ACCO101'
@@ -166,6 +169,7 @@ def Assertion_ACCO101(self, log):
 ###################################################################################################
 
 
+@assertion_registry.register('ACCO102', section='AccountService', resources=['AccountService'])
 def Assertion_ACCO102(self, log):
 
     log.AssertionID = 'ACCO102'
@@ -218,6 +222,7 @@ def Assertion_ACCO102(self, log):
 ###################################################################################################
 
 
+@assertion_registry.register('ACCO103', section='AccountService', resources=['AccountService'])
 def Assertion_ACCO103(self, log):
 
     log.AssertionID = 'ACCO103'
@@ -268,6 +273,7 @@ def Assertion_ACCO103(self, log):
 # password to be set to.
 ###################################################################################################
 
+@assertion_registry.register('ACCO104', section='AccountService', resources=['AccountService'])
 def Assertion_ACCO104(self, log):
 
     log.AssertionID = 'ACCO104'
@@ -319,6 +325,7 @@ def Assertion_ACCO104(self, log):
 # account is locked.  If set to 0, no lockout shall ever occur.
 ###################################################################################################
 
+@assertion_registry.register('ACCO105', section='AccountService', mutates=True, resources=['AccountService'], setup=createDummyAccount, teardown=deleteDummyAccount)
 def Assertion_ACCO105(self, log):
 
     log.AssertionID = 'ACCO105'
@@ -371,6 +378,7 @@ def Assertion_ACCO105(self, log):
 ###################################################################################################
 
 
+@assertion_registry.register('ACCO106', section='AccountService', mutates=True, resources=['SessionService', 'AccountService'], setup=createDummyAccount, teardown=deleteDummyAccount)
 def Assertion_ACCO106(self, log):
 
     log.AssertionID = 'ACCO106'
@@ -442,12 +450,12 @@ def Assertion_ACCO106(self, log):
 # Testing
 
 def run(self, log):
-    assertion_status = Assertion_ACCO101(self, log)
-    assertion_status = Assertion_ACCO103(self, log)
-    assertion_status = Assertion_ACCO104(self, log)
-    createDummyAccount(self)
-    assertion_status = Assertion_ACCO105(self, log)
-    deleteDummyAccount(self)
-    createDummyAccount(self)
-    assertion_status = Assertion_ACCO106(self, log)
-    deleteDummyAccount(self)
+    # ACCO105 and ACCO106 create and delete their dummy account thru the setup/teardown they are
+    # registered with
+    assertion_executor.run_assertions(self, log, [
+        Assertion_ACCO101,
+        Assertion_ACCO103,
+        Assertion_ACCO104,
+        Assertion_ACCO105,
+        Assertion_ACCO106,
+    ])
@@ -21,6 +21,8 @@ import json
 from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
 from time import gmtime, strftime
+from rfs_test import assertion_executor
+from rfs_test import assertion_registry
 
 accSerData = None
 
@@ -35,6 +37,7 @@ REDFISH_SPEC_VERSION = "Version 1.2.2"
 #associated Action, and shall be false if the parameter is not required (optional) to perform the
 #associated Action.
 ###################################################################################################
+@assertion_registry.register('ACTI104', section='ActionInfo', mutates=True, resources=['ComputerSystem', 'ActionInfo'])
 def Assertion_ACTI104(self,log) :
     log.AssertionID = 'ACTI104'
     assertion_status = log.PASS
@@ -105,7 +108,7 @@ def Assertion_ACTI104(self,log) :
 
 def run(self, log):
 
-    assertion_status = Assertion_ACTI104(self, log)
+    assertion_executor.run_assertions(self, log, [Assertion_ACTI104])
 
 
     
@@ -16,6 +16,9 @@
 #   Robin Thekkadathu Ronson ~ Texas Tech University
 #####################################################################################################
 
+from rfs_test import assertion_executor
+from rfs_test import assertion_registry
+
 ###################################################################################################
 # Name: Assertion_ASSE114(self, log) : Assembly
 # Assertion text:
@@ -25,6 +28,7 @@
 # Service, shall replace the binary image of the assembly.
 ###################################################################################################
 
+@assertion_registry.register('ASSE114', section='Assembly', mutates=True, resources=['Chassis', 'Assembly'])
 def Assertion_ASSE114(self, log):
 
     log.AssertionID = 'ASSE114'
@@ -96,4 +100,4 @@ def Assertion_ASSE114(self, log):
 # Testing
 
 def run(self, log):
-    assertion_status = Assertion_ASSE114(self, log)
+    assertion_executor.run_assertions(self, log, [Assertion_ASSE114])
@@ -20,6 +20,8 @@ import json
 import string
 from openpyxl import load_workbook
 from openpyxl.styles import PatternFill
+from rfs_test import assertion_executor
+from rfs_test import assertion_registry
 
 # Helper Functions
 
@@ -44,6 +46,7 @@ def put_test(self, uri):
 # PATCH or PUT requests containing this value by returning HTTP 400 (Bad Request).
 ###################################################################################################
 
+@assertion_registry.register('COMP139', section='ComputerSystem', mutates=True, resources=['ComputerSystem', 'Assembly'])
 def Assertion_COMP139(self, log):
     log.AssertionID = 'COMP139'
     assertion_status = log.PASS
@@ -114,4 +117,4 @@ def Assertion_COMP139(self, log):
 
 
 def run(self, log):
-    assertion_status = Assertion_COMP139(self, log)
+    assertion_executor.run_assertions(self, log, [Assertion_COMP139])
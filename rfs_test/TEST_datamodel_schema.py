@@ -22,6 +22,8 @@
 import sys
 import re
 import rf_utility
+from rfs_test import assertion_registry
+from rfs_test import assertion_executor
 import xml.etree.ElementTree as ET
 from xml.dom import minidom
 
@@ -82,6 +84,7 @@ def cacheURI(self):
 #   2. The type shall be defined in a Redfish schema document (verify against the namespace identified)  
 #   should we check for all relative uris?           
 ###################################################################################################
+@assertion_registry.register('7.0.1')
 def Assertion_7_0_1(self, log):
     log.AssertionID = '7.0.1'
     assertion_status =  log.PASS
@@ -119,6 +122,7 @@ def Assertion_7_0_1(self, log):
 #             referenced in the $metadata and try to find it within the References element of each
 #             schema file.
 ###################################################################################################
+@assertion_registry.register('7.2.1', resources=['*', '$metadata'])
 def Assertion_7_2_1(self, log):
     log.AssertionID = '7.2.1'
     assertion_status =  log.PASS
@@ -170,6 +174,7 @@ def camel(s):
 #   Resource Name, Property Names and constants such as Enumerations shall be Pascal-cased
 #   The first letter of each work shall be upper case with spaces between words shall be removed                
 ###################################################################################################
+@assertion_registry.register('7.3.0', resources=['*'])
 def Assertion_7_3_0(self, log):
  
     log.AssertionID = '7.3.0'
@@ -214,6 +219,7 @@ def Assertion_7_3_0(self, log):
 #   The outer element of the OData Schema representation document shall be the Edmx element, and shall 
 #   have a 'Version' attribute with a value of "4.0".    
 ###################################################################################################
+@assertion_registry.register('7.5.2')
 def Assertion_7_5_2(self, log):
     log.AssertionID = '7.5.2'
     assertion_status =  log.PASS
@@ -242,6 +248,7 @@ def Assertion_7_5_2(self, log):
 # Assertion text: 
 # All resources shall include Description and LongDescription annotations i.e EntityTypes under Schema
 ###################################################################################################
+@assertion_registry.register('7.5.3')
 def Assertion_7_5_3(self, log):
     log.AssertionID = '7.5.3'
     assertion_status =  log.PASS
@@ -273,6 +280,7 @@ def Assertion_7_5_3(self, log):
 # Assertion text: 
 # Property names in the Request and Response JSON Payload shall match the casing of the value of the Name attribute
 ###################################################################################################
+@assertion_registry.register('7.5.4', resources=['*', 'Chassis'])
 def Assertion_7_5_4(self, log):
     log.AssertionID = '7.5.4'
     assertion_status =  log.PASS
@@ -331,6 +339,7 @@ def Assertion_7_5_4(self, log):
 # All properties shall include Description and LongDescription annotations.  Checking all
 # Property types : Property (within EntityType and ComplexType)
 ###################################################################################################
+@assertion_registry.register('7.5.5')
 def Assertion_7_5_5(self, log):
     log.AssertionID = '7.5.5'
     assertion_status =  log.PASS
@@ -373,6 +382,7 @@ def Assertion_7_5_5(self, log):
 # Properties that are read-only are annotated with the Permissions annotation with a value of ODataPermissions/Read
 #####################################################################################################################
 
+@assertion_registry.register('7.5.6')
 def Assertion_7_5_6(self, log):
     log.AssertionID = '7.5.6'
     assertion_status =  log.PASS
@@ -407,6 +417,7 @@ def Assertion_7_5_6(self, log):
 # Properties that are required to be implemented by all services are annotated with the required annotation.
 ###############################################################################################################
 
+@assertion_registry.register('7.5.7')
 def Assertion_7_5_7(self, log):
     log.AssertionID = '7.5.7'
     assertion_status =  log.PASS
@@ -440,6 +451,7 @@ def Assertion_7_5_7(self, log):
 # Assertion text: 
 # Structured types shall include Description and LongDescription annotations. i.e ComplexTypes 
 ###################################################################################################
+@assertion_registry.register('7.5.8')
 def Assertion_7_5_8(self, log):
     log.AssertionID = '7.5.8'
     assertion_status =  log.PASS
@@ -477,6 +489,7 @@ def Assertion_7_5_8(self, log):
 # Assertion text: 
 # Enumeration Types shall include Description and LongDescription annotations.
 ###################################################################################################
+@assertion_registry.register('7.5.9')
 def Assertion_7_5_9(self, log):
     log.AssertionID = '7.5.9'
     assertion_status =  log.PASS
@@ -505,6 +518,7 @@ def Assertion_7_5_9(self, log):
 # Assertion text: 
 # Enumeration Members shall include Description annotations.
 ###################################################################################################
+@assertion_registry.register('7.5.10')
 def Assertion_7_5_10(self, log):
     log.AssertionID = '7.5.10'
     assertion_status =  log.PASS
@@ -647,6 +661,7 @@ def verify_typename_in_json_metadata(typename, json_metadata):
 # String="Instances of this type may contain properties in addition to those declared in $metadata", 
 # does it mean the context url of the resource?
 ###################################################################################################
+@assertion_registry.register('7.5.11', resources=['*'])
 def Assertion_7_5_11(self, log):
     log.AssertionID = '7.5.11'
     assertion_status =  log.PASS
@@ -678,7 +693,7 @@ def Assertion_7_5_11(self, log):
             if '@odata.type' in json_payload:
                 namespace, typename = rf_utility.parse_odata_type(json_payload['@odata.type'])
                 if namespace and typename:
-                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.json_directory)     
+                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.schema_source)     
                     if json_metadata and schema_file:           
                         if verify_typename_in_json_metadata(typename, json_metadata):
                             if annotation_term in json_metadata['definitions'][typename]:
@@ -793,6 +808,7 @@ def _Assertion_7_4_13(self, log):
 # If a value is unknown, then null is an acceptable values in most cases. 
 # required is True by default, so unless it is a False, it should be in the payload with a value or null
 ###################################################################################################
+@assertion_registry.register('7.5.14', resources=['*'])
 def Assertion_7_5_14(self, log):
     log.AssertionID = '7.5.14'
     assertion_status =  log.PASS
@@ -821,7 +837,7 @@ def Assertion_7_5_14(self, log):
             if '@odata.type' in json_payload:
                 namespace, typename = rf_utility.parse_odata_type(json_payload['@odata.type'])
                 if namespace and typename:
-                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.json_directory)     
+                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.schema_source)     
                     if json_metadata and schema_file:           
                         if verify_typename_in_json_metadata(typename, json_metadata):
                             if annotation_term in json_metadata['definitions'][typename]:
@@ -841,6 +857,7 @@ def Assertion_7_5_14(self, log):
 # Properties not returned from a GET operation shall indicate that the property is not currently supported by the 
 # implementation
 ###################################################################################################
+@assertion_registry.register('7.5.14.1', resources=['*'])
 def Assertion_7_5_14_1(self, log):
     log.AssertionID = '7.5.14.1'
     assertion_status =  log.PASS
@@ -869,7 +886,7 @@ def Assertion_7_5_14_1(self, log):
             if '@odata.type' in json_payload:
                 namespace, typename = rf_utility.parse_odata_type(json_payload['@odata.type'])
                 if namespace and typename:
-                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.json_directory)     
+                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.schema_source)     
                     if json_metadata and schema_file:           
                         if verify_typename_in_json_metadata(typename, json_metadata):
                             if annotation_term in json_metadata['definitions'][typename]:
@@ -902,6 +919,7 @@ def check_property_in_payload(property, json_payload):
 # Assertion text: required property shall be annotated with Nullable = False
 # cannot contain null values, (not necc to have the property in the payload?)
 ###################################################################################################
+@assertion_registry.register('7.5.13', resources=['*'])
 def Assertion_7_5_13_xml(self, log):
     log.AssertionID = '7.5.13'
     assertion_status =  log.PASS
@@ -986,7 +1004,7 @@ def _Assertion_7_5_13(self, log):
             if '@odata.type' in json_payload:
                 namespace, typename = rf_utility.parse_odata_type(json_payload['@odata.type'])
                 if namespace and typename:
-                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.json_directory)     
+                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.schema_source)     
                     if json_metadata and schema_file:           
                         if verify_typename_in_json_metadata(typename, json_metadata):
                             if annotation_term in json_metadata['definitions'][typename] and 'properties' in json_metadata['definitions'][typename]:
@@ -1023,6 +1041,7 @@ def check_unit_instance(xtype, schema, namespace, log):
 # shall be annotated with the Units annotation term in order to specify the units of measurement for 
 # the property. check for annotation term 'Measures.Unit'
 ###################################################################################################
+@assertion_registry.register('7.5.15')
 def Assertion_7_5_15(self, log):
     log.AssertionID = '7.5.15'
     assertion_status =  log.PASS
@@ -1094,6 +1113,7 @@ def Assertion_7_5_15(self, log):
 # All reference properties shall include Description and LongDescription annotations.
 # NavigationProperty within EntityType and ComplexType
 ###################################################################################################
+@assertion_registry.register('7.5.16')
 def Assertion_7_5_16(self, log):
     log.AssertionID = '7.5.16'
     assertion_status =  log.PASS
@@ -1133,6 +1153,7 @@ def Assertion_7_5_16(self, log):
 # OEM-specified objects that are contained within the Oem property must be 
 # valid JSON objects that follow the format of a Redfishcomplex type. 
 ###################################################################################################
+@assertion_registry.register('7.4.18', resources=['*'])
 def Assertion_7_5_18(self, log):
     log.AssertionID = '7.4.18'
     assertion_status =  log.PASS
@@ -1184,6 +1205,7 @@ def Assertion_7_5_18(self, log):
 # OEM-specified objects... The name of the object (property) shall uniquely identify 
 # the OEM or organization that manages the top of the namespace under which the property is defined.
 ###################################################################################################
+@assertion_registry.register('7.5.18.1', resources=['*'])
 def Assertion_7_5_18_1(self, log):
     log.AssertionID = '7.5.18.1'
     assertion_status =  log.PASS
@@ -1236,6 +1258,7 @@ def Assertion_7_5_18_1(self, log):
 # The OEM-specified property shall also include a type property that provides
 # the location of the schema and the type definition for the property within that schema. 
 ###################################################################################################
+@assertion_registry.register('7.5.18.2', resources=['*'])
 def Assertion_7_5_18_2(self, log):
     log.AssertionID = '7.5.18.2'
     assertion_status =  log.PASS
@@ -1382,6 +1405,7 @@ def check_description_instance(xtype, schema, namespace, log):
 # The Description property is used to convey a human readable description of the resource. The type
 # of the Description property shall be string. checking EntityTypes under Schema
 ###################################################################################################
+@assertion_registry.register('7.5.1.3')
 def Assertion_7_5_1_3(self, log):
     log.AssertionID = '7.5.1.3'
     assertion_status =  log.PASS
@@ -1453,6 +1477,7 @@ def Assertion_7_5_1_3(self, log):
 # The Id property of a resource uniquely identifies the resource within the Resource Collection that contains
 # it. The value of Id shall be unique across a Resource Collection.
 ###################################################################################################
+@assertion_registry.register('7.6.1')
 def Assertion_7_6_1(self, log):
     log.AssertionID = '7.6.1'
     assertion_status =  log.PASS
@@ -1492,6 +1517,7 @@ def Assertion_7_6_1(self, log):
 # The type of the Name property shall be string.  The value of Name is NOT required to be unique across resource instances
 # within a collection.
 ###################################################################################################
+@assertion_registry.register('7.6.2')
 def Assertion_7_6_2(self, log):
     log.AssertionID = '7.6.2'
     assertion_status =  log.PASS
@@ -1532,6 +1558,7 @@ def Assertion_7_6_2(self, log):
 # The Description property is used to convey a human readable description of the resource.  
 # The type of the Description property shall be string.
 ###################################################################################################
+@assertion_registry.register('7.6.3')
 def Assertion_7_6_3(self, log):
     log.AssertionID = '7.6.3'
     assertion_status =  log.PASS
@@ -1570,6 +1597,7 @@ def Assertion_7_6_3(self, log):
 # Assertion text: 
 #  All associated reference properties defined for a resource shall be nested under the links property.  
 ###################################################################################################
+@assertion_registry.register('7.6.5.1')
 def Assertion_7_6_5_1(self, log):
     log.AssertionID = '7.6.5.1'
     assertion_status =  log.PASS
@@ -1607,43 +1635,48 @@ def Assertion_7_6_5_1(self, log):
 
 ###################################################################################################
 # run(self, log):
-# Takes sut obj and logger obj 
+# Takes sut obj and logger obj. The assertions are listed in the order they are logged; they are
+# run thru assertion_executor, concurrently where possible if the SUT has "AssertionWorkers" set
 ###################################################################################################
 def run(self, log):
-    #Section 7
-    assertion_status = Assertion_7_6_1(self, log)
-    assertion_status = Assertion_7_0_1(self, log)
-    assertion_status = Assertion_7_2_1(self, log)
-    assertion_status = Assertion_7_3_0(self, log)
-    assertion_status = Assertion_7_5_2(self, log)
-    assertion_status = Assertion_7_5_3(self, log)
-    # Needs a fix: rf_utility.get_resource_xml_metadata() missing
-    # assertion_status = Assertion_7_5_4(self, log)
-    assertion_status = Assertion_7_5_5(self, log)
-    assertion_status = Assertion_7_5_6(self, log)
-    assertion_status = Assertion_7_5_7(self, log)
-    assertion_status = Assertion_7_5_8(self, log)
-    assertion_status = Assertion_7_5_9(self, log)
-    assertion_status = Assertion_7_5_10(self, log)      
-    assertion_status = Assertion_7_5_11(self, log)          
-    # Missing
-    # assertion_status = Assertion_7_5_13(self, log)
-    assertion_status = Assertion_7_5_13_xml(self, log)
-    assertion_status = Assertion_7_5_14(self, log) 
-    assertion_status = Assertion_7_5_14_1(self, log)
-    assertion_status = Assertion_7_5_15(self, log)
-    assertion_status = Assertion_7_5_16(self, log)
-    #WIP
-    #assertion_status = Assertion_7_5_18(self, log)
-    #WIP
-    #assertion_status = Assertion_7_5_18_1(self, log)
-    #WIP
-    #assertion_status = Assertion_7_5_18_2(self, log)
-    # Missing
-    # assertion_status = Assertion_7_5_1_2(self, log)
-    assertion_status = Assertion_7_5_1_3(self, log)  
-    assertion_status = Assertion_7_6_1(self, log) 
-    assertion_status = Assertion_7_6_2(self, log)
-    assertion_status = Assertion_7_6_3(self, log)
-    assertion_status = Assertion_7_6_5_1(self, log)
-    #assertion_status = Assertion_7_8_1(self, log)
+    assertions = [
+        #Section 7
+        Assertion_7_6_1,
+        Assertion_7_0_1,
+        Assertion_7_2_1,
+        Assertion_7_3_0,
+        Assertion_7_5_2,
+        Assertion_7_5_3,
+        # Needs a fix: rf_utility.get_resource_xml_metadata() missing
+        #Assertion_7_5_4,
+        Assertion_7_5_5,
+        Assertion_7_5_6,
+        Assertion_7_5_7,
+        Assertion_7_5_8,
+        Assertion_7_5_9,
+        Assertion_7_5_10,
+        Assertion_7_5_11,
+        # Missing
+        #Assertion_7_5_13,
+        Assertion_7_5_13_xml,
+        Assertion_7_5_14,
+        Assertion_7_5_14_1,
+        Assertion_7_5_15,
+        Assertion_7_5_16,
+        #WIP
+        #Assertion_7_5_18,
+        #WIP
+        #Assertion_7_5_18_1,
+        #WIP
+        #Assertion_7_5_18_2,
+        # Missing
+        #Assertion_7_5_1_2,
+        Assertion_7_5_1_3,
+        Assertion_7_6_1,
+        Assertion_7_6_2,
+        Assertion_7_6_3,
+        Assertion_7_6_5_1,
+        #Assertion_7_8_1,
+    ]
+
+    assertion_executor.run_assertions(self, log, assertions)
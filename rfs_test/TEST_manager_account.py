@@ -15,6 +15,8 @@ from collections import OrderedDict
 from xml.dom import minidom
 import re
 import rf_utility
+from rfs_test import assertion_executor
+from rfs_test import assertion_registry
 import datetime
 import xml.etree.ElementTree as ET
 import urllib
@@ -57,6 +59,7 @@ import time
 # The value shall be null for GET requests.
 # Name: Assertion_MANA101(self, log)
 ##################################################################################################
+@assertion_registry.register('MANA101', section='ManagerAccount', resources=['AccountService'])
 def Assertion_MANA101(self, log):
 
     log.AssertionID = 'MANA101'
@@ -108,6 +111,7 @@ def Assertion_MANA101(self, log):
 # does not exist by returning HTTP 400 (Bad Request).
 # Name: Assertion_MANA103(self, log)
 ##################################################################################################
+@assertion_registry.register('MANA103', section='ManagerAccount', mutates=True, resources=['AccountService'])
 def Assertion_MANA103(self, log):
     log.AssertionID = 'MANA103'
     assertion_status =  log.PASS
@@ -175,5 +179,7 @@ def Assertion_MANA103(self, log):
 # Takes sut obj and logger obj
 ###################################################################################################
 def run(self, log):
-    assertion_status = Assertion_MANA101(self,log)
-    assertion_status = Assertion_MANA103(self,log)
+    assertion_executor.run_assertions(self, log, [
+        Assertion_MANA101,
+        Assertion_MANA103,
+    ])
@@ -25,6 +25,8 @@ from collections import OrderedDict
 from xml.dom import minidom
 import re
 import rf_utility
+from rfs_test import assertion_executor
+from rfs_test import assertion_registry
 import datetime
 import xml.etree.ElementTree as ET
 import urllib
@@ -82,6 +84,7 @@ def cacheURI(self):
 # Name: Assertion_1_2_3(self, log)
 # Description:  This is General Assertion Template for writing assertion code
 #####################################################################################################
+@assertion_registry.register('1.2.3', resources=['Version'])
 def Assertion_1_2_3(self, log) : # self here is service's instance..
     #set id in log object, this should be same as the excel
     log.AssertionID = '1.2.3'
@@ -117,6 +120,7 @@ def Assertion_1_2_3(self, log) : # self here is service's instance..
 # Description:
 #   GET:  Object or Collection retrieval
 #####################################################################################################
+@assertion_registry.register('6.1.8.2', resources=['*'])
 def Assertion_6_1_8_2(self, log) :
 
     log.AssertionID = '6.1.8.2'
@@ -160,6 +164,7 @@ def Assertion_6_1_8_2(self, log) :
 # For POST request body see requiredOnCreate annotation in schemas
 # TODO try a sample post, patch and delete for every resource that allows the methods, run it in series
 #####################################################################################################
+@assertion_registry.register('6.1.8.1', mutates=True, resources=['SessionService'])
 def Assertion_6_1_8_1(self, log) :
 
     log.AssertionID = '6.1.8.1'
@@ -339,6 +344,7 @@ def verifyCreatedObject(object_payload, check_payload, log):
 # Description:
 # PATCH Object update
 #####################################################################################################
+@assertion_registry.register('6.1.8.3', mutates=True, resources=['SessionService', 'AccountService'])
 def Assertion_6_1_8_3(self, log) :
     log.AssertionID = '6.1.8.3'
     assertion_status =  log.PASS
@@ -424,6 +430,7 @@ def Assertion_6_1_8_3(self, log) :
 # Description: Test DELETE method by creating a Session and then deleting it
 # Method: DELETE Object delete
 #####################################################################################################
+@assertion_registry.register('6.1.8.4', mutates=True, resources=['SessionService'])
 def Assertion_6_1_8_4(self, log):
     log.AssertionID = '6.1.8.4'
     assertion_status = log.PASS
@@ -524,6 +531,7 @@ def Assertion_6_1_8_4(self, log):
 # Method: TRACE ~ should not be supported, expected status 405
 #         OPTIONS ~ is not a Required one but it can be supported. Depends on server.
 ###################################################################################################
+@assertion_registry.register('6.1.9', resources=['*'])
 def Assertion_6_1_9(self, log) :
 
     log.AssertionID = '6.1.9'
@@ -557,6 +565,7 @@ def Assertion_6_1_9(self, log) :
 # Description:
 #	All resources shall be made available using the JSON media type "application/json".
 ###################################################################################################
+@assertion_registry.register('6.1.11', resources=['*'])
 def Assertion_6_1_11(self, log) :
 
     log.AssertionID = '6.1.11'
@@ -587,6 +596,7 @@ def Assertion_6_1_11(self, log) :
 # Redfish services shall make every resource available in a representation based on JSON, as specified in RFC4627.
 # Receivers shall not reject a message because it is encoded in JSON, and shall offer at least one response representation based on JSON.
 ###################################################################################################
+@assertion_registry.register('6.1.12', resources=['*'])
 def Assertion_6_1_12(self,log) :
     log.AssertionID = '6.1.12'
     assertion_status = log.PASS
@@ -616,6 +626,7 @@ def Assertion_6_1_12(self,log) :
 # Description:
 #  ETag headers:  For certain requests and responses implementation shall support returning ETag headers
 #####################################################################################################
+@assertion_registry.register('6.1.14', resources=['*'])
 def Assertion_6_1_14(self, log) :
 
     log.AssertionID = '6.1.14'
@@ -660,6 +671,7 @@ def Assertion_6_1_14(self, log) :
 # Services should support gzip compression when requested by the client. if service cannot respond
 # with gzip, 406 should be returned
 ###################################################################################################
+@assertion_registry.register('6.1.13', resources=['*'])
 def Assertion_6_1_13(self, log) :
 
     log.AssertionID = '6.1.13'
@@ -692,6 +704,7 @@ def Assertion_6_1_13(self, log) :
 # Description:
 #	A GET on the resource "/redfish" shall return the following body: json { "v1": "/redfish/v1/" }
 ###################################################################################################
+@assertion_registry.register('6.2.3', resources=['ServiceRoot', 'Version'])
 def Assertion_6_2_3(self, log) :
 
     log.AssertionID = '6.2.3'
@@ -733,6 +746,7 @@ def Assertion_6_2_3(self, log) :
 # Description:
 # The following method check the URI status of 404 and is reported if found.
 ###################################################################################################
+@assertion_registry.register('6.1.0', resources=['*'])
 def Assertion_6_1_0(self,log) :
     log.AssertionID = '6.1.0'
     assertion_status = log.PASS
@@ -762,6 +776,7 @@ def Assertion_6_1_0(self,log) :
 # Description:
 # A Redfish interface shall be exposed through a web service endpoint implemented using Hypertext Transfer Protocols, version 1.1 (RFCL616).
 ######################################################################################################################################################
+@assertion_registry.register('6.1.1', resources=['ServiceRoot', '$metadata', 'OData', 'Version'])
 def Assertion_6_1_1(self,log) :
     log.AssertionID = '6.1.1'
     assertion_status = log.WARN
@@ -802,6 +817,7 @@ def Assertion_6_1_1(self,log) :
 # Description:
 # Each unique instance of a resource shall be identified by a URI; thus a URI cannot reference multiple resources though it may reference a single collection resource.
 #########################################################################################################################################################################
+@assertion_registry.register('6.1.2', resources=['*'])
 def Assertion_6_1_2(self,log) :
 
     log.AssertionID = '6.1.2'
@@ -847,6 +863,7 @@ def Assertion_6_1_2(self,log) :
 #	/redfish/v1/odata The URI for the Redfish OData Service Document
 #	/redfish/v1/metadata The URI for the Redfish schema Document
 ###################################################################################################
+@assertion_registry.register('6.3.1', mutates=True, resources=['ServiceRoot', '$metadata', 'OData', 'Version'])
 def Assertion_6_3_1(self, log) :
 
     log.AssertionID = '6.3.1'
@@ -912,6 +929,7 @@ def Assertion_6_3_1(self, log) :
 #   to the associated Redfish-defined URI:
 #		/redfish/v1     /redfish/v1/
 ###################################################################################################
+@assertion_registry.register('6.3.2', resources=['ServiceRoot', 'ComputerSystem'])
 def Assertion_6_3_2(self, log) :
 
     log.AssertionID = '6.3.2'
@@ -947,6 +965,7 @@ def Assertion_6_3_2(self, log) :
 # antoher form is :     GET /pub/WWW/TheProject.html HTTP/1.1
 ###################################################################################################
 
+@assertion_registry.register('6.3.3', resources=['*', 'ServiceRoot', 'ComputerSystem'])
 def Assertion_6_3_3(self, log) :
 
     log.AssertionID = '6.3.3'
@@ -998,6 +1017,7 @@ def Assertion_6_3_3(self, log) :
 # value in the Required Column is set to "Yes" or "Conditional". It covers 6.4.2 as well- WIP	Priyanka
 ###################################################################################################
 
+@assertion_registry.register('6.4.1', resources=['*', 'Manager'])
 def Assertion_6_4_1(self, log) :
 
     log.AssertionID = '6.4.1'
@@ -1060,6 +1080,7 @@ def verify_retrieve_resource(json_payload, assertion_status, self, log):
 # The HTTP Get method shall be able to retrieve a resource without causing any side effects.-Priyanka
 ###################################################################################################
 
+@assertion_registry.register('6.4.4', resources=['*'])
 def Assertion_6_4_4(self, log):
     log.AssertionID = '6.4.4'
     assertion_status =  log.PASS
@@ -1089,6 +1110,7 @@ def Assertion_6_4_4(self, log):
 # The service shall ignore the content of the body on a GET.-Priyanka
 ###################################################################################################
 
+@assertion_registry.register('6.4.5', resources=['*'])
 def Assertion_6_4_5(self, log):
 
     log.AssertionID = '6.4.5'
@@ -1130,6 +1152,7 @@ def Assertion_6_4_5(self, log):
 # Description:
 #	Services shall not require authentication in order to retrieve the service document.
 ###################################################################################################
+@assertion_registry.register('6.4.11', resources=['$metadata'])
 def Assertion_6_4_11(self, log) :
 
     log.AssertionID = '6.4.11'
@@ -1159,6 +1182,7 @@ def Assertion_6_4_11(self, log) :
 #   Note: find resource to try a correct query
 #   params: section 5.1.x http://docs.oasis-open.org/odata/odata/v4.0/errata02/os/complete/part2-url-conventions/odata-v4.0-errata02-os-part2-url-conventions-complete.html#_Toc406398092
 ###################################################################################################
+@assertion_registry.register('6.4.13', resources=['*'])
 def Assertion_6_4_13(self, log) :
 
     log.AssertionID = '6.4.13'
@@ -1214,6 +1238,7 @@ def Assertion_6_4_13(self, log) :
 #		Implementations shall ignore unknown or unsupported query parameters that do not begin with
 #       "$" param example: http://collection?$skip=5 in spec
 ###################################################################################################
+@assertion_registry.register('6.4.14', resources=['*'])
 def Assertion_6_4_14(self, log) :
 
     log.AssertionID = '6.4.14'
@@ -1266,6 +1291,7 @@ def Assertion_6_4_14(self, log) :
 #   members in the collection.
 # Resource count property = Members@odata.count
 ###################################################################################################
+@assertion_registry.register('6.4.16', resources=['*'])
 def Assertion_6_4_16(self, log) :
 
     log.AssertionID = '6.4.16'
@@ -1316,6 +1342,7 @@ def Assertion_6_4_16(self, log) :
 #   However, all of the same meta information and status codes in the HTTP headers
 #   will be returned as though a GET method were processed, including authorization checks.
 ###################################################################################################
+@assertion_registry.register('6.4.18', resources=['*'])
 def Assertion_6_4_18(self, log) :
 
     log.AssertionID = '6.4.18'
@@ -1390,6 +1417,7 @@ def Assertion_6_4_18(self, log) :
 # Method: POST ~ try to modify a resource that does not support POST, expected result
 # HTTP_METHODNOTALLOWED (405)
 ###################################################################################################
+@assertion_registry.register('6.4.21', mutates=True, resources=['*'])
 def Assertion_6_4_21(self, log) : #POST
 
     log.AssertionID = '6.4.21'
@@ -1442,6 +1470,7 @@ def Assertion_6_4_21(self, log) : #POST
 # Method: PATCH ~ try to modify a resource that does not support PATCH,
 #               expected result HTTP_METHODNOTALLOWED (405)
 ###################################################################################################
+@assertion_registry.register('6.4.23', mutates=True, resources=['*'])
 def Assertion_6_4_23(self, log) :
 
     log.AssertionID = '6.4.23'
@@ -1580,6 +1609,7 @@ def verify_typename_in_json_metadata(typename, json_metadata):
 # containing an annotation specifying the non-updatable property. In this success case, other
 # properties may be updated in the resource.
 ###################################################################################################
+@assertion_registry.register('6.4.24', mutates=True, resources=['*'])
 def Assertion_6_4_24(self, log) :
     log.AssertionID = '6.4.24'
     assertion_status =  log.PASS
@@ -1611,7 +1641,7 @@ def Assertion_6_4_24(self, log) :
             if '@odata.type' in json_payload:
                 namespace, typename = rf_utility.parse_odata_type(json_payload['@odata.type'])
                 if namespace and typename:
-                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.json_directory)
+                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.schema_source)
                     if json_metadata and schema_file:
                         if verify_typename_in_json_metadata(typename, json_metadata):
                             if 'properties' in json_metadata['definitions'][typename]:
@@ -1672,6 +1702,7 @@ def Assertion_6_4_24(self, log) :
 # Method: PUT ~ modify a resource that does not support modification (PUT), expected result
 # HTTP_METHODNOTALLOWED
 ###################################################################################################
+@assertion_registry.register('6.4.25', mutates=True, resources=['*'])
 def Assertion_6_4_25(self, log) :
 
     log.AssertionID = '6.4.25'
@@ -1730,6 +1761,7 @@ def Assertion_6_4_25(self, log) :
 # 	Submitting a POST request to a resource representing a collection is equivalent to submitting the same request to
 #   the Members property of that resource. Services that support adding members to a collection shall support both forms.
 ###################################################################################################
+@assertion_registry.register('6.4.26', mutates=True, resources=['SessionService'])
 def Assertion_6_4_26(self, log) :
 
     log.AssertionID = '6.4.26'
@@ -1792,6 +1824,7 @@ def Assertion_6_4_26(self, log) :
 # 	Services shall support the POST method for creating resources. If the resource does not offer anything to be created,
 #   a status code 405 shall be returned.
 ###################################################################################################
+@assertion_registry.register('6.4.27', mutates=True, resources=['*'])
 def Assertion_6_4_27(self, log) :
 
     log.AssertionID = '6.4.27'
@@ -1835,6 +1868,7 @@ def Assertion_6_4_27(self, log) :
 # Method: DELETE ~ try to modify a service that does not support DELETE,
 #               expected result 405 METHOD NOT ALLOWED
 ###################################################################################################
+@assertion_registry.register('6.4.30', mutates=True, resources=['*'])
 def Assertion_6_4_30(self, log) :
 
     log.AssertionID = '6.4.30'
@@ -1890,6 +1924,7 @@ def Assertion_6_4_30(self, log) :
 # action shall be of the form: ResourceUri/Actions/QualifiedActionName
 ###################################################################################################
 
+@assertion_registry.register('6.4.31', mutates=True, resources=['LogService', 'Manager'])
 def Assertion_6_4_31(self, log) :
 
     log.AssertionID = '6.4.31'
@@ -1958,6 +1993,7 @@ def Assertion_6_4_31(self, log) :
 #   URI of an action shall be of the form: ResourceUri/Actions/QualifiedActionName- Tried checking with Dell Server
 ###################################################################################################
 
+@assertion_registry.register('6.4.32', mutates=True, resources=['ComputerSystem'])
 def Assertion_6_4_32(self, log) :
 
     log.AssertionID = '6.4.32'
@@ -2015,6 +2051,7 @@ def Assertion_6_4_32(self, log) :
 #   action. If the actions property within a resource does not specify a target property, then the
 #   URI of an action shall be of the form: ResourceUri/Actions/QualifiedActionName
 ###################################################################################################
+@assertion_registry.register('6.4.32.old', mutates=True, resources=['LogService', 'Manager'])
 def Assertion_6_4_32_old(self, log) :
 
     log.AssertionID = '6.4.32.old'
@@ -2069,6 +2106,7 @@ def Assertion_6_4_32_old(self, log) :
 # 	application/json shall be supported for requesting resources and application/xml shall be
 #   supported for requesting metadata. This assertion checks only the xml case for $metadata...
 ###################################################################################################
+@assertion_registry.register('6.4.2.1', resources=['$metadata'])
 def Assertion_6_4_2_1(self, log) :
 
     from xml.etree import ElementTree as ET
@@ -2126,6 +2164,7 @@ def Assertion_6_4_2_1(self, log) :
 #   try POST then PATCH as they both have request body should just be check against status
 #   HTTP_MEDIATYPENOTSUPPORTED to avoid checking bad request due to request body
 ###################################################################################################
+@assertion_registry.register('6.4.2.2', mutates=True, resources=['SessionService'])
 def Assertion_6_4_2_2(self, log) :
 
     log.AssertionID = '6.4.2.2'
@@ -2206,6 +2245,7 @@ def Assertion_6_4_2_2(self, log) :
 # Description:
 # 	Services shall reject requests which specify an unsupported OData version.
 ###################################################################################################
+@assertion_registry.register('6.4.2.3', resources=['*'])
 def Assertion_6_4_2_3(self, log) :
 
     log.AssertionID = '6.4.2.3'
@@ -2259,6 +2299,7 @@ def Assertion_6_4_2_3(self, log) :
 # Description:
 # 	Services shall reject requests whithout BASIC authorization header
 ###################################################################################################
+@assertion_registry.register('6.4.2.4', mutates=True, resources=['*', 'ServiceRoot'])
 def Assertion_6_4_2_4(self, log) :
 
     log.AssertionID = '6.4.2.4'
@@ -2274,8 +2315,13 @@ def Assertion_6_4_2_4(self, log) :
         if relative_uris[relative_uri] == '/redfish/v1/':
             continue
         rq_headers = self.request_headers()
-        authorization = 'on'
-        json_payload, headers, status = self.http_cached_GET(relative_uris[relative_uri], rq_headers, authorization)
+        # Basic authorization even in the "Session" auth mode, where the cached responses were
+        # read with the session token
+        authorization = 'basic'
+        if rf_utility.auth_mode(self.SUT_prop) == 'session':
+            json_payload, headers, status = self.http_GET(relative_uris[relative_uri], rq_headers, authorization)
+        else:
+            json_payload, headers, status = self.http_cached_GET(relative_uris[relative_uri], rq_headers, authorization)
         if not status:
             assertion_status_ = log.WARN
             continue
@@ -2318,6 +2364,7 @@ def Assertion_6_4_2_4(self, log) :
 # Description:
 # 	Services shall be able to understand and process User-Agent Request Header.
 ###################################################################################################
+@assertion_registry.register('6.4.2.5', resources=['*'])
 def Assertion_6_4_2_5(self, log) :
 
     log.AssertionID = '6.4.2.5'
@@ -2348,6 +2395,7 @@ def Assertion_6_4_2_5(self, log) :
 # Description:
 # 	Services shall be able to understand and process 'Host' in the request header.
 ###################################################################################################
+@assertion_registry.register('6.4.2.6', resources=['*'])
 def Assertion_6_4_2_6(self, log) :
 
     log.AssertionID = '6.4.2.6'
@@ -2389,6 +2437,7 @@ def Assertion_6_4_2_6(self, log) :
 # -Allow : returned on GET or HEAD
 # -www-authenticate
 ###################################################################################################
+@assertion_registry.register('6.5.1', resources=['*'])
 def Assertion_6_5_1(self, log) :
 
     log.AssertionID = '6.5.1'
@@ -2477,6 +2526,7 @@ def response_header_check(headers, url, log):
 #   Indicates a URI that can be used to request a representation of the resource.
 #   Shall be returned if a new resource was created.
 ###################################################################################################
+@assertion_registry.register('6.5.2.6', mutates=True, resources=['SessionService'])
 def Assertion_6_5_2_6(self, log):
 
     log.AssertionID = '6.5.2.6'
@@ -2551,6 +2601,7 @@ def Assertion_6_5_2_6(self, log):
 #   Indicates a URI that can be used to request a representation of the resource.
 #   Location and X-Auth-Token shall be included on responses which create user sessions.
 ###################################################################################################
+@assertion_registry.register('6.5.2.6.1', mutates=True, resources=['SessionService'])
 def Assertion_6_5_2_6_1(self, log):
 
     log.AssertionID = '6.5.2.6.1'
@@ -2630,6 +2681,7 @@ def Assertion_6_5_2_6_1(self, log):
 #   In addition to links from the resource, the URL of the JSON schema for the resource shall be
 #   returned with a `rel=describedby`
 ###################################################################################################
+@assertion_registry.register('6.5.3', resources=['*'])
 def Assertion_6_5_3(self, log) :
 
     log.AssertionID = '6.5.3'
@@ -2686,6 +2738,7 @@ def Assertion_6_5_3(self, log) :
 # Description:
 # Status Code: 200 OK The request was successfully completed and includes a representation in its body.
 ###################################################################################################
+@assertion_registry.register('6.5.6.2', resources=['*', 'SessionService', 'AccountService'])
 def Assertion_6_5_6_2(self, log) :
 
     log.AssertionID = '6.5.6.2'
@@ -2722,6 +2775,7 @@ def Assertion_6_5_6_2(self, log) :
 # may be included in the response body. Accounts POST and sessions POST covered in 6.1.8.1
 ###################################################################################################
 
+@assertion_registry.register('6.5.6.3')
 def Assertion_6_5_6_3(self, log) :
 
     log.AssertionID = '6.5.6.3'
@@ -2742,6 +2796,7 @@ def Assertion_6_5_6_3(self, log) :
 # The request succeeded, but no content is being returned in the body of the response.
 ###################################################################################################
 
+@assertion_registry.register('6.5.6.5', resources=['*'])
 def Assertion_6_5_6_5(self, log) :
 
     log.AssertionID = '6.5.6.5'
@@ -2770,6 +2825,7 @@ def Assertion_6_5_6_5(self, log) :
 # Description:
 # Status Code:  301 Moved Permanently The requested resource resides under a different URI
 ###################################################################################################
+@assertion_registry.register('6.5.6.6', resources=['*'])
 def Assertion_6_5_6_6(self, log):
 
     log.AssertionID = '6.5.6.6'
@@ -2819,6 +2875,7 @@ def Assertion_6_5_6_6(self, log):
 # Method: conditional GET ~ 304 Not Modified
 ###################################################################################################
 
+@assertion_registry.register('6.5.6.8', resources=['AccountService'])
 def Assertion_6_5_6_8(self, log) :
 
     log.AssertionID = '6.5.6.8'
@@ -2897,6 +2954,7 @@ def Assertion_6_5_6_8(self, log) :
 # (such as validation error on a field, a missing required value, and so on).
 # An extended error shall be returned in the response body, as defined in section Extended Error Handling.
 ###################################################################################################
+@assertion_registry.register('6.5.6.9', mutates=True, resources=['SessionService'])
 def Assertion_6_5_6_9(self, log):
 
     log.AssertionID = '6.5.6.9'
@@ -3013,6 +3071,7 @@ def Assertion_6_5_6_9(self, log):
 # 	401 Unauthorized
 #   The authentication credentials included with this request are missing or invalid
 ###################################################################################################
+@assertion_registry.register('6.5.6.10', mutates=True, resources=['*', 'ServiceRoot'])
 def Assertion_6_5_6_10(self, log) :
 
     log.AssertionID = '6.5.6.10'
@@ -3055,6 +3114,7 @@ def Assertion_6_5_6_10(self, log) :
 # for this request URI. The response shall include an Allow header which provides a list of methods
 # that are supported by the resource identified by the Request-URI.
 ###################################################################################################
+@assertion_registry.register('6.5.6.13', mutates=True, resources=['*'])
 def Assertion_6_5_6_13(self, log) :
 
     log.AssertionID = '6.5.6.13'
@@ -3143,6 +3203,7 @@ def Assertion_6_5_6_13(self, log) :
 # The OData Service Document shall be returned as a JSON object, using the MIME type application/json.
 # i.e the content type should be json..
 ###################################################################################################
+@assertion_registry.register('6.5.10', resources=['OData'])
 def Assertion_6_5_10(self, log) :
 
     log.AssertionID = '6.5.10'
@@ -3178,6 +3239,7 @@ def Assertion_6_5_10(self, log) :
 # "/redfish/v1/$metadata". This context tells a generic OData client how to find the service metadata
 # describing the types exposed by the service.
 ###################################################################################################
+@assertion_registry.register('6.5.11', resources=['OData'])
 def Assertion_6_5_11(self, log) :
 
     log.AssertionID = '6.5.11'
@@ -3219,6 +3281,7 @@ def Assertion_6_5_11(self, log) :
 # The JSON object shall include a property named "value" whose value is a JSON array containing an
 # entry for the service root and each resource that is a direct child of the service root.
 ###################################################################################################
+@assertion_registry.register('6.5.12', resources=['ServiceRoot', 'OData'])
 def Assertion_6_5_12(self, log) :
 
     log.AssertionID = '6.5.12'
@@ -3276,6 +3339,7 @@ def Assertion_6_5_12(self, log) :
 # (including collection resources) or "EntitySet" for top-level resource collections,
 # TODO and a "url" property whose value is the relative URL for the top-level resource.- Did testing whether url contains the top-level resource which is -/redfish/v1/
 ###################################################################################################
+@assertion_registry.register('6.5.13', resources=['ServiceRoot', 'OData'])
 def Assertion_6_5_13(self, log) :
 
     log.AssertionID = '6.5.13'
@@ -3420,6 +3484,7 @@ def verify_singleton_urlcxt_new(json_payload, assertion_status, self, log):
 #     Form1: MetadataUrl#ResourceType[(Selectlist)] / MetadataUrl#CollectionResourceType
 #     Form2: MetadataUrl#ResourcePath[(Selectlist)]/$entity / MetadataUrl#CollectionResourcePath
 ###################################################################################################
+@assertion_registry.register('6.5.14', resources=['*'])
 def Assertion_6_5_14(self, log):
 
     log.AssertionID = '6.5.14'
@@ -3468,6 +3533,7 @@ def Assertion_6_5_14(self, log):
 # shall specify the subset of properties included. An asterix (*) can be used to specify "all structural properties" for a
 # given resource.
 ###################################################################################################
+@assertion_registry.register('6.5.15', resources=['*'])
 def Assertion_6_5_15(self, log):
 
     log.AssertionID = '6.5.15'
@@ -3518,6 +3584,7 @@ def Assertion_6_5_15(self, log):
 #     Form1: MetadataUrl#ResourceType[(Selectlist)] / MetadataUrl#CollectionResourceType
 #     Form2: MetadataUrl#ResourcePath[(Selectlist)]/$entity / MetadataUrl#CollectionResourcePath
 ###################################################################################################
+@assertion_registry.register('6.5.14.old', resources=['*'])
 def Assertion_6_5_14_old(self, log):
 
     log.AssertionID = '6.5.14.old'
@@ -3561,6 +3628,7 @@ def Assertion_6_5_14_old(self, log):
 # Description:           Resource Identifier Property
 # Resources in a response shall include a unique identifier property named "@odata.id".
 ###################################################################################################
+@assertion_registry.register('6.5.17', resources=['*'])
 def Assertion_6_5_17(self, log) :
 
     log.AssertionID = '6.5.17'
@@ -3608,6 +3676,7 @@ def Assertion_6_5_17(self, log) :
 # within a different authority as the request URI shall start with a double-slash ("//") followed
 # by the authority and path to the resource
 ###################################################################################################
+@assertion_registry.register('6.5.18', resources=['*', 'ServiceRoot'])
 def Assertion_6_5_18(self, log) :
 
     log.AssertionID = '6.5.18'
@@ -3681,6 +3750,7 @@ def Assertion_6_5_18(self, log) :
 # The value of the type property shall be an absolute URL that specifies the type of the resource
 # and shall be of the form: #*Namespace*.*TypeName*
 ###################################################################################################
+@assertion_registry.register('6.5.19', resources=['*', 'ServiceRoot'])
 def Assertion_6_5_19(self, log) :
     log.AssertionID = '6.5.19'
     assertion_status =  log.PASS
@@ -3793,6 +3863,7 @@ def validate(date_text):
 # Name: Assertion_6_5_20(self, log)
 # Description:   Primitive properties shall be returned as JSON values according to the following table
 ###################################################################################################
+@assertion_registry.register('6.5.20', resources=['*'])
 def Assertion_6_5_20(self, log):
     log.AssertionID = '6.5.20'
     assertion_status =  log.PASS
@@ -3905,6 +3976,7 @@ def Assertion_6_5_20(self, log):
 #  `*YYYY*-*MM*-*DD* T *hh*:*mm*:*ss*[.*SSS*] (Z | (+ | ~ ) *hh*:*mm*)`
 # validation pattern '([-+][0-1][0-9]:[0-5][0-9])'
 ###################################################################################################
+@assertion_registry.register('6.5.21', resources=['*'])
 def Assertion_6_5_21(self, log):
     log.AssertionID = '6.5.21'
     assertion_status =  log.PASS
@@ -3968,6 +4040,7 @@ def Assertion_6_5_21(self, log):
 # Description:   DateTime Values
 # The 'T' separator and 'Z' suffix shall be capitals.
 ###################################################################################################
+@assertion_registry.register('6.5.22', resources=['*'])
 def Assertion_6_5_22(self, log) :
 
     log.AssertionID = '6.5.22'
@@ -4020,6 +4093,7 @@ def Assertion_6_5_22(self, log) :
 # of collection members. The next link property shall only be present if the number of resources
 # requested is greater than the number of resources returned.
 ###################################################################################################
+@assertion_registry.register('6.5.23', resources=['*'])
 def Assertion_6_5_23(self, log) :
 
     log.AssertionID = '6.5.23'
@@ -4074,6 +4148,7 @@ def Assertion_6_5_23(self, log) :
 # The next link property shall only be present if the number of resources requested is greater than
 # the number of resources returned.
 ###################################################################################################
+@assertion_registry.register('6.5.23.1', resources=['*'])
 def Assertion_6_5_23_1(self, log) :
 
     log.AssertionID = '6.5.23.1'
@@ -4143,6 +4218,7 @@ def Assertion_6_5_23_1(self, log) :
 # count property. The count property shall be named "Members@odata.count" and its value shall be the
 # total number of members available in the Resource Collection.
 ###################################################################################################
+@assertion_registry.register('6.5.24', resources=['*'])
 def Assertion_6_5_24(self, log) :
 
     log.AssertionID = '6.5.24'
@@ -4200,6 +4276,7 @@ def Assertion_6_5_24(self, log) :
 # where each element of the array is a JSON object whose type is specified in the Redfish Schema document describing the containing type.
 # The name of the property representing the members of the collection shall be "Members". The Members property shall not be null. Empty collections shall be returned in JSON as an empty array.
 ###################################################################################################
+@assertion_registry.register('6.5.25', resources=['*'])
 def Assertion_6_5_25(self, log) :
 
     log.AssertionID = '6.5.25'
@@ -4256,6 +4333,7 @@ def Assertion_6_5_25(self, log) :
 # Actions are represented by a property nested under "Actions"  whose name is the unique URI that
 # identifies the action. This URI shall be of the form: #Namespace.ActionName
 ###################################################################################################
+@assertion_registry.register('6.5.26', resources=['*'])
 def Assertion_6_5_26(self, log) :
 
     log.AssertionID = '6.5.26'
@@ -4362,6 +4440,7 @@ def check_reference_type(links):
 # properties, the value of the property shall be the single related resource id. For collection-
 # valued reference properties, the value of the property shall be the array of related resource ids.
 ###################################################################################################
+@assertion_registry.register('6.5.28', resources=['*'])
 def Assertion_6_5_28(self, log) :
 
     log.AssertionID = '6.5.28'
@@ -4405,6 +4484,7 @@ def Assertion_6_5_28(self, log) :
 # whose name is of the form: [PropertyName]@Namespace.TermName
 # collection = re.match(r"(\w+)(@)(\w+)(\.)(\w+)", json_payload[additional_property.Name] , re.I)
 ###################################################################################################
+@assertion_registry.register('6.5.30', resources=['*'])
 def Assertion_6_5_30(self, log) :
 
     log.AssertionID = '6.5.30'
@@ -4447,6 +4527,7 @@ def Assertion_6_5_30(self, log) :
 # Resource collections are returned as a JSON object. The JSON object shall include a Name property,
 # Resource Identifier property, Type property, array of Members, and resource count.
 ###################################################################################################
+@assertion_registry.register('6.5.31', resources=['*'])
 def Assertion_6_5_31(self, log) :
 
     log.AssertionID = '6.5.31'
@@ -4578,6 +4659,7 @@ def get_keys_substring(substring, val):
 # The service metadata shall include the namespaces for each of the Redfish resource types, along with
 # the "RedfishExtensions.v1_0_0" namespace.
 ###################################################################################################
+@assertion_registry.register('6.5.8', resources=['*', '$metadata'])
 def Assertion_6_5_8(self, log):
     log.AssertionID = '6.5.8'
     assertion_status = log.PASS
@@ -4657,6 +4739,7 @@ def Assertion_6_5_8(self, log):
 # Description:    Referencing Other Schemas
 # The service metadata shall include an entity container that defines the top level resources and Resource Collections.
 ###################################################################################################
+@assertion_registry.register('6.5.9', resources=['$metadata'])
 def Assertion_6_5_9(self, log) :
 
     log.AssertionID = '6.5.9'
@@ -4705,6 +4788,7 @@ def Assertion_6_5_9(self, log) :
 # Description:   Partial Resource Results
 # Responses representing a single resource shall not be broken into multiple results.
 ###################################################################################################
+@assertion_registry.register('6.5.35', resources=['*'])
 def Assertion_6_5_35(self, log) :
 
     log.AssertionID = '6.5.35'
@@ -4789,6 +4873,7 @@ def camel(s):
 # Description:    RegistryName is the name of the registry. The registry name shall be Pascal-cased.
 # Test performed by Priyanka
 ###################################################################################################
+@assertion_registry.register('6.5.40_old', resources=['*', 'OData', 'MessageRegistry'])
 def Assertion_6_5_40_old(self, log) :
 
     log.AssertionID = '6.5.40_old'
@@ -4842,6 +4927,7 @@ def Assertion_6_5_40_old(self, log) :
 # Test performed by Priyanka
 ###################################################################################################
 
+@assertion_registry.register('6.5.40', mutates=True, resources=['*'])
 def Assertion_6_5_40(self, log) :
 
     log.AssertionID = '6.5.40'
@@ -4905,6 +4991,7 @@ def Assertion_6_5_40(self, log) :
 # Description:    The unique identifier part of a URI shall be unique within the implementation.
 ###################################################################################################
 
+@assertion_registry.register('6.1.6', resources=['*', 'ServiceRoot'])
 def Assertion_6_1_6(self, log) :
 
     log.AssertionID = '6.1.6'
@@ -4956,6 +5043,7 @@ def Assertion_6_1_6(self, log) :
 # Test performed by Priyanka
 ###################################################################################################
 
+@assertion_registry.register('6.1.7', resources=['*'])
 def Assertion_6_1_7(self, log) :
 
     log.AssertionID = '6.1.7'
@@ -4995,6 +5083,7 @@ def Assertion_6_1_7(self, log) :
 # containing an annotation specifying the non-updatable property. In this success case, other
 # properties may be updated in the resource.
 ###################################################################################################
+@assertion_registry.register('6.4.24_xml', mutates=True, resources=['*', 'LogService'])
 def Assertion_6_4_24_xml(self, log) :
     log.AssertionID = '6.4.24_xml'
     assertion_status =  log.PASS
@@ -5039,7 +5128,7 @@ def Assertion_6_4_24_xml(self, log) :
                         json_payload, headers, status = self.http_PATCH(relative_uris[relative_uri], rq_headers, rq_body, authorization)
 
                 if namespace and typename:
-                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.json_directory)
+                    json_metadata, schema_file = rf_utility.get_resource_json_metadata(namespace, self.schema_source)
                     if json_metadata and schema_file:
                         if verify_typename_in_json_metadata(typename, json_metadata):
                             if 'properties' in json_metadata['definitions'][typename]:
@@ -5081,123 +5170,136 @@ def Assertion_6_4_24_xml(self, log) :
 ## end Assertion 6.4.24_xml
 
 
+###################################################################################################
+# Name: Note_LogServiceClearLog_skipped(self, log)
+# Description: Notes in the logs that the assertions clearing the system log were not run, as
+#   configured thru the 'AllowAction_LogServiceClearLog' property of the SUT
+###################################################################################################
+def Note_LogServiceClearLog_skipped(self, log):
+    print("\nNote: assertions 6.4.31 and 6.4.32 skipped as per json configuration file setting\n")
+    log.assertion_log('TX_COMMENT', "Note: assertions 6.4.31 and 6.4.32 skipped as per json configuration file setting\n")
+
 # run(self, log):
-# Takes sut obj and logger obj
+# Takes sut obj and logger obj. The assertions are listed in the order they are logged; they are
+# run thru assertion_executor, concurrently where possible if the SUT has "AssertionWorkers" set
 ###################################################################################################
 def run(self, log):
-    assertion_status = Assertion_6_1_0(self,log)
-    assertion_status = Assertion_6_1_1(self,log)
-    # Assertion 6_1_2 - Each unique instance of a resource shall be identified by a URI; thus a URI cannot reference multiple resources though it may reference a single collection resource.
-    assertion_status = Assertion_6_1_2(self,log)
-    # Assertion 6.1.3 - This is client specific and not the Redfish Service rule.
-    # assertion_status = Assertion_6_1_3(self,log)
-
-    assertion_status = Assertion_6_1_6(self,log)
-    #Fragments shall be ignored by the server when used as the URI
-    assertion_status = Assertion_6_1_7(self, log)
-    # Create/update/delete an Account: these next 3 assertions need to be run in series
-    # ...POST/create a new session for the account and it calls internally 6.1.8.1.1 and 6.1.8.1.2
-    #assertion_status = Assertion_6_1_8_1(self, log)
-    # ...GET account collection
-    assertion_status = Assertion_6_1_8_2(self, log)
-    # ...PATCH/update the new account note: this assertion expects 6_1_8_1 to run prior to this
-    assertion_status = Assertion_6_1_8_3(self, log)
-    # ...DELETE the new session that was created above note: this assertion expects 6_1_8_1 to run prior to this
-    assertion_status = Assertion_6_1_8_4(self, log)
-    assertion_status = Assertion_6_1_9(self, log)
-    # Assertion 6.1.10 is client specific - All Redfish Clients shall correctly handle HTTP redirect.
-    assertion_status = Assertion_6_1_11(self, log)
-    assertion_status = Assertion_6_1_12(self, log)
-    assertion_status = Assertion_6_1_13(self, log)
-    assertion_status = Assertion_6_1_14(self, log)
-    # Assertion 6.2.1 -The root URI for this version of the Redfish protocol shall be "/redfish/v1/" is duplicate and is tested in 6.3.1
-    # Assertion 6.2.3 - Any resource discovered through links found by accessing the root service or any service or resource
-    # referenced using references from the root service shall conform to the same version of the protocol supported by the
-    #root service. This can't be tested now as just the version 1 of Redfish is released
-    assertion_status = Assertion_6_2_3(self, log)
-    assertion_status = Assertion_6_3_1(self, log)
-    assertion_status = Assertion_6_3_2(self, log)
-    assertion_status = Assertion_6_3_3(self, log)
-    # Assertion_6_4_1 Required Column and Conditional one are checked in this
-    assertion_status = Assertion_6_4_1(self,log)
-    assertion_status = Assertion_6_4_2_1(self, log)
-    assertion_status = Assertion_6_4_2_2(self, log)
-    assertion_status = Assertion_6_4_2_3(self, log)
-    assertion_status = Assertion_6_4_2_4(self, log)
-    # Specification requirement changes
-    assertion_status = Assertion_6_4_2_5(self, log)
-    #Specification requirement changes
-    assertion_status = Assertion_6_4_2_6(self, log)
-    # Assertion_6_4_4 Tried doing it - Priyanka
-    assertion_status = Assertion_6_4_4(self,log)
-    assertion_status = Assertion_6_4_5(self, log)
-    #-assertion_status = Assertion_6_5_13(self, log)
-    #-assertion_status = Assertion_POST_Test(self, log)
-    #-assertion_status = Assertion_6_4_11(self, log)
-    # Assertion 6.4.13 tested for the fragments that is ignored in the uri- Priyanka
-    assertion_status = Assertion_6_4_13(self, log)
-    assertion_status = Assertion_6_4_14(self, log)
-    #-assertion_status = Assertion_6_4_15(self, log)
-    assertion_status = Assertion_6_4_16(self, log)
-    assertion_status = Assertion_6_4_18(self, log)
-    assertion_status = Assertion_6_4_21(self, log)
-    assertion_status = Assertion_6_4_23(self, log)
-    assertion_status = Assertion_6_4_24(self, log)
-    #assertion_status = Assertion_6_4_24_xml(self, log)
-    assertion_status = Assertion_6_4_25(self, log)
-    assertion_status = Assertion_6_4_26(self, log)
-    assertion_status = Assertion_6_4_27(self, log)
-    assertion_status = Assertion_6_4_30(self, log)
-    assertion_status = Assertion_6_4_32(self, log)
-    #-assertion_status = Assertion_6_4_32_old(self, log)
+    assertions = [
+        Assertion_6_1_0,
+        Assertion_6_1_1,
+        # Assertion 6_1_2 - Each unique instance of a resource shall be identified by a URI; thus a URI cannot reference multiple resources though it may reference a single collection resource.
+        Assertion_6_1_2,
+        # Assertion 6.1.3 - This is client specific and not the Redfish Service rule.
+        #Assertion_6_1_3,
+
+        Assertion_6_1_6,
+        #Fragments shall be ignored by the server when used as the URI
+        Assertion_6_1_7,
+        # Create/update/delete an Account: these next 3 assertions need to be run in series
+        # ...POST/create a new session for the account and it calls internally 6.1.8.1.1 and 6.1.8.1.2
+        #Assertion_6_1_8_1,
+        # ...GET account collection
+        Assertion_6_1_8_2,
+        # ...PATCH/update the new account note: this assertion expects 6_1_8_1 to run prior to this
+        Assertion_6_1_8_3,
+        # ...DELETE the new session that was created above note: this assertion expects 6_1_8_1 to run prior to this
+        Assertion_6_1_8_4,
+        Assertion_6_1_9,
+        # Assertion 6.1.10 is client specific - All Redfish Clients shall correctly handle HTTP redirect.
+        Assertion_6_1_11,
+        Assertion_6_1_12,
+        Assertion_6_1_13,
+        Assertion_6_1_14,
+        # Assertion 6.2.1 -The root URI for this version of the Redfish protocol shall be "/redfish/v1/" is duplicate and is tested in 6.3.1
+        # Assertion 6.2.3 - Any resource discovered through links found by accessing the root service or any service or resource
+        # referenced using references from the root service shall conform to the same version of the protocol supported by the
+        #root service. This can't be tested now as just the version 1 of Redfish is released
+        Assertion_6_2_3,
+        Assertion_6_3_1,
+        Assertion_6_3_2,
+        Assertion_6_3_3,
+        # Assertion_6_4_1 Required Column and Conditional one are checked in this
+        Assertion_6_4_1,
+        Assertion_6_4_2_1,
+        Assertion_6_4_2_2,
+        Assertion_6_4_2_3,
+        Assertion_6_4_2_4,
+        # Specification requirement changes
+        Assertion_6_4_2_5,
+        #Specification requirement changes
+        Assertion_6_4_2_6,
+        # Assertion_6_4_4 Tried doing it - Priyanka
+        Assertion_6_4_4,
+        Assertion_6_4_5,
+        #-Assertion_6_5_13,
+        #-Assertion_POST_Test,
+        #-Assertion_6_4_11,
+        # Assertion 6.4.13 tested for the fragments that is ignored in the uri- Priyanka
+        Assertion_6_4_13,
+        Assertion_6_4_14,
+        #-Assertion_6_4_15,
+        Assertion_6_4_16,
+        Assertion_6_4_18,
+        Assertion_6_4_21,
+        Assertion_6_4_23,
+        Assertion_6_4_24,
+        #Assertion_6_4_24_xml,
+        Assertion_6_4_25,
+        Assertion_6_4_26,
+        Assertion_6_4_27,
+        Assertion_6_4_30,
+        Assertion_6_4_32,
+        #-Assertion_6_4_32_old,
+    ]
     if 'AllowAction_LogServiceClearLog' in self.SUT_prop:
         if (self.SUT_prop['AllowAction_LogServiceClearLog'] == 'yes'):
-            assertion_status = Assertion_6_4_31(self, log)
-            assertion_status = Assertion_6_4_32(self, log)
+            assertions += [Assertion_6_4_31, Assertion_6_4_32]
         else:
-            print("\nNote: assertions 6.4.31 and 6.4.32 skipped as per json configuration file setting\n")
-            log.assertion_log('TX_COMMENT', "Note: assertions 6.4.31 and 6.4.32 skipped as per json configuration file setting\n")
-
-
-    assertion_status = Assertion_6_5_1(self, log)
-    #-assertion_status = Assertion_6_5_2_4(self, log)
-    assertion_status = Assertion_6_5_2_6(self, log)
-    assertion_status = Assertion_6_5_2_6_1(self, log)
-    assertion_status = Assertion_6_5_3(self, log)
-    assertion_status = Assertion_6_5_6_2(self, log)
-    #duplicate, or find another resource to POST
-    assertion_status = Assertion_6_5_6_3(self, log)
-    assertion_status = Assertion_6_5_6_5(self,log)
-    assertion_status = Assertion_6_5_6_6(self, log)
-    assertion_status = Assertion_6_5_6_8(self, log)
-    assertion_status = Assertion_6_5_6_9(self, log)
-    # commenting out the following, service stops responding shortly after serveral wrong credential attempts..
-    assertion_status = Assertion_6_5_6_10(self, log)
-    #-assertion_status = Assertion_6_5_6_13(self, log)
-    assertion_status = Assertion_6_5_8(self, log)
-    assertion_status = Assertion_6_5_9(self,log)
-    assertion_status = Assertion_6_5_10(self, log)
-    assertion_status = Assertion_6_5_11(self, log)
-    assertion_status = Assertion_6_5_12(self, log)
-    assertion_status = Assertion_6_5_13(self, log)
-    # fix regex
-    assertion_status = Assertion_6_5_14(self, log)
-    #-assertion_status = Assertion_6_5_15(self, log)
-    assertion_status = Assertion_6_5_17(self, log)
-    assertion_status = Assertion_6_5_18(self, log)
-    #-assertion_status = Assertion_6_5_19(self, log)
-    #WIP - Assertion_6.5.20 is pending
-    assertion_status = Assertion_6_5_20(self, log)
-    assertion_status = Assertion_6_5_21(self, log)
-    #assertion_status = Assertion_6_5_22(self, log)
-    assertion_status = Assertion_6_5_23(self, log)
-    assertion_status = Assertion_6_5_23_1(self, log)
-    assertion_status = Assertion_6_5_24(self, log)
-    assertion_status = Assertion_6_5_25(self, log)
-    assertion_status = Assertion_6_5_26(self, log)
-    assertion_status = Assertion_6_5_28(self, log)
-    #WIP It'a a may condition
-    #assertion_status = Assertion_6_5_30(self, log)
-    #-assertion_status = Assertion_6_5_31(self, log)
-    assertion_status = Assertion_6_5_35(self, log)
-    #assertion_status = Assertion_6_5_40(self,log)
+            assertions.append(Note_LogServiceClearLog_skipped)
+
+    assertions += [
+        Assertion_6_5_1,
+        #-Assertion_6_5_2_4,
+        Assertion_6_5_2_6,
+        Assertion_6_5_2_6_1,
+        Assertion_6_5_3,
+        Assertion_6_5_6_2,
+        #duplicate, or find another resource to POST
+        Assertion_6_5_6_3,
+        Assertion_6_5_6_5,
+        Assertion_6_5_6_6,
+        Assertion_6_5_6_8,
+        Assertion_6_5_6_9,
+        # commenting out the following, service stops responding shortly after serveral wrong credential attempts..
+        Assertion_6_5_6_10,
+        #-Assertion_6_5_6_13,
+        Assertion_6_5_8,
+        Assertion_6_5_9,
+        Assertion_6_5_10,
+        Assertion_6_5_11,
+        Assertion_6_5_12,
+        Assertion_6_5_13,
+        # fix regex
+        Assertion_6_5_14,
+        #-Assertion_6_5_15,
+        Assertion_6_5_17,
+        Assertion_6_5_18,
+        #-Assertion_6_5_19,
+        #WIP - Assertion_6.5.20 is pending
+        Assertion_6_5_20,
+        Assertion_6_5_21,
+        #Assertion_6_5_22,
+        Assertion_6_5_23,
+        Assertion_6_5_23_1,
+        Assertion_6_5_24,
+        Assertion_6_5_25,
+        Assertion_6_5_26,
+        Assertion_6_5_28,
+        #WIP It'a a may condition
+        #Assertion_6_5_30,
+        #-Assertion_6_5_31,
+        Assertion_6_5_35,
+        #Assertion_6_5_40,
+    ]
+
+    assertion_executor.run_assertions(self, log, assertions)
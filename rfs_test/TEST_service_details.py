@@ -42,6 +42,7 @@ import select
 import os
 from collections import OrderedDict
 import time
+from rfs_test import assertion_registry
 
 # current spec followed for these assertions
 REDFISH_SPEC_VERSION = "Version 1.0.2"
@@ -54,6 +55,7 @@ REDFISH_SPEC_VERSION = "Version 1.0.2"
 #   Services shall respond to a successful subscription with HTTP status 201 and set the HTTP 
 #   Location header to the address of a new subscription resource.                                           
 ###################################################################################################              
+@assertion_registry.register('8.1.3', mutates=True, resources=['EventService'])
 def Assertion_8_1_3(self, log) :
  
     log.AssertionID = '8.1.3'
@@ -228,6 +230,7 @@ def Assertion_8_1_3(self, log) :
 #  Clients shall terminate a subscription by sending an HTTP DELETE message to the URI of the 
 #  subscription resource                                       
 ###################################################################################################              
+@assertion_registry.register('8.1.4', mutates=True, resources=['EventService'])
 def Assertion_8_1_4(self, log) :
  
     log.AssertionID = '8.1.4'
@@ -337,6 +340,7 @@ def Assertion_8_1_4(self, log) :
 # header in the response shall contain a URI giving the location of the newly created "subscription" 
 # resource.                                   
 ###################################################################################################             
+@assertion_registry.register('8.1.5', resources=['EventService'])
 def Assertion_8_1_5(self, log) :
  
     log.AssertionID = '8.1.5'
@@ -384,6 +388,7 @@ def EventAssertionPropertyCheck(creation_payload, check_payload, log):
 # Assertion text: 
 #   The body of the response, if any, shall contain a representation of the subscription resource.                           
 ###################################################################################################              
+@assertion_registry.register('8.1.5.1', resources=['EventService'])
 def Assertion_8_1_5_1(self, log) :
  
     log.AssertionID = '8.1.5.1'
@@ -413,6 +418,7 @@ def Assertion_8_1_5_1(self, log) :
 #   Sending an HTTP GET to the subscription resource shall 
 #   return the configuration of the subscription.                               
 ###################################################################################################              
+@assertion_registry.register('8.1.5.2', resources=['EventService'])
 def Assertion_8_1_5_2(self, log) :
  
     log.AssertionID = '8.1.5.2'
@@ -448,6 +454,7 @@ def Assertion_8_1_5_2(self, log) :
 # The managed device must respond to M-SEARCH queries searching for Search Target (ST) of the
 # Redfish Service from clients with the AL pointing to the Redfish service root URI.                          
 ###################################################################################################        
+@assertion_registry.register('8.4.3', resources=['*', 'ServiceRoot'])
 def Assertion_8_4_3(self, log) :
  
     log.AssertionID = '8.4.3'
@@ -15,6 +15,7 @@
 
 import logger
 import time
+from collections import OrderedDict
 from rfs_test import TEST_protocol_details
 from rfs_test import TEST_datamodel_schema
 from rfs_test import TEST_manager_account
@@ -24,25 +25,36 @@ from rfs_test import TEST_assembly_schema
 from rfs_test import TEST_actioninfo_schema
 from rfs_test_in_progress import TEST_service_details
 from rfs_test_in_progress import TEST_security
+from rfs_test import assertion_executor
+from rfs_test import assertion_registry
+from rfs_test import assertion_profiler
 
 ###################################################################################################
-# Name: run(sut)
+# Name: run(sut, merge_assertion_logs = True)
 # sut == the instance of SUT type obj (rf_sut.py) for which these assertions are being run.
+# merge_assertion_logs == if False, the results are not added to the HTML log viewer's
+#   AssertionLogs.json but returned in the summary ('Run Key', 'Run Data') for the caller to add
+# Returns: summary of the run: SUT, assertion counts, run time and log file paths
 ###################################################################################################
-def run(sut):
+def run(sut, merge_assertion_logs = True):
     # create logger obj
     log = logger.Log()
+    log.MergeAssertionLogs = merge_assertion_logs
     # initialize assertions excel sheet at this point
     log.init_xl()
     ## Open/initialize the log files
     log.assertion_log('OPEN', None, sut.SUT_prop, sut.Redfish_URIs['Service_Root'])
     # cache URIs
-    sut.initialize_cache()
+    sut.initialize_cache(log.SUT_log_Folder)
     TEST_datamodel_schema.cacheURI(sut)
     TEST_protocol_details.cacheURI(sut)
+    # run times measured in earlier runs let the assertion executor start the longest ones first
+    assertion_registry.load_costs(log.SUT_log_Folder)
+    assertion_profiler.start(sut, log.SUT_log_Folder)
     if 'SingleAssertion' in sut.SUT_prop and len(sut.SUT_prop.get('SingleAssertion')) > 0:
         # Run single assertion
-        run_single([TEST_protocol_details, TEST_datamodel_schema], sut, log)
+        run_single([TEST_protocol_details, TEST_datamodel_schema, TEST_manager_account, TEST_computersystem_schema,
+                    TEST_accountservice_schema, TEST_assembly_schema, TEST_actioninfo_schema], sut, log)
     else:
         # Run all assertions
         TEST_protocol_details.run(sut, log)
@@ -60,15 +72,42 @@ def run(sut):
         TEST_assembly_schema.run(sut, log)
         TEST_actioninfo_schema.run(sut, log)
 
+    # report how well connections, cached responses and schema documents were reused during the run
+    log.run_stats_log('Connection Pool', sut.connection_pool_stats())
+    log.run_stats_log('TLS Sessions', sut.tls_session_stats())
+    log.run_stats_log('Response Cache', sut.response_cache_stats())
+    log.run_stats_log('Request Coalescing', sut.request_coalescer_stats())
+    log.run_stats_log('JSON Schema Cache', sut.json_schema_cache_stats())
+    log.run_stats_log('Requests', sut.request_stats().stats())
+    log.RequestTimings = sut.request_stats().summary()
+    log.AssertionProfile = assertion_profiler.report(sut.request_stats())
+    assertion_registry.save_costs(log.SUT_log_Folder)
+
+    # delete the session of the "Session" auth mode
+    sut.close_session()
+    if sut.session_auth_stats() is not None:
+        log.run_stats_log('Session Auth', sut.session_auth_stats())
+
     ## close log files
     log.assertion_log('CLOSE', None, sut.SUT_prop)
+
+    run_key, run_data = log.RunResult
+    summary = OrderedDict([('DisplayName', sut.SUT_prop['DisplayName']), ('DnsName', sut.SUT_prop['DnsName']),
+                           ('Passed', log.Assertion_Counter[log.PASS] + log.Assertion_Counter[log.INCOMPLETE]),
+                           ('Warn', log.Assertion_Counter[log.WARN]), ('Failed', log.Assertion_Counter[log.FAIL]),
+                           ('Info', log.Assertion_Counter[log.INFO]), ('Run_Time', run_data['Summary']['Run_Time']),
+                           ('Spreadsheet', log.SUT_XlDestPath), ('Text_Log', log.TextLogPath)])
+    if not merge_assertion_logs:
+        summary['Run Key'] = run_key
+        summary['Run Data'] = run_data
+    return summary
 # end run
 
 
 ###################################################################################################
 # Name: run_single(modules, sut, log)
 # Run a single assertion. The 'SingleAssertion' property in the SUT config specifies the name of
-# the assertion function to run.
+# the assertion function to run, or its assertion ID (e.g. "6.1.0").
 # modules == the list of modules to search for the named assertion
 # sut == the instance of SUT type obj (rf_sut.py) for which the assertion is being run
 # log ==  the log instance to use for logging results
@@ -79,14 +118,10 @@ def run_single(modules, sut, log):
     else:
         print('ERROR: run_single() called to run single assertion, but no "SingleAssertion" property found in SUT')
         return
-    func = None
-    for mod in modules:
-        if hasattr(mod, assertion) and callable(getattr(mod, assertion)):
-            func = getattr(mod, assertion)
-            break
-    if func is not None:
-        print('Running single assertion "{}"'.format(assertion))
-        func(sut, log)
+    assertion_info = assertion_registry.lookup(assertion, modules)
+    if assertion_info is not None:
+        print('Running single assertion "{}"'.format(assertion_info.name))
+        assertion_executor.run_assertion(sut, log, assertion_info.function)
     else:
         print('ERROR: "SingleAssertion" property was specified in config, but function named "{}" was not found'
               .format(assertion))
@@ -0,0 +1,205 @@
+# Copyright Notice:
+# Copyright 2016-2019 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Service-Conformance-Check/blob/main/LICENSE.md
+
+###################################################################################################
+# File: assertion_executor.py
+#   This module runs a list of assertions for a SUT. Assertions that only read from the service
+#   can run concurrently on a pool of worker threads ("AssertionWorkers" property of the SUT); each
+#   of them logs into its own buffer which is replayed into the real log in the order the
+#   assertions were listed, so the console, text log and spreadsheet read exactly as if they had
+#   run one after another. Assertions that change the service or the SUT object run alone, after
+#   everything listed before them has finished.
+###################################################################################################
+
+import sys
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import rf_utility
+from rfs_test import assertion_registry
+from rfs_test import assertion_profiler
+
+###################################################################################################
+# Class: BufferedLog
+#   Stands in for the logger.Log instance while an assertion runs on a worker thread. It records
+#   the AssertionID changes, assertion_log calls and console output of the assertion so they can
+#   be replayed into the real log later.
+###################################################################################################
+class BufferedLog:
+    def __init__(self, log):
+        self.log = log
+        self.PASS = log.PASS
+        self.WARN = log.WARN
+        self.FAIL = log.FAIL
+        self.INFO = log.INFO
+        self.INCOMPLETE = log.INCOMPLETE
+        self.TextLogPath = log.TextLogPath
+        self.assertion_id = log.AssertionID
+        self.events = []
+
+    @property
+    def AssertionID(self):
+        return self.assertion_id
+
+    @AssertionID.setter
+    def AssertionID(self, assertion_id):
+        self.assertion_id = assertion_id
+        self.events.append(('AssertionID', assertion_id))
+
+    def assertion_log(self, log_control, log_string, SUT_prop = None, service_root = None):
+        self.events.append(('assertion_log', (log_control, log_string, SUT_prop, service_root)))
+        return 1
+
+    def status_fixup(self, assertion_status, assertion_status_):
+        return self.log.status_fixup(assertion_status, assertion_status_)
+
+    def write(self, text):
+        self.events.append(('stdout', text))
+
+    ###############################################################################################
+    # Name: replay()
+    #   Applies the recorded events to the real log (and console) in the order they happened
+    ###############################################################################################
+    def replay(self):
+        for event, value in self.events:
+            if event == 'AssertionID':
+                self.log.AssertionID = value
+            elif event == 'assertion_log':
+                self.log.assertion_log(*value)
+            else:
+                sys.stdout.write(value)
+        self.events = []
+
+###################################################################################################
+# Class: ThreadStdout
+#   Replaces sys.stdout while assertions run concurrently; output from a thread running an
+#   assertion goes to that assertion's BufferedLog, any other output to the real stdout
+###################################################################################################
+class ThreadStdout:
+    def __init__(self, stdout):
+        self.stdout = stdout
+        self.local = threading.local()
+
+    def write(self, text):
+        buffered_log = getattr(self.local, 'buffered_log', None)
+        if buffered_log is not None:
+            buffered_log.write(text)
+        else:
+            self.stdout.write(text)
+
+    def flush(self):
+        self.stdout.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stdout, name)
+
+###############################################################################################
+# Name: assertion_workers(sut)
+#   Returns the number of assertions allowed to run concurrently, set through the optional
+#   "AssertionWorkers" property of the SUT (default 1, every assertion runs serially)
+###############################################################################################
+def assertion_workers(sut):
+    try:
+        workers = int(sut.SUT_prop.get('AssertionWorkers', "1"))
+    except:
+        workers = 1
+    return max(workers, 1)
+
+###############################################################################################
+# Name: run_assertion(sut, log, assertion)
+#   Runs one assertion with the setup and teardown it was registered with, and records how long
+#   it took in the registry. The requests made meanwhile by the thread are attributed to the
+#   assertion ID (see rf_utility.RequestStats), and the assertion is profiled if the SUT asks
+#   for it (see assertion_profiler)
+###############################################################################################
+def run_assertion(sut, log, assertion):
+    assertion_info = assertion_registry.info(assertion)
+    assertion_id = assertion_info.assertion_id if assertion_info is not None else assertion.__name__
+
+    def run():
+        start = time.time()
+        if assertion_info is not None and assertion_info.setup is not None:
+            assertion_info.setup(sut)
+        try:
+            return assertion(sut, log)
+        finally:
+            if assertion_info is not None and assertion_info.teardown is not None:
+                assertion_info.teardown(sut)
+            if assertion_info is not None:
+                assertion_registry.record_cost(assertion, time.time() - start)
+
+    rf_utility.set_request_context(assertion_id)
+    try:
+        return assertion_profiler.profile(assertion_id, assertion.__name__, run)
+    finally:
+        rf_utility.set_request_context(None)
+
+###############################################################################################
+# Name: run_assertions(sut, log, assertions)
+#   Takes the SUT instance, the log instance and a list of assertion functions, each called as
+#   assertion(sut, log), and runs those selected by the SUT properties (see
+#   assertion_registry.selected()). With one worker they are called one after another exactly
+#   as listed. With more, the read-only assertions between two mutating ones run concurrently,
+#   the most costly first, and their logs are replayed in list order; a mutating assertion waits
+#   for all those before it, runs alone with the real log, and the assertions after it start
+#   only once it has finished.
+###############################################################################################
+def run_assertions(sut, log, assertions):
+    assertions = [assertion for assertion in assertions if assertion_registry.selected(sut, assertion)]
+    workers = assertion_workers(sut)
+    if workers <= 1:
+        for assertion in assertions:
+            run_assertion(sut, log, assertion)
+        return
+
+    stdout = sys.stdout
+    thread_stdout = ThreadStdout(stdout)
+
+    def run_buffered(assertion, buffered_log):
+        thread_stdout.local.buffered_log = buffered_log
+        try:
+            return run_assertion(sut, buffered_log, assertion)
+        finally:
+            thread_stdout.local.buffered_log = None
+
+    pending = []
+
+    # replays the logs of the pending assertions in order, stopping at the first one still
+    # running unless wait is set
+    def replay_pending(wait):
+        while pending and (wait or pending[0][0].done()):
+            future, buffered_log = pending.pop(0)
+            try:
+                future.result()
+            finally:
+                buffered_log.replay()
+
+    # submits the read-only assertions listed since the last mutating one, longest first
+    def submit_batch(executor, batch):
+        futures = dict()
+        for index in sorted(range(len(batch)), key=lambda i: -assertion_registry.cost(batch[i])):
+            buffered_log = BufferedLog(log)
+            futures[index] = (executor.submit(run_buffered, batch[index], buffered_log), buffered_log)
+        pending.extend(futures[index] for index in range(len(batch)))
+
+    sys.stdout = thread_stdout
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                batch = []
+                for assertion in assertions:
+                    if assertion_registry.is_mutating(assertion):
+                        submit_batch(executor, batch)
+                        batch = []
+                        replay_pending(True)
+                        run_assertion(sut, log, assertion)
+                    else:
+                        batch.append(assertion)
+                submit_batch(executor, batch)
+                replay_pending(True)
+            finally:
+                for future, buffered_log in pending:
+                    future.cancel()
+    finally:
+        sys.stdout = stdout
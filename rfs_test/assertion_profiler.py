@@ -0,0 +1,115 @@
+# Copyright Notice:
+# Copyright 2016-2019 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Service-Conformance-Check/blob/main/LICENSE.md
+
+###################################################################################################
+# File: assertion_profiler.py
+#   This module profiles the assertions of a run when the "ProfileAssertions" property of the SUT
+#   is set. The assertion_executor runs each assertion through profile(), which measures its wall
+#   and CPU time and, in "cprofile" mode, dumps a cProfile .pstats file of it into the profiles
+#   folder under the log folder of the SUT. report() joins these with the requests, bytes and
+#   response cache lookups made for each assertion (rf_utility.RequestStats) into a table ranked by
+#   wall time, which the logger writes at CLOSE.
+###################################################################################################
+
+import os
+import time
+import cProfile
+import threading
+from collections import OrderedDict
+
+## folder under the log folder of the SUT the cProfile files are dumped in
+PROFILES_FOLDER_NAME = 'profiles'
+
+## CPU time of the current thread, so that assertions running concurrently are measured apart
+thread_time = getattr(time, 'thread_time', time.process_time)
+
+## profiling mode of the run: None (off), 'time' or 'cprofile'
+mode = None
+## folder the cProfile files of the run are dumped in
+profiles_folder = None
+## assertion ID -> (assertion function name, wall seconds, CPU seconds, .pstats path or None)
+profiles = OrderedDict()
+profiles_lock = threading.Lock()
+
+###############################################################################################
+# Name: profile_mode(sut)
+#   Returns the profiling mode set through the optional "ProfileAssertions" property of the
+#   SUT: 'time' for "yes", "true" or "on", 'cprofile' for "cprofile", else None
+###############################################################################################
+def profile_mode(sut):
+    setting = str(sut.SUT_prop.get('ProfileAssertions', '')).lower()
+    if setting == 'cprofile':
+        return 'cprofile'
+    if setting in ['yes', 'true', 'on']:
+        return 'time'
+    return None
+
+###############################################################################################
+# Name: start(sut, log_folder)
+#   Clears the profiles of an earlier run and sets the profiling mode of the run from the SUT
+###############################################################################################
+def start(sut, log_folder):
+    global mode, profiles_folder
+    with profiles_lock:
+        profiles.clear()
+    mode = profile_mode(sut)
+    profiles_folder = os.path.join(log_folder, PROFILES_FOLDER_NAME)
+    if mode == 'cprofile' and not os.path.isdir(profiles_folder):
+        os.makedirs(profiles_folder)
+
+###############################################################################################
+# Name: profile(assertion_id, name, function)
+#   Calls function() and returns its result. If profiling is on, its wall and CPU time are
+#   recorded under assertion_id, and in 'cprofile' mode its profile is dumped to
+#   <profiles_folder>/<assertion_id>.pstats
+###############################################################################################
+def profile(assertion_id, name, function):
+    if mode is None:
+        return function()
+    profiler = None
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError as err:
+            # only one profiler can be active at a time from Python 3.12 on
+            print('Could not profile assertion %s: %s' % (assertion_id, err))
+            profiler = None
+    start_time = time.time()
+    start_cpu = thread_time()
+    try:
+        return function()
+    finally:
+        wall, cpu = time.time() - start_time, thread_time() - start_cpu
+        pstats_path = None
+        if profiler is not None:
+            profiler.disable()
+            pstats_path = os.path.join(profiles_folder, '%s.pstats' % assertion_id)
+            try:
+                profiler.dump_stats(pstats_path)
+            except (IOError, OSError) as err:
+                print('Error writing assertion profile %s: %s' % (pstats_path, err))
+                pstats_path = None
+        with profiles_lock:
+            profiles[assertion_id] = (name, wall, cpu, pstats_path)
+
+###############################################################################################
+# Name: report(request_stats)
+#   Takes the rf_utility.RequestStats of the SUT and returns the profiles of the run ranked by
+#   wall time, a list of dicts: Assertion, Function, Wall_Time, CPU_Time, the requests by
+#   method, bytes sent and received and response cache hits and misses made for the assertion,
+#   and the .pstats path in 'cprofile' mode. Empty if profiling is off.
+###############################################################################################
+def report(request_stats):
+    with profiles_lock:
+        items = list(profiles.items())
+    table = []
+    for assertion_id, (name, wall, cpu, pstats_path) in sorted(items, key=lambda item: -item[1][1]):
+        row = OrderedDict([('Assertion', assertion_id), ('Function', name),
+                           ('Wall_Time', round(wall, 3)), ('CPU_Time', round(cpu, 3))])
+        row.update(request_stats.made_for_summary(assertion_id))
+        if pstats_path is not None:
+            row['Profile'] = pstats_path
+        table.append(row)
+    return table
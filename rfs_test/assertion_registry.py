@@ -0,0 +1,223 @@
+# Copyright Notice:
+# Copyright 2016-2019 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Service-Conformance-Check/blob/main/LICENSE.md
+
+###################################################################################################
+# File: assertion_registry.py
+#   This module keeps the registry of assertions. Each Assertion_* function of the rfs_test modules
+#   is declared with the register() decorator, recording its assertion ID, the section of the spec
+#   (or the schema) it checks, whether it changes the SUT, the resource types it reads and how long
+#   it took in earlier runs. The single assertion mode, the "SelectAssertions" and
+#   "SkipMutatingAssertions" properties of the SUT and the assertion_executor use this metadata
+#   to find, select and schedule assertions.
+###################################################################################################
+
+import os
+import re
+import json
+import inspect
+import threading
+from collections import OrderedDict
+
+## file in the log folder of each SUT keeping the measured cost (seconds) of its assertions
+COSTS_FILE_NAME = 'assertion_costs.json'
+
+## resource type of assertions checking every resource sampled in the response cache
+ALL_RESOURCES = '*'
+
+## request methods and calls that change the service, credentials set by hand (invalid logins can
+## lock the account out for everyone else), and statements that change the SUT instance or module
+## state -- used to tell whether functions that are not registered change the SUT
+mutating_source = re.compile(
+    r'http_(POST|PATCH|PUT|DELETE)\b'
+    r'|http__(POST|PATCH|PUT|DELETE|modify_resource|set_auth_header)\b'
+    r'|\bself\.\w+(\[[^\]]*\])*\s*(=(?!=)|\+=|-=)'
+    r'|\bself\.\w+(\[[^\]]*\])*\.(append|extend|insert|update|pop|remove|clear|setdefault)\('
+    r'|^\s*global\s', re.MULTILINE)
+
+###################################################################################################
+# Class: AssertionInfo
+#   The metadata registered for one assertion function
+#       name: name of the function, for example 'Assertion_6_1_0'
+#       assertion_id: ID logged for the assertion, for example '6.1.0'
+#       section: section of the spec ('6.1') or schema ('AccountService') the assertion checks
+#       mutates: True if the assertion changes the SUT (or the service state other assertions see)
+#       resources: resource types the assertion reads; ALL_RESOURCES for every cached resource
+#       cost: expected run time in seconds, used until a run time has been measured
+#       setup/teardown: functions called with the SUT before/after the assertion runs
+###################################################################################################
+class AssertionInfo:
+    def __init__(self, function, assertion_id, section, mutates, resources, cost, setup, teardown):
+        self.function = function
+        self.name = function.__name__
+        self.module = function.__module__
+        self.assertion_id = assertion_id
+        self.section = section
+        self.mutates = mutates
+        self.resources = resources
+        self.cost = cost
+        self.setup = setup
+        self.teardown = teardown
+
+## (module name, function name) -> AssertionInfo, in the order the assertions are declared; keyed by
+## module too since modules may define the same names (e.g. both copies of TEST_security)
+registry = OrderedDict()
+## function name -> [average seconds, number of runs] measured for the SUT being tested
+measured_costs = dict()
+## guards measured_costs, assertions record their cost from the assertion_executor worker threads
+measured_costs_lock = threading.Lock()
+
+###############################################################################################
+# Name: register(assertion_id, section = None, mutates = False, resources = (), cost = 0,
+#                setup = None, teardown = None)
+#   Decorator declaring an assertion function and its metadata. If section is not given it is the
+#   first two levels of a numeric assertion_id ('6.4' for '6.4.2.1').
+###############################################################################################
+def register(assertion_id, section = None, mutates = False, resources = (), cost = 0, setup = None, teardown = None):
+    if section is None:
+        section = '.'.join(assertion_id.split('.')[:2])
+    def decorator(function):
+        registry[(function.__module__, function.__name__)] = AssertionInfo(function, assertion_id, section, mutates,
+                                                                          list(resources), cost, setup, teardown)
+        return function
+    return decorator
+
+###############################################################################################
+# Name: info(assertion)
+#   Takes an assertion function
+# Return:
+#   its AssertionInfo, or None if the function is not registered
+###############################################################################################
+def info(assertion):
+    assertion_info = registry.get((getattr(assertion, '__module__', None), getattr(assertion, '__name__', None)))
+    if assertion_info is not None and assertion_info.function is assertion:
+        return assertion_info
+    return None
+
+###############################################################################################
+# Name: lookup(name, modules = None)
+#   Finds an assertion by function name ('Assertion_6_1_0') or, failing that, by assertion ID
+#   ('6.1.0'), optionally only among the assertions of the given modules
+# Return:
+#   the AssertionInfo found, else None
+###############################################################################################
+def lookup(name, modules = None):
+    module_names = [module.__name__ for module in modules] if modules is not None else None
+    candidates = [assertion_info for assertion_info in registry.values()
+                  if module_names is None or assertion_info.module in module_names]
+    for assertion_info in candidates:
+        if assertion_info.name == name:
+            return assertion_info
+    for assertion_info in candidates:
+        if assertion_info.assertion_id == name:
+            return assertion_info
+    return None
+
+###############################################################################################
+# Name: is_mutating(assertion, seen = None)
+#   Takes an assertion function. Registered assertions are mutating as declared; for any other
+#   function its source, and the source of the functions of its module it calls, is scanned for
+#   requests or statements that change the service or the SUT instance
+# Return:
+#   True if the assertion must not run concurrently with others
+###############################################################################################
+def is_mutating(assertion, seen = None):
+    assertion_info = info(assertion)
+    if assertion_info is not None:
+        return assertion_info.mutates
+    if seen is None:
+        seen = set()
+    seen.add(assertion)
+    try:
+        source = inspect.getsource(assertion)
+    except (IOError, OSError, TypeError):
+        # cannot tell what it does, so run it alone
+        return True
+    if mutating_source.search(source):
+        return True
+    module_globals = getattr(assertion, '__globals__', {})
+    for name in set(re.findall(r'\b([A-Za-z_]\w*)\s*\(', source)):
+        callee = module_globals.get(name)
+        if inspect.isfunction(callee) and callee not in seen and callee.__module__ == assertion.__module__:
+            if is_mutating(callee, seen):
+                return True
+    return False
+
+###############################################################################################
+# Name: selected(sut, assertion)
+#   Tells whether an assertion is selected to run by the optional SUT properties
+#   "SelectAssertions" -- comma separated function names, assertion IDs, sections (a section
+#   also selects its subsections) or resource types -- and "SkipMutatingAssertions" ("yes" runs
+#   only assertions that do not change the SUT). Functions that are not registered assertions
+#   run only when "SelectAssertions" is not set.
+###############################################################################################
+def selected(sut, assertion):
+    if sut.SUT_prop.get('SkipMutatingAssertions') == 'yes' and is_mutating(assertion):
+        return False
+    selection = [item.strip() for item in sut.SUT_prop.get('SelectAssertions', '').split(',') if item.strip()]
+    if not selection:
+        return True
+    assertion_info = info(assertion)
+    if assertion_info is None:
+        return False
+    resources = [resource.lower() for resource in assertion_info.resources]
+    for item in selection:
+        if item in (assertion_info.name, assertion_info.assertion_id, assertion_info.section):
+            return True
+        if assertion_info.assertion_id.startswith(item + '.') or assertion_info.section.startswith(item + '.'):
+            return True
+        if item.lower() in resources:
+            return True
+    return False
+
+###############################################################################################
+# Name: cost(assertion)
+#   Returns the expected run time of an assertion in seconds: the average measured in earlier
+#   runs against the SUT if there is one, else the cost it was registered with (0 if not registered)
+###############################################################################################
+def cost(assertion):
+    name = getattr(assertion, '__name__', None)
+    if name in measured_costs:
+        return measured_costs[name][0]
+    assertion_info = info(assertion)
+    return assertion_info.cost if assertion_info is not None else 0
+
+###############################################################################################
+# Name: record_cost(assertion, seconds)
+#   Adds a measured run time of an assertion to its average
+###############################################################################################
+def record_cost(assertion, seconds):
+    with measured_costs_lock:
+        average, runs = measured_costs.get(assertion.__name__, (0, 0))
+        measured_costs[assertion.__name__] = [(average * runs + seconds) / (runs + 1), runs + 1]
+
+###############################################################################################
+# Name: load_costs(log_folder)
+#   Loads the run times measured in earlier runs from the COSTS_FILE_NAME file in the log folder
+#   of the SUT
+###############################################################################################
+def load_costs(log_folder):
+    measured_costs.clear()
+    costs_path = os.path.join(log_folder, COSTS_FILE_NAME)
+    if not os.path.isfile(costs_path):
+        return
+    try:
+        with open(costs_path) as fp:
+            measured_costs.update(json.load(fp))
+    except (IOError, OSError, ValueError) as err:
+        print('Error reading assertion costs %s: %s' % (costs_path, err))
+
+###############################################################################################
+# Name: save_costs(log_folder)
+#   Saves the run times measured for the SUT to the COSTS_FILE_NAME file in its log folder
+###############################################################################################
+def save_costs(log_folder):
+    costs_path = os.path.join(log_folder, COSTS_FILE_NAME)
+    try:
+        with measured_costs_lock:
+            costs = dict(measured_costs)
+        with open(costs_path + '.tmp', 'w') as fp:
+            json.dump(costs, fp, sort_keys=True, indent=4)
+        os.replace(costs_path + '.tmp', costs_path)
+    except (IOError, OSError) as err:
+        print('Error writing assertion costs %s: %s' % (costs_path, err))
@@ -53,6 +53,7 @@ import select
 import os
 from collections import OrderedDict
 import time
+from rfs_test import assertion_registry
 
 # current spec followed for these assertions
 REDFISH_SPEC_VERSION = "Version 1.0.2"
@@ -67,6 +68,7 @@ REDFISH_SPEC_VERSION = "Version 1.0.2"
 # header that contains a link to the newly created session resource. The JSON response body that 
 # contains a full representation of the newly created session object? ~ i dont see it
 ###################################################################################################      
+@assertion_registry.register('9.3.1', mutates=True, resources=['*', 'SessionService'])
 def Assertion_9_3_1(self, log) :
  
     log.AssertionID = '9.3.1'
@@ -160,6 +162,7 @@ def Assertion_9_3_1(self, log) :
 # The response to the POST request to create a session includes: an X-Auth-Token header that contains
 #  a "session auth token" that the client can use an subsequent requests	       
 ###################################################################################################
+@assertion_registry.register('9.3.1.1', mutates=True, resources=['SessionService'])
 def Assertion_9_3_1_1(self, log) :
  
     log.AssertionID = '9.3.1.1'
@@ -237,6 +240,7 @@ def Assertion_9_3_1_1(self, log) :
 # The response to the POST request to create a session includes: a "Location header that contains a 
 # link to the newly created session resource.
 ###################################################################################################
+@assertion_registry.register('9.3.1.2', mutates=True, resources=['SessionService'])
 def Assertion_9_3_1_2(self, log):
  
     log.AssertionID = '9.3.1.2'
@@ -308,6 +312,7 @@ def Assertion_9_3_1_2(self, log):
 # The response to the POST request to create a session includes:
 #  The JSON response body that contains a full representation of the newly created session object
 ###################################################################################################  
+@assertion_registry.register('9.3.1.3', mutates=True, resources=['SessionService'])
 def Assertion_9_3_1_3(self, log):
     log.AssertionID = '9.3.1.3'
     assertion_status =  log.PASS
@@ -394,14 +399,15 @@ def Assertion_9_3_1_3(self, log):
 # Services shall not require a client to create a session when Basic Auth is used. 
 # Note did a test with session + basic auth, requests failed
 ###################################################################################################
+@assertion_registry.register('9.3.1.4', resources=['*'])
 def Assertion_9_3_1_4(self, log) :
  
     log.AssertionID = '9.3.1.4'
     assertion_status =  log.PASS
     log.assertion_log('BEGIN_ASSERTION', None)
 
-    #auth on, no session
-    authorization = 'on'
+    #auth on, no session (Basic even in the "Session" auth mode)
+    authorization = 'basic'
     rq_headers = self.request_headers()
     relative_uris = self.relative_uris 
     authorization_key = 'Authorization'
@@ -423,6 +429,7 @@ def Assertion_9_3_1_4(self, log) :
 # All write activities shall be authenticated, i.e. POST, except for The POST operation to the 
 # Sessions service/object needed for authentication     
 ###################################################################################################
+@assertion_registry.register('9.3.2.1', mutates=True, resources=['*', 'SessionService', 'AccountService'])
 def Assertion_9_3_2_1(self, log) :
  
     log.AssertionID = '9.3.2.1'
@@ -662,6 +669,7 @@ def checkPrivilegedinfo(unauth_load, auth_payload, log):
 # All write activities shall be authenticated, i.e. PATCH/PUT 
 # TODO - should also test PATCH account with session key?    
 ###################################################################################################
+@assertion_registry.register('9.3.2.2', mutates=True, resources=['AccountService'])
 def Assertion_9_3_2_2(self, log) :
  
     log.AssertionID = '9.3.2.2'
@@ -852,6 +860,7 @@ def Assertion_9_3_3_2(unauth_payload,auth_payload, log) :
 # All write activities shall be authenticated, i.e. DELETE   
 # TODO - should also test DELETE account with session key?  
 ###################################################################################################  
+@assertion_registry.register('9.3.2.3', mutates=True, resources=['AccountService'])
 def Assertion_9_3_2_3(self, log) :
  
     log.AssertionID = '9.3.2.3'
@@ -1013,6 +1022,7 @@ def Assertion_9_3_3_3(unauth_payload,auth_payload, log) :
 # There could be other responses that can get affected. For now, the assertion checks for
 # 'If-None-Match' with wrong auth
 ###################################################################################################
+@assertion_registry.register('9.3.7', mutates=True, resources=['*'])
 def Assertion_9_3_7(self, log) :
 
     log.AssertionID = '9.3.7'
@@ -1065,6 +1075,7 @@ def Assertion_9_3_7(self, log) :
 #   in rfc_service. If at any request, 'set-cookie' was returned, the variable wouldve been set to 
 #   True (if the service returns cookies this is an indication of a non-conformant service)
 ###################################################################################################
+@assertion_registry.register('9.3.8')
 def Assertion_9_3_8(self, log):
 
     log.AssertionID = '9.3.8'
@@ -1091,6 +1102,7 @@ def Assertion_9_3_8(self, log):
 # sufficient privilege to terminate other users sessions from a different session.
 ###################################################################################################
 
+@assertion_registry.register('9.3.11.1', mutates=True, resources=['SessionService'])
 def Assertion_9_3_11_1(self, log) :
  
     log.AssertionID = '9.3.11.1'
@@ -1170,6 +1182,7 @@ def Assertion_9_3_11_1(self, log) :
 # Description: The URI for establishing a session can be found in the SessionService's Session property
 #  or in the Service Root's Links Section under the Sessions property.  Both URIs shall be the same.
 ###################################################################################################
+@assertion_registry.register('9.3.12', resources=['ServiceRoot', 'SessionService'])
 def Assertion_9_3_12(self, log) :
 
     log.AssertionID = '9.3.12'
@@ -1249,6 +1262,7 @@ def Assertion_9_3_12(self, log) :
 #   any third party authentication service and clients. Therefore, the POST to create a new session 
 #   shall 'only' be supported with HTTPS, and all requests that use Basic Auth shall 'require' HTTPS.
 ###################################################################################################
+@assertion_registry.register('9.3.13', mutates=True, resources=['SessionService'])
 def Assertion_9_3_13(self, log) :
  
     log.AssertionID = '9.3.13'
@@ -1351,6 +1365,7 @@ def Assertion_9_3_13(self, log) :
 #   any third party authentication service and clients therefore all requests that use Basic Auth 
 #   shall 'require' HTTPS.
 ###################################################################################################
+@assertion_registry.register('9.3.13.1', resources=['*'])
 def Assertion_9_3_13_1(self, log) :
  
     log.AssertionID = '9.3.13.1'
@@ -1399,6 +1414,7 @@ def Assertion_9_3_13_1(self, log) :
 # Note: with each atomic operation on accounts, request with etag in header?
 # Note 2: User management activity is atomic, so GET POST PATCH DELETE on account objects?
 ###################################################################################################
+@assertion_registry.register('9.3.15', resources=['AccountService'])
 def Assertion_9_3_15(self, log) :
 
     log.AssertionID = '9.3.15'
@@ -1478,6 +1494,7 @@ def Assertion_9_3_15(self, log) :
 #   array in the Role resource.
 # NOTE: Roles not found in redfish/v1/AccountService
 ###################################################################################################
+@assertion_registry.register('9.3.18', mutates=True, resources=['AccountService'])
 def Assertion_9_3_18(self, log):
     log.AssertionID = '9.3.18'
     assertion_status =  log.PASS
@@ -1600,6 +1617,7 @@ def Assertion_9_3_18(self, log):
 #    ~ Role Name = "ReadOnly"
 #      ~ AssignedPrivileges = Login, ConfigureSelf
 ###################################################################################################
+@assertion_registry.register('9.3.19', mutates=True, resources=['AccountService'])
 def Assertion_9_3_19(self, log):
     log.AssertionID = '9.3.19'
     assertion_status =  log.PASS
@@ -1715,6 +1733,7 @@ def Assertion_9_3_19(self, log):
 #    ~ Role Name = "ReadOnly"
 #      ~ AssignedPrivileges = Login, ConfigureSelf
 ###################################################################################################
+@assertion_registry.register('9.3.20', resources=['AccountService'])
 def Assertion_9_3_20(self, log):
     log.AssertionID = '9.3.20'
     assertion_status =  log.PASS
@@ -1798,6 +1817,7 @@ def Assertion_9_3_20(self, log):
 
 # Method: Try them all, should support all
 ###################################################################################################
+@assertion_registry.register('9.3.21')
 def Assertion_9_3_21(self, log):
     log.AssertionID = '9.3.21'
     assertion_status =  log.PASS
@@ -1813,6 +1833,7 @@ def Assertion_9_3_21(self, log):
 # Name: Assertion_9_3_22()   Privilege Model / Authorization    WIP                           
 # Description:   The privilege array defined for the predefined roles shall not be modifiable.
 ###################################################################################################
+@assertion_registry.register('9.3.22', resources=['AccountService'])
 def Assertion_9_3_22(self, log):
     log.AssertionID = '9.3.22'
     assertion_status =  log.PASS
@@ -25,9 +25,14 @@
 
 import io
 import os
+import sys
+import gc
+import hashlib
+import pickle
 import xml.etree.ElementTree as ET
 import copy
 from collections import OrderedDict, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 
 
 ## Element tag mapping to its csdl namespace. 
@@ -143,6 +148,11 @@ class Schema:
         self.ComplexTypes = []
         self.EnumTypes = []
         self.Actions = []
+        ## Name -> first element of that Name in each of the lists above
+        self.EntityTypeIndex = dict()
+        self.ComplexTypeIndex = dict()
+        self.EnumTypeIndex = dict()
+        self.ActionIndex = dict()
 
     ###############################################################################################
     # Name: add_entitytype(entitytype)
@@ -150,6 +160,7 @@ class Schema:
     ###############################################################################################
     def add_entitytype(self, entitytype):
         self.EntityTypes.append(entitytype)
+        self.EntityTypeIndex.setdefault(entitytype.Name, entitytype)
 
     ###############################################################################################
     # Name: add_complextype(complextype)
@@ -157,6 +168,7 @@ class Schema:
     ###############################################################################################
     def add_complextype(self, complextype):
         self.ComplexTypes.append(complextype)
+        self.ComplexTypeIndex.setdefault(complextype.Name, complextype)
 
     ###############################################################################################
     # Name: add_enumtype(enumtype)
@@ -164,6 +176,7 @@ class Schema:
     ###############################################################################################
     def add_enumtype(self, enumtype):
         self.EnumTypes.append(enumtype)
+        self.EnumTypeIndex.setdefault(enumtype.Name, enumtype)
 
     ###############################################################################################
     # Name: add_action(action)
@@ -171,6 +184,7 @@ class Schema:
     ###############################################################################################
     def add_action(self, action):
         self.Actions.append(action)
+        self.ActionIndex.setdefault(action.Name, action)
 
     ###############################################################################################
     # Name: get_resource_type_obj_by_typename(typename)
@@ -181,21 +195,9 @@ class Schema:
     ###############################################################################################
     # types can be structured/complex type, enumeration, actions
     def get_resource_type_obj_by_typename(self, typename):
-        for et in self.EntityTypes:
-            if et.Name == typename:
-                return et
-
-        for ct in self.ComplexTypes:
-            if ct.Name == typename:
-                return ct
-
-        for ent in self.EnumTypes:
-            if ent.Name == typename:
-                return ent
-
-        for action in self.Actions:
-            if action.Name == typename:
-                return action
+        for type_index in (self.EntityTypeIndex, self.ComplexTypeIndex, self.EnumTypeIndex, self.ActionIndex):
+            if typename in type_index:
+                return type_index[typename]
 
         return None
 
@@ -209,23 +211,16 @@ class Schema:
     # types can be structured/complex type, enumeration, actions
     def verify_resource_typename_in_schema(self, typename):
 
-        for et in self.EntityTypes:
-            if et.Name == typename:
-                return True
-
-        for ct in self.ComplexTypes:
-            if ct.Name == typename:
-                return True
-
-        for ent in self.EnumTypes:
-            if ent.Name == typename:
-                return True
+        return self.get_resource_type_obj_by_typename(typename) is not None
 
-        for action in self.Actions:
-            if action.Name == typename:
-                return True
-
-        return False
+    ###############################################################################################
+    # Name: get_typenames()
+    #   Returns the Names of all the Types (Entity, Complex, Enum, Action) within the Schema element
+    ###############################################################################################
+    def get_typenames(self):
+        typenames = set(self.EntityTypeIndex)
+        typenames.update(self.ComplexTypeIndex, self.EnumTypeIndex, self.ActionIndex)
+        return typenames
 
 
 ###################################################################################################
@@ -241,6 +236,9 @@ class CommonType:
         self.Annotations = []
         self.Properties = []
         self.NavigationProperties = []   
+        ## Name -> first Property / NavigationProperty of that Name
+        self.PropertyIndex = dict()
+        self.NavigationPropertyIndex = dict()
 
     ###############################################################################################
     # Name: add_annotation(annotation)
@@ -255,6 +253,7 @@ class CommonType:
     ###############################################################################################
     def add_property(self, property):
         self.Properties.append(property)
+        self.PropertyIndex.setdefault(property.Name, property)
 
     ###############################################################################################
     # Name: add_navigationproperty(navigationproperty)
@@ -262,6 +261,7 @@ class CommonType:
     ###############################################################################################
     def add_navigationproperty(self, navigationproperty):
         self.NavigationProperties.append(navigationproperty)
+        self.NavigationPropertyIndex.setdefault(navigationproperty.Name, navigationproperty)
 
     ###############################################################################################
     # Name: yeild_navigationproperty
@@ -430,6 +430,11 @@ class SchemaModel:
         self.FullRedfishSchemas = [] 
         ## list of Collection tpyes in the schemas
         self.collections = []
+        ## Namespace -> Schema elements of that Namespace, the first one of each DataServices in
+        ## RedfishSchemas order (the one find_ns_in_dataservices returns)
+        self.NamespaceIndex = dict()
+        ## (Namespace, typename) -> (Schema, Type) that a search of RedfishSchemas in order finds
+        self.TypeIndex = dict()
         self.log = log
         self.CommonRedfishResourceProperties = ['Id', 'Name', 'Description', 'Status', 'Links', 'Members', 'RelatedItem' , 'Actions', 'Oem' , 'OEM']
 
@@ -442,6 +447,19 @@ class SchemaModel:
     def map_element_to_csdlnamespace(self, element_tag):
         return csdlNamespace[element_tag] + element_tag
 
+    ###############################################################################################
+    # Name: index_dataservices(dataservices)
+    #   Takes a DataServices element appended to RedfishSchemas and adds its Schemas and their Types
+    #   to NamespaceIndex and TypeIndex. DataServices must be indexed in RedfishSchemas order.
+    ###############################################################################################
+    def index_dataservices(self, dataservices):
+        for schema in dataservices.Schemas:
+            if dataservices.find_ns_in_dataservices(schema.Namespace) is not schema:
+                continue
+            self.NamespaceIndex.setdefault(schema.Namespace, []).append(schema)
+            for typename in schema.get_typenames():
+                self.TypeIndex.setdefault((schema.Namespace, typename), (schema, schema.get_resource_type_obj_by_typename(typename)))
+
     ###############################################################################################
     # Name: verify_resource_metadata_reference(resource_namespace, resource_typename, metadata)
     #   Takes resource's namespace, its typename (@odata.type: namespace.typename) and the metadata 
@@ -479,22 +497,18 @@ class SchemaModel:
     #   True if found 
     ###############################################################################################
     def verify_property_in_resource(self, xtype, property_name, resource_namespace = None):
-        for property in xtype.Properties:
-            if property.Name == property_name:
-                return True
+        if property_name in xtype.PropertyIndex:
+            return True
 
-        for navproperty in xtype.NavigationProperties:
-            if navproperty.Name == property_name:
-                return True
+        if property_name in xtype.NavigationPropertyIndex:
+            return True
 
         if resource_namespace:
-            for complextype in resource_namespace.ComplexTypes:
-                if complextype.Name == property_name:
-                    return True
+            if property_name in resource_namespace.ComplexTypeIndex:
+                return True
             ## also action?
-            for action in resource_namespace.Actions:
-                if action.Name  == property_name:
-                    return True
+            if property_name in resource_namespace.ActionIndex:
+                return True
         return False
 
     ###############################################################################################
@@ -507,17 +521,14 @@ class SchemaModel:
     #   True if found 
     ###############################################################################################
     def verify_property_in_resource_recur(self, xtype, property_name, resource_namespace = None):
-        for property in xtype.Properties:
-            if property.Name == property_name:
-                return True
-        for navproperty in xtype.NavigationProperties:
-            if navproperty.Name == property_name:
-                return True
+        if property_name in xtype.PropertyIndex:
+            return True
+        if property_name in xtype.NavigationPropertyIndex:
+            return True
 
         if resource_namespace:
-            for complextype in resource_namespace.ComplexTypes:
-                if complextype.Name == property_name:
-                    return True
+            if property_name in resource_namespace.ComplexTypeIndex:
+                return True
  #Removing action as discussed with the Intel meeting - Fatima
             ## also action?
             '''
@@ -556,13 +567,10 @@ for action in resource_namespace.Actions:
             namespace = split_type[0]
             typename = split_type[1] 
 
-            for rf_schema in self.RedfishSchemas:
-                ns = rf_schema.find_ns_in_dataservices(namespace)
-                if ns:
-                    namespace_found = True
-                    if ns.get_resource_type_obj_by_typename(typename):
-                        type_found = True
-                        return namespace_found, type_found
+            if namespace in self.NamespaceIndex:
+                namespace_found = True
+                if (namespace, typename) in self.TypeIndex:
+                    type_found = True
         
         return namespace_found, type_found
 
@@ -585,13 +593,8 @@ for action in resource_namespace.Actions:
             namespace = split_type[0]
             typename = split_type[1] 
 
-            for rf_schema in self.RedfishSchemas:
-                namespace_ = rf_schema.find_ns_in_dataservices(namespace)
-                if namespace_:
-                    #find namespace
-                    typename_ = namespace_.get_resource_type_obj_by_typename(typename)
-                    if typename_:
-                        return namespace_, typename_
+            if (namespace, typename) in self.TypeIndex:
+                return self.TypeIndex[(namespace, typename)]
                 
         return None, None
     
@@ -619,11 +622,11 @@ for action in resource_namespace.Actions:
                 namespace = split_type[0]
                 typename = split_type[1] 
 
-                for rf_schema in self.RedfishSchemas:
-                    ns = rf_schema.find_ns_in_dataservices(namespace)
-                    if ns:
-                        resource_type = ns.get_resource_type_obj_by_typename(typename)
-                        return resource_type        
+                # the first Schema of the namespace decides, as a search of RedfishSchemas would
+                if namespace in self.NamespaceIndex:
+                    ns = self.NamespaceIndex[namespace][0]
+                    resource_type = ns.get_resource_type_obj_by_typename(typename)
+                    return resource_type        
                                       
             return None
 
@@ -638,10 +641,9 @@ for action in resource_namespace.Actions:
     ###############################################################################################
     def verify_action_name_recur(self, namespace, typename, resource_action):    
         if namespace.Actions:
-            for action in namespace.Actions:
-                contextprop_form = '#'+ namespace.Namespace +'.' + action.Name 
-                if contextprop_form == resource_action:
-                    return True
+            contextprop_prefix = '#'+ namespace.Namespace +'.'
+            if resource_action.startswith(contextprop_prefix) and resource_action[len(contextprop_prefix):] in namespace.ActionIndex:
+                return True
         else:
             if typename.BaseType:
                 namespace_, typename_ = self.get_resource_namespace_typename(typename.BaseType)
@@ -795,6 +797,144 @@ for action in resource_namespace.Actions:
             print('No data provided to serialize Redfish schemas')
             exit(0)
 
+    ###############################################################################################
+    # Name: serialize_schema_stream(schema_file = None, schema_payload = None, schema_uri = None)
+    #   Takes either xml schema document file (a path, or a binary file object w/schema_uri) or
+    #   schema_payload w/schema_uri, like serialize_schema(), and serializes it into the same elements in a single pass of an incremental parser instead
+    #   of a whole Element tree. Each Reference and each EntityType, ComplexType, Action and EnumType
+    #   of a Schema is serialized as soon as its end tag is parsed and then dropped from the tree,
+    #   so only one such element is held in memory at a time. It prints what serialize_schema() does.
+    ###############################################################################################
+    def serialize_schema_stream(self, schema_file = None, schema_payload = None, schema_uri = None):
+        if schema_file:
+            source = schema_file
+            schema_uri = schema_uri or schema_file
+        elif schema_payload and schema_uri:
+            source = io.BytesIO(schema_payload.strip(b'\x00'))
+        else:
+            print('No data provided to serialize Redfish schemas')
+            exit(0)
+
+        reference_tag = self.map_element_to_csdlnamespace('Reference')
+        dataservices_tag = self.map_element_to_csdlnamespace('DataServices')
+        schema_tag = self.map_element_to_csdlnamespace('Schema')
+        element_serializers = {
+            self.map_element_to_csdlnamespace('EntityType'): self.serialize_entitytype_element,
+            self.map_element_to_csdlnamespace('ComplexType'): self.serialize_complextype_element,
+            self.map_element_to_csdlnamespace('Action'): self.serialize_action_element,
+            self.map_element_to_csdlnamespace('EnumType'): self.serialize_enumtype_element}
+
+        # tags from the root element to the one being parsed
+        path = []
+        added_edmx = None
+        # the DataServices tag serialized (the first one, as serialize_dataservices() does) and the
+        # Schema tag within it being parsed
+        dataservices = added_dataservice = None
+        schema = added_schema = None
+        for event, element in ET.iterparse(source, events=('start', 'end')):
+            if event == 'start':
+                path.append(element)
+                if len(path) == 1:
+                    added_edmx = Edmx(schema_uri, element.tag, element.attrib.get('Version'))
+                    print("\nroot element: %s" % element.tag)
+                    print("root element attribute: %s" % element.attrib)
+                    self.FullRedfishSchemas.append(added_edmx)
+                elif len(path) == 2 and element.tag == dataservices_tag and dataservices is None:
+                    dataservices = element
+                    added_dataservice = DataServices(schema_uri)
+                    self.RedfishSchemas.append(added_dataservice)
+                    added_edmx.add_dataservice(added_dataservice)
+                elif len(path) == 3 and path[1] is dataservices and element.tag == schema_tag:
+                    schema = element
+                    added_schema = Schema(element.attrib['Namespace'], schema_uri)
+                    added_dataservice.add_schema(added_schema)
+                    print ("added namepace %s" % added_schema.Namespace)
+                continue
+
+            path.pop()
+            if not path:
+                break
+            parent = path[-1]
+            if len(path) == 1:
+                if element.tag == reference_tag:
+                    self.serialize_reference(element, added_edmx)
+                elif element is dataservices:
+                    self.index_dataservices(added_dataservice)
+            elif element is schema:
+                self.print_schema_types(added_schema)
+                schema = added_schema = None
+            elif parent is schema:
+                if element.tag in element_serializers:
+                    element_serializers[element.tag](element, added_schema)
+            elif parent is not dataservices:
+                # part of an element serialized once its own end tag is parsed
+                continue
+            # the parser may have read past this element already, it is not always the last child
+            parent.remove(element)
+            element.clear()
+
+    ###############################################################################################
+    # Name: print_schema_types(added_schema)
+    #   Prints the Types serialized in a Schema element, as serialize_dataservices() does while
+    #   serializing them
+    ###############################################################################################
+    def print_schema_types(self, added_schema):
+        for added_entity in added_schema.EntityTypes:
+            print("added EntityType: %s BaseType: %s to Namespace: %s" % (\
+                                added_entity.Name,\
+                                added_entity.BaseType,\
+                                added_schema.Namespace))
+        for added_complextype in added_schema.ComplexTypes:
+            print("added ComplexType: %s BaseType: %s to Namespace: %s" % (\
+                                added_complextype.Name,\
+                                added_complextype.BaseType,\
+                                added_schema.Namespace))
+        for added_action in added_schema.Actions:
+            print("added Action: %s to Namespace: %s" % (added_action.Name, added_schema.Namespace))
+        for added_enumtype in added_schema.EnumTypes:
+            print("added EnumType: %s to Namespace %s" % (\
+                                added_enumtype.Name,\
+                                added_schema.Namespace))
+
+    ###############################################################################################
+    # Name: serialize_schema_source(schema_source, workers = 1)
+    #   Takes a schema source (see rf_schema_source) and serializes its CSDL documents with
+    #   serialize_schema_stream(), one after another. With more than one worker the documents are
+    #   parsed in a pool of that many processes (see serialize_schema_member()) and their
+    #   Edmx/DataServices elements are appended to FullRedfishSchemas/RedfishSchemas, indexed, and
+    #   their console output printed in the order of the source, so the model is the same as the
+    #   one serialized on one core.
+    ###############################################################################################
+    def serialize_schema_source(self, schema_source, workers = 1):
+        names = schema_source.csdl_names()
+        if workers <= 1 or len(names) <= 1:
+            for name in names:
+                with schema_source.open_csdl(name) as schema_file:
+                    self.serialize_schema_stream(schema_file, schema_uri = schema_source.csdl_uri(name))
+            return
+
+        chunksize = max(1, len(names) // (workers * 4))
+        # the elements received from the workers are a large graph of small objects; collecting
+        # while they are created only slows the merge down
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=set_worker_schema_source,
+                                     initargs=(schema_source,)) as executor:
+                for full_schemas, schemas, collections, output, exit_code in executor.map(
+                        serialize_schema_member, names, chunksize=chunksize):
+                    sys.stdout.write(output)
+                    if exit_code is not None:
+                        exit(exit_code)
+                    self.FullRedfishSchemas.extend(full_schemas)
+                    self.collections.extend(collections)
+                    for dataservices in schemas:
+                        self.RedfishSchemas.append(dataservices)
+                        self.index_dataservices(dataservices)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
     ###############################################################################################
     # Name: serialize_edmx(schema_root, schema_uri)
     #   Takes schema root element to find edmx element, then serialize it according to csdl. Edmx 
@@ -816,23 +956,31 @@ for action in resource_namespace.Actions:
             # Parse nested tags...
             reference_tag = self.map_element_to_csdlnamespace('Reference')
             for reference in schema_root.findall(reference_tag):
-                added_reference = Reference(reference.attrib['Uri'])
-                # appends Reference to Edmx element 
-                added_edmx.add_reference(added_reference)
-                #has one or more nested include elements
-                include_tag = self.map_element_to_csdlnamespace('Include')
-                for include in reference.findall(include_tag):
-                    if 'Alias' in include.attrib:
-                        added_include = Include(include.attrib['Namespace'], include.attrib['Alias'])
-                        # appends Include to Reference element
-                        added_reference.add_include(added_include)
-                    else:
-                        added_include = Include(include.attrib['Namespace'])
-                        # appends Include to Reference element
-                        added_reference.add_include(added_include)  
+                self.serialize_reference(reference, added_edmx)
 
             self.serialize_dataservices(schema_root, added_edmx, schema_uri)
 
+    ###############################################################################################
+    # Name: serialize_reference(reference, added_edmx)
+    #   Takes a Reference tag and instance of Edmx element, serializes the Reference with its
+    #   Include elements and appends it to Edmx element
+    ###############################################################################################
+    def serialize_reference(self, reference, added_edmx):
+        added_reference = Reference(reference.attrib['Uri'])
+        # appends Reference to Edmx element 
+        added_edmx.add_reference(added_reference)
+        #has one or more nested include elements
+        include_tag = self.map_element_to_csdlnamespace('Include')
+        for include in reference.findall(include_tag):
+            if 'Alias' in include.attrib:
+                added_include = Include(include.attrib['Namespace'], include.attrib['Alias'])
+                # appends Include to Reference element
+                added_reference.add_include(added_include)
+            else:
+                added_include = Include(include.attrib['Namespace'])
+                # appends Include to Reference element
+                added_reference.add_include(added_include)  
+
 
     ###############################################################################################
     # Name: serialize_dataservices(schema_root, added_edmx, schema_uri)
@@ -861,6 +1009,7 @@ for action in resource_namespace.Actions:
                 self.serialize_action(schema, added_schema)
                 #serialize enumtype within namespace
                 self.serialize_enumtype(schema, added_schema)
+            self.index_dataservices(added_dataservice)
 
     ###############################################################################################
     # Name: serialize_entitytype(schema, added_schema)
@@ -870,32 +1019,42 @@ for action in resource_namespace.Actions:
     def serialize_entitytype(self, schema, added_schema):
         entitytype_tag = self.map_element_to_csdlnamespace('EntityType')
         for et in schema.findall(entitytype_tag):
-            if 'BaseType' in et.attrib:
-                added_entity = EntityType(et.attrib['Name'], et.attrib['BaseType'])
-                # add EntityType to a Schema element
-                added_schema.add_entitytype(added_entity)    
-            else:
-                added_entity = EntityType(et.attrib['Name'])
-                added_schema.add_entitytype(added_entity)
-
-            if added_entity:
-                #1.  annotation in entitytype
-                annotation = self.parse_annotation_tag(et)
-                for term, attr_key, attr_value in annotation:
-                    added_annotation = Annotation(term, attr_key, attr_value)
-                    added_entity.add_annotation(added_annotation)
-
-                #2.  properties in entitytype
-                self.serialize_property(et, added_entity)
-               
-                #3.navigationproperty in entitytype
-                self.serialize_navigationproperty(et, added_entity)
-
+            added_entity = self.serialize_entitytype_element(et, added_schema)
             print("added EntityType: %s BaseType: %s to Namespace: %s" % (\
                                 added_entity.Name,\
                                 added_entity.BaseType,\
                                 added_schema.Namespace))
 
+    ###############################################################################################
+    # Name: serialize_entitytype_element(et, added_schema)
+    #   Takes an EntityType tag and instance of Schema element, serializes the EntityType with its
+    #   annotations, properties and navigation properties and appends it to Schema element.
+    # Return:
+    #   the EntityType element
+    ###############################################################################################
+    def serialize_entitytype_element(self, et, added_schema):
+        if 'BaseType' in et.attrib:
+            added_entity = EntityType(et.attrib['Name'], et.attrib['BaseType'])
+            # add EntityType to a Schema element
+            added_schema.add_entitytype(added_entity)    
+        else:
+            added_entity = EntityType(et.attrib['Name'])
+            added_schema.add_entitytype(added_entity)
+
+        if added_entity:
+            #1.  annotation in entitytype
+            annotation = self.parse_annotation_tag(et)
+            for term, attr_key, attr_value in annotation:
+                added_annotation = Annotation(term, attr_key, attr_value)
+                added_entity.add_annotation(added_annotation)
+
+            #2.  properties in entitytype
+            self.serialize_property(et, added_entity)
+           
+            #3.navigationproperty in entitytype
+            self.serialize_navigationproperty(et, added_entity)
+        return added_entity
+
 
     ###############################################################################################
     # Name: serialize_complextype(schema, added_schema)
@@ -904,33 +1063,45 @@ for action in resource_namespace.Actions:
     ###############################################################################################
     def serialize_complextype(self, schema, added_schema):
         complextype_tag = self.map_element_to_csdlnamespace('ComplexType')
+        added_complextype = None
         for ct in schema.findall(complextype_tag):
-            if 'Name' in ct.attrib and 'BaseType' in ct.attrib:
-                added_complextype = ComplexType(ct.attrib['Name'], ct.attrib['BaseType'])
-                # add ComplexType to a Schema element
-                added_schema.add_complextype(added_complextype)
-
-            elif 'Name' in ct.attrib:
-                added_complextype = ComplexType(ct.attrib['Name'])
-                added_schema.add_complextype(added_complextype)
-
-            if added_complextype:
-                #1.  annotation in complextype
-                annotation = self.parse_annotation_tag(ct)
-                for term, attr_key, attr_value in annotation:    
-                    added_annotation = Annotation(term, attr_key, attr_value)
-                    added_complextype.add_annotation(added_annotation)
-                #2.  properties in complextype
-                self.serialize_property(ct, added_complextype)
-                                                           
-                #3.navigationproperty in complextype
-                self.serialize_navigationproperty(ct, added_complextype)
-
+            added_complextype = self.serialize_complextype_element(ct, added_schema) or added_complextype
             print("added ComplexType: %s BaseType: %s to Namespace: %s" % (\
                                                             added_complextype.Name,\
                                                             added_complextype.BaseType,\
                                                             added_schema.Namespace))  
 
+    ###############################################################################################
+    # Name: serialize_complextype_element(ct, added_schema)
+    #   Takes a ComplexType tag and instance of Schema element, serializes the ComplexType with its
+    #   annotations, properties and navigation properties and appends it to Schema element.
+    # Return:
+    #   the ComplexType element, None if the tag has no Name
+    ###############################################################################################
+    def serialize_complextype_element(self, ct, added_schema):
+        added_complextype = None
+        if 'Name' in ct.attrib and 'BaseType' in ct.attrib:
+            added_complextype = ComplexType(ct.attrib['Name'], ct.attrib['BaseType'])
+            # add ComplexType to a Schema element
+            added_schema.add_complextype(added_complextype)
+
+        elif 'Name' in ct.attrib:
+            added_complextype = ComplexType(ct.attrib['Name'])
+            added_schema.add_complextype(added_complextype)
+
+        if added_complextype:
+            #1.  annotation in complextype
+            annotation = self.parse_annotation_tag(ct)
+            for term, attr_key, attr_value in annotation:    
+                added_annotation = Annotation(term, attr_key, attr_value)
+                added_complextype.add_annotation(added_annotation)
+            #2.  properties in complextype
+            self.serialize_property(ct, added_complextype)
+                                                       
+            #3.navigationproperty in complextype
+            self.serialize_navigationproperty(ct, added_complextype)
+        return added_complextype
+
 
     ###############################################################################################
     # Name: serialize_action(schema, added_schema)
@@ -940,28 +1111,38 @@ for action in resource_namespace.Actions:
     def serialize_action(self, schema, added_schema):
         action_tag = self.map_element_to_csdlnamespace('Action')
         for action in schema.findall(action_tag):
-            if 'IsBound' in action.attrib:
-                added_action = Action(action.attrib['Name'], action.attrib['IsBound'])
-            else:
-                added_action = Action(action.attrib['Name'])
-            # add action to Schema element
-            added_schema.add_action(added_action)
-            
-            if added_action:
-                #1.  annotations within action
-                annotation = self.parse_annotation_tag(action)
-                for term, attr_key, attr_value in annotation:    
-                    added_annotation = Annotation(term, attr_key, attr_value)
-                    added_action.add_annotation(added_annotation)
-
-                #2.paramters within action 
-                # annotation found in certain schemas within parameter but not specified in spec..
-                parameter_tag = self.map_element_to_csdlnamespace('Parameter')
-                for parameter in action.findall(parameter_tag):
-                    added_parameter = Parameter(parameter.attrib['Name'], parameter.attrib['Type'])
-                    added_action.add_parameter(added_parameter)
-
+            added_action = self.serialize_action_element(action, added_schema)
             print("added Action: %s to Namespace: %s" % (added_action.Name, added_schema.Namespace))
+
+    ###############################################################################################
+    # Name: serialize_action_element(action, added_schema)
+    #   Takes an Action tag and instance of Schema element, serializes the Action with its
+    #   annotations and parameters and appends it to Schema element.
+    # Return:
+    #   the Action element
+    ###############################################################################################
+    def serialize_action_element(self, action, added_schema):
+        if 'IsBound' in action.attrib:
+            added_action = Action(action.attrib['Name'], action.attrib['IsBound'])
+        else:
+            added_action = Action(action.attrib['Name'])
+        # add action to Schema element
+        added_schema.add_action(added_action)
+        
+        if added_action:
+            #1.  annotations within action
+            annotation = self.parse_annotation_tag(action)
+            for term, attr_key, attr_value in annotation:    
+                added_annotation = Annotation(term, attr_key, attr_value)
+                added_action.add_annotation(added_annotation)
+
+            #2.paramters within action 
+            # annotation found in certain schemas within parameter but not specified in spec..
+            parameter_tag = self.map_element_to_csdlnamespace('Parameter')
+            for parameter in action.findall(parameter_tag):
+                added_parameter = Parameter(parameter.attrib['Name'], parameter.attrib['Type'])
+                added_action.add_parameter(added_parameter)
+        return added_action
                       
     ###############################################################################################
     # Name: serialize_enumtype(schema, added_schema)
@@ -971,31 +1152,41 @@ for action in resource_namespace.Actions:
     def serialize_enumtype(self, schema, added_schema):
         enumtype_tag = self.map_element_to_csdlnamespace('EnumType')
         for ent in schema.findall(enumtype_tag):
-            added_enumtype = EnumType(ent.attrib['Name'])
-            # add EnumType to Schema element
-            added_schema.add_enumtype(added_enumtype)
-
-            if added_enumtype:
-                #1.  annotation in enumtype
-                annotation = self.parse_annotation_tag(ent)
-                for term, attr_key, attr_value in annotation:    
-                    added_annotation = Annotation(term, attr_key, attr_value)
-                    added_enumtype.add_annotation(added_annotation)
-
-                #2.  members in enumtype
-                member_tag = self.map_element_to_csdlnamespace('Member')
-                for members in ent.findall(member_tag):
-                    added_member = Member(members.attrib['Name'])
-                    added_enumtype.add_member(added_member)
-
-                    annotation = self.parse_annotation_tag(members)
-                    for term, attr_key, attr_value in annotation:    
-                        added_annotation = Annotation(term, attr_key, attr_value)
-                        added_member.add_annotation(added_annotation)
-
+            added_enumtype = self.serialize_enumtype_element(ent, added_schema)
             print("added EnumType: %s to Namespace %s" % (\
                                                             added_enumtype.Name,\
                                                             added_schema.Namespace))      
+
+    ###############################################################################################
+    # Name: serialize_enumtype_element(ent, added_schema)
+    #   Takes an EnumType tag and instance of Schema element, serializes the EnumType with its
+    #   annotations and members and appends it to Schema element.
+    # Return:
+    #   the EnumType element
+    ###############################################################################################
+    def serialize_enumtype_element(self, ent, added_schema):
+        added_enumtype = EnumType(ent.attrib['Name'])
+        # add EnumType to Schema element
+        added_schema.add_enumtype(added_enumtype)
+
+        if added_enumtype:
+            #1.  annotation in enumtype
+            annotation = self.parse_annotation_tag(ent)
+            for term, attr_key, attr_value in annotation:    
+                added_annotation = Annotation(term, attr_key, attr_value)
+                added_enumtype.add_annotation(added_annotation)
+
+            #2.  members in enumtype
+            member_tag = self.map_element_to_csdlnamespace('Member')
+            for members in ent.findall(member_tag):
+                added_member = Member(members.attrib['Name'])
+                added_enumtype.add_member(added_member)
+
+                annotation = self.parse_annotation_tag(members)
+                for term, attr_key, attr_value in annotation:    
+                    added_annotation = Annotation(term, attr_key, attr_value)
+                    added_member.add_annotation(added_annotation)
+        return added_enumtype
                 
 
     ###############################################################################################
@@ -1058,3 +1249,101 @@ for action in resource_namespace.Actions:
 
 
                     
+
+
+## schema source of the CSDL documents parsed by a worker process of serialize_schema_source()
+worker_schema_source = None
+
+###################################################################################################
+# Name: set_worker_schema_source(schema_source)
+#   Runs once in each worker process of SchemaModel.serialize_schema_source(), keeping the schema
+#   source the worker reads the CSDL documents from
+###################################################################################################
+def set_worker_schema_source(schema_source):
+    global worker_schema_source
+    worker_schema_source = schema_source
+
+###################################################################################################
+# Name: serialize_schema_member(name)
+#   Runs in a worker process of SchemaModel.serialize_schema_source(): serializes one CSDL document
+#   of the schema source into a SchemaModel of its own, capturing what it prints
+# Return:
+#   the FullRedfishSchemas, RedfishSchemas and collections lists of that model, the console
+#   output and the exit code if serialize_schema_stream() exited (else None)
+###################################################################################################
+def serialize_schema_member(name):
+    schema_model = SchemaModel()
+    exit_code = None
+    stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        with worker_schema_source.open_csdl(name) as schema_file:
+            schema_model.serialize_schema_stream(schema_file, schema_uri = worker_schema_source.csdl_uri(name))
+    except SystemExit as err:
+        exit_code = err.code
+    finally:
+        output = sys.stdout.getvalue()
+        sys.stdout = stdout
+    return schema_model.FullRedfishSchemas, schema_model.RedfishSchemas, schema_model.collections, output, exit_code
+
+###################################################################################################
+# Name: schema_bundle_hash(content_hash)
+#   Takes the content hash of the CSDL documents of a schema source and combines it with the
+#   source of this module, so that a snapshot is rebuilt whenever a schema document or the classes
+#   it holds change
+# Return:
+#   hex digest string
+###################################################################################################
+def schema_bundle_hash(content_hash):
+    bundle_hash = hashlib.sha256()
+    with open(os.path.abspath(__file__.replace('.pyc', '.py')), 'rb') as f:
+        bundle_hash.update(f.read())
+    bundle_hash.update(content_hash.encode('utf-8'))
+    return bundle_hash.hexdigest()
+
+###################################################################################################
+# Name: save_schema_model_snapshot(schema_model, snapshot_path, bundle_hash)
+#   Writes the SchemaModel (with its indexes) to snapshot_path along with the hash of the schema
+#   files it was serialized from
+###################################################################################################
+def save_schema_model_snapshot(schema_model, snapshot_path, bundle_hash):
+    tmp_path = '%s.%d.tmp' % (snapshot_path, os.getpid())
+    log = schema_model.log
+    schema_model.log = None
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((bundle_hash, schema_model), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot_path)
+    except (IOError, OSError, pickle.PicklingError) as err:
+        print('Unable to save the CSDL schema snapshot %s: %s' % (snapshot_path, err))
+        if os.path.isfile(tmp_path):
+            os.remove(tmp_path)
+    finally:
+        schema_model.log = log
+
+###################################################################################################
+# Name: load_schema_model_snapshot(snapshot_path, bundle_hash)
+#   Loads the SchemaModel saved in snapshot_path if it was serialized from schema files with the
+#   given hash
+# Return:
+#   the SchemaModel, or None if there is no usable snapshot
+###################################################################################################
+def load_schema_model_snapshot(snapshot_path, bundle_hash):
+    if not os.path.isfile(snapshot_path):
+        return None
+    # the model is a large graph of small objects; collecting while they are created only slows
+    # the load down
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(snapshot_path, 'rb') as f:
+            snapshot_hash, schema_model = pickle.load(f)
+    except Exception as err:
+        print('Unable to load the CSDL schema snapshot %s: %s' % (snapshot_path, err))
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if snapshot_hash != bundle_hash or not isinstance(schema_model, SchemaModel):
+        return None
+    return schema_model
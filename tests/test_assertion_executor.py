@@ -0,0 +1,109 @@
+# Copyright Notice:
+# Copyright 2016-2019 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Service-Conformance-Check/blob/main/LICENSE.md
+
+###################################################################################################
+# File: test_assertion_executor.py
+#   Tests of rfs_test.assertion_executor: assertions run concurrently are logged in the order they
+#   are listed, and a mutating assertion runs alone
+###################################################################################################
+
+import time
+import threading
+import unittest
+
+from rfs_test import assertion_executor
+from rfs_test import assertion_registry
+
+
+class RecordingLog:
+    PASS = 'PASS'
+    WARN = 'WARN'
+    FAIL = 'FAIL'
+    INFO = 'INFO'
+    INCOMPLETE = 'INCOMPLETE'
+
+    def __init__(self):
+        self.AssertionID = None
+        self.TextLogPath = None
+        self.lines = []
+
+    def assertion_log(self, log_control, log_string, SUT_prop = None, service_root = None):
+        self.lines.append((self.AssertionID, log_control, log_string))
+        return 1
+
+    def status_fixup(self, assertion_status, assertion_status_):
+        return assertion_status_ if assertion_status == self.PASS else assertion_status
+
+
+class StubSUT:
+    def __init__(self, workers):
+        self.SUT_prop = {'DisplayName': 'test', 'DnsName': 'localhost', 'AssertionWorkers': str(workers)}
+
+
+running = set()
+running_lock = threading.Lock()
+seen_running = dict()
+
+def logging_assertion(assertion_id, seconds):
+    def assertion(sut, log):
+        with running_lock:
+            running.add(assertion_id)
+        log.AssertionID = assertion_id
+        log.assertion_log('BEGIN_ASSERTION', None)
+        time.sleep(seconds)
+        log.assertion_log('line', 'checked %s' % assertion_id)
+        log.assertion_log(log.PASS, None)
+        with running_lock:
+            running.discard(assertion_id)
+        return log.PASS
+    assertion.__name__ = 'Assertion_test_%s' % assertion_id.replace('.', '_')
+    return assertion
+
+@assertion_registry.register('99.2', mutates=True)
+def Assertion_test_99_2(sut, log):
+    with running_lock:
+        seen_running['99.2'] = set(running)
+    log.AssertionID = '99.2'
+    log.assertion_log('BEGIN_ASSERTION', None)
+    log.assertion_log(log.PASS, None)
+    return log.PASS
+
+
+class AssertionExecutorTest(unittest.TestCase):
+    def expected_lines(self, assertion_ids):
+        lines = []
+        for assertion_id in assertion_ids:
+            lines.append((assertion_id, 'BEGIN_ASSERTION', None))
+            if assertion_id != '99.2':
+                lines.append((assertion_id, 'line', 'checked %s' % assertion_id))
+            lines.append((assertion_id, 'PASS', None))
+        return lines
+
+    def test_logs_replayed_in_list_order(self):
+        # the first listed finishes last
+        assertions = [logging_assertion('99.1.1', 0.5), logging_assertion('99.1.2', 0.3), logging_assertion('99.1.3', 0)]
+        log = RecordingLog()
+        start = time.time()
+        assertion_executor.run_assertions(StubSUT(3), log, assertions)
+        # run one after another they would take 0.8s
+        self.assertLess(time.time() - start, 0.7)
+        self.assertEqual(log.lines, self.expected_lines(['99.1.1', '99.1.2', '99.1.3']))
+
+    def test_mutating_assertion_runs_alone(self):
+        assertions = [logging_assertion('99.1.1', 0.2), logging_assertion('99.1.2', 0), Assertion_test_99_2,
+                      logging_assertion('99.3', 0.1)]
+        log = RecordingLog()
+        assertion_executor.run_assertions(StubSUT(3), log, assertions)
+        self.assertEqual(seen_running['99.2'], set())
+        self.assertEqual(log.lines, self.expected_lines(['99.1.1', '99.1.2', '99.2', '99.3']))
+
+    def test_one_worker_runs_in_list_order(self):
+        assertions = [logging_assertion('99.1.1', 0.1), logging_assertion('99.1.2', 0)]
+        log = RecordingLog()
+        assertion_executor.run_assertions(StubSUT(1), log, assertions)
+        self.assertEqual(log.lines, self.expected_lines(['99.1.1', '99.1.2']))
+
+
+if __name__ == '__main__':
+    unittest.main()
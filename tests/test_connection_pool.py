@@ -0,0 +1,87 @@
+# Copyright Notice:
+# Copyright 2016-2019 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Service-Conformance-Check/blob/main/LICENSE.md
+
+###################################################################################################
+# File: test_connection_pool.py
+#   Tests of rf_utility.ConnectionPool: a request failing on a stale reused connection is sent again
+#   on a fresh connection only if that cannot change the service twice
+###################################################################################################
+
+import unittest
+from collections import OrderedDict
+try:
+    from http.client import RemoteDisconnected
+except ImportError:
+    from httplib import BadStatusLine as RemoteDisconnected
+
+import rf_utility
+
+
+class FakeResponse:
+    status = 200
+
+
+class FakeConnection:
+    # fail_on: 'send' to fail while the request is sent, 'response' once it has been sent, None never
+    def __init__(self, fail_on = None):
+        self.fail_on = fail_on
+        self.requests = []
+        self.closed = False
+
+    def request(self, method, url, headers = None, body = None):
+        if self.fail_on == 'send':
+            raise ConnectionResetError('stale connection')
+        self.requests.append((method, url))
+
+    def getresponse(self):
+        if self.fail_on == 'response':
+            raise RemoteDisconnected('Remote end closed connection without response')
+        return FakeResponse()
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolRetryTest(unittest.TestCase):
+    def make_pool(self, fail_on):
+        pool = rf_utility.ConnectionPool(OrderedDict([('DisplayName', 'test'), ('DnsName', 'localhost')]))
+        self.stale = FakeConnection(fail_on)
+        self.fresh = []
+        pool.checkout = lambda scheme, netloc: (self.stale, True)
+
+        def connect(scheme, netloc):
+            self.fresh.append(FakeConnection())
+            return self.fresh[-1]
+        pool.connect = connect
+        return pool
+
+    def test_idempotent_request_is_sent_again(self):
+        for method in ('GET', 'HEAD', 'OPTIONS'):
+            pool = self.make_pool('response')
+            response, server_connection = pool.request('https', 'localhost', method, '/redfish/v1/', {}, None)
+            self.assertEqual(response.status, 200)
+            self.assertIs(server_connection, self.fresh[0])
+            self.assertEqual(self.fresh[0].requests, [(method, '/redfish/v1/')])
+            self.assertTrue(self.stale.closed)
+            self.assertEqual(pool.stats()['Reconnects'], 1)
+
+    def test_sent_non_idempotent_request_is_not_sent_again(self):
+        for method in ('POST', 'PATCH', 'PUT', 'DELETE'):
+            pool = self.make_pool('response')
+            with self.assertRaises(RemoteDisconnected):
+                pool.request('https', 'localhost', method, '/redfish/v1/SessionService/Sessions', {}, '{}')
+            self.assertEqual(self.stale.requests, [(method, '/redfish/v1/SessionService/Sessions')])
+            self.assertEqual(self.fresh, [])
+            self.assertTrue(self.stale.closed)
+            self.assertEqual(pool.stats()['Reconnects'], 0)
+
+    def test_non_idempotent_request_failing_while_sent_is_sent_again(self):
+        pool = self.make_pool('send')
+        response, server_connection = pool.request('https', 'localhost', 'POST', '/redfish/v1/SessionService/Sessions', {}, '{}')
+        self.assertIs(server_connection, self.fresh[0])
+        self.assertEqual(self.fresh[0].requests, [('POST', '/redfish/v1/SessionService/Sessions')])
+
+
+if __name__ == '__main__':
+    unittest.main()
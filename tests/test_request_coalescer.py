@@ -0,0 +1,99 @@
+# Copyright Notice:
+# Copyright 2016-2019 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Service-Conformance-Check/blob/main/LICENSE.md
+
+###################################################################################################
+# File: test_request_coalescer.py
+#   Tests of rf_cache.RequestCoalescer: concurrent callers of the same key share one request and
+#   each gets a response of its own
+###################################################################################################
+
+import time
+import threading
+import unittest
+
+import rf_cache
+
+
+class RequestCoalescerTest(unittest.TestCase):
+    def test_followers_get_private_copies(self):
+        coalescer = rf_cache.RequestCoalescer()
+        calls = []
+        release = threading.Event()
+
+        def request():
+            calls.append(1)
+            release.wait(5)
+            return {'Members': [{'@odata.id': '/redfish/v1/Systems/1'}]}, {'etag': 'W/"1"'}, 200
+
+        responses = []
+        leader_response = []
+
+        def leader():
+            response = coalescer.request('key', request)
+            leader_response.append(response)
+            # the caller changes the payload it got, as assertions do
+            del response[0]['Members'][:]
+
+        def follower():
+            responses.append(coalescer.request('key', request))
+
+        threads = [threading.Thread(target=leader)]
+        threads[0].start()
+        while not calls:
+            time.sleep(0.01)
+        threads += [threading.Thread(target=follower) for i in range(2)]
+        for thread in threads[1:]:
+            thread.start()
+        while coalescer.stats()['Coalesced'] < 2:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(coalescer.stats(), {'Requests': 1, 'Coalesced': 2})
+        self.assertEqual(leader_response[0][0]['Members'], [])
+        self.assertEqual(len(responses), 2)
+        for response in responses:
+            self.assertEqual(response[0]['Members'], [{'@odata.id': '/redfish/v1/Systems/1'}])
+        self.assertIsNot(responses[0][0], responses[1][0])
+
+    def test_followers_get_the_exception(self):
+        coalescer = rf_cache.RequestCoalescer()
+        started = threading.Event()
+        release = threading.Event()
+        errors = []
+
+        def request():
+            started.set()
+            release.wait(5)
+            raise IOError('connection refused')
+
+        def call():
+            try:
+                coalescer.request('key', request)
+            except IOError as err:
+                errors.append(err)
+
+        threads = [threading.Thread(target=call)]
+        threads[0].start()
+        started.wait(5)
+        threads.append(threading.Thread(target=call))
+        threads[1].start()
+        while coalescer.stats()['Coalesced'] < 1:
+            time.sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(errors), 2)
+
+    def test_completed_request_is_not_shared(self):
+        coalescer = rf_cache.RequestCoalescer()
+        self.assertEqual(coalescer.request('key', lambda: 1), 1)
+        self.assertEqual(coalescer.request('key', lambda: 2), 2)
+        self.assertEqual(coalescer.stats(), {'Requests': 2, 'Coalesced': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+# Copyright Notice:
+# Copyright 2016-2019 DMTF. All rights reserved.
+# License: BSD 3-Clause License. For full text see link: https://github.com/DMTF/Redfish-Service-Conformance-Check/blob/main/LICENSE.md
+
+###################################################################################################
+# File: test_schema.py
+#   Tests of schema.SchemaModel: the streaming CSDL serializer builds the model (and prints) what
+#   serialize_schema() does, and a schema model snapshot loads back the same model
+###################################################################################################
+
+import io
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+import schema
+
+CSDL_DOCUMENT = b'''<?xml version="1.0" encoding="UTF-8"?>
+<edmx:Edmx xmlns:edmx="http://docs.oasis-open.org/odata/ns/edmx" Version="4.0">
+  <edmx:Reference Uri="http://redfish.dmtf.org/schemas/v1/Resource_v1.xml">
+    <edmx:Include Namespace="Resource"/>
+    <edmx:Include Namespace="Resource.v1_0_0"/>
+  </edmx:Reference>
+  <edmx:Reference Uri="http://docs.oasis-open.org/odata/odata/v4.0/errata03/csd01/complete/vocabularies/Org.OData.Core.V1.xml">
+    <edmx:Include Namespace="Org.OData.Core.V1" Alias="OData"/>
+  </edmx:Reference>
+  <edmx:DataServices>
+    <Schema xmlns="http://docs.oasis-open.org/odata/ns/edm" Namespace="Widget">
+      <EntityType Name="Widget" BaseType="Resource.v1_0_0.Resource" Abstract="true">
+        <Annotation Term="OData.Description" String="A widget."/>
+      </EntityType>
+    </Schema>
+    <Schema xmlns="http://docs.oasis-open.org/odata/ns/edm" Namespace="Widget.v1_0_0">
+      <EntityType Name="Widget" BaseType="Widget.Widget">
+        <Property Name="Size" Type="Edm.Int64" Nullable="false">
+          <Annotation Term="OData.Permissions" EnumMember="OData.Permission/Read"/>
+        </Property>
+        <Property Name="Color" Type="Widget.v1_0_0.Color"/>
+        <Property Name="Status" Type="Widget.v1_0_0.Status"/>
+        <NavigationProperty Name="Parts" Type="Collection(Resource.Item)" ContainsTarget="true"/>
+      </EntityType>
+      <ComplexType Name="Status">
+        <Property Name="Health" Type="Edm.String"/>
+      </ComplexType>
+      <EnumType Name="Color">
+        <Member Name="Red"/>
+        <Member Name="Blue"/>
+      </EnumType>
+      <Action Name="Spin" IsBound="true">
+        <Parameter Name="Widget" Type="Widget.v1_0_0.Actions"/>
+        <Parameter Name="Speed" Type="Edm.Int64"/>
+      </Action>
+    </Schema>
+  </edmx:DataServices>
+</edmx:Edmx>
+'''
+
+###################################################################################################
+# Name: model_structure(value)
+#   Returns a comparable structure of the objects of a schema model: class name and attributes of
+#   each object, lists and dicts of them; an object met again is represented by its class name
+###################################################################################################
+def model_structure(value, seen = None):
+    if seen is None:
+        seen = set()
+    if isinstance(value, (list, tuple)):
+        return [model_structure(item, seen) for item in value]
+    if isinstance(value, dict):
+        return sorted((repr(key), model_structure(item, seen)) for key, item in value.items())
+    if hasattr(value, '__dict__'):
+        if id(value) in seen:
+            return type(value).__name__
+        seen.add(id(value))
+        return (type(value).__name__, sorted((name, model_structure(item, seen))
+                                             for name, item in vars(value).items() if name != 'log'))
+    return value
+
+def serialize(method, **kwargs):
+    schema_model = schema.SchemaModel()
+    stdout = sys.stdout
+    sys.stdout = io.StringIO()
+    try:
+        getattr(schema_model, method)(**kwargs)
+        output = sys.stdout.getvalue()
+    finally:
+        sys.stdout = stdout
+    return schema_model, output
+
+
+class SerializeSchemaStreamTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.schema_file = os.path.join(self.directory, 'Widget_v1.xml')
+        with open(self.schema_file, 'wb') as f:
+            f.write(CSDL_DOCUMENT)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_stream_matches_tree_from_file(self):
+        tree_model, tree_output = serialize('serialize_schema', schema_file = self.schema_file)
+        stream_model, stream_output = serialize('serialize_schema_stream', schema_file = self.schema_file)
+        self.assertEqual(len(tree_model.RedfishSchemas), 1)
+        self.assertEqual(model_structure(stream_model), model_structure(tree_model))
+        self.assertEqual(stream_output, tree_output)
+
+    def test_stream_matches_tree_from_payload(self):
+        uri = '/redfish/v1/$metadata'
+        tree_model, tree_output = serialize('serialize_schema', schema_payload = CSDL_DOCUMENT, schema_uri = uri)
+        stream_model, stream_output = serialize('serialize_schema_stream', schema_payload = CSDL_DOCUMENT, schema_uri = uri)
+        self.assertEqual(model_structure(stream_model), model_structure(tree_model))
+        self.assertEqual(stream_output, tree_output)
+
+
+class SchemaModelSnapshotTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.snapshot_path = os.path.join(self.directory, 'csdl_schema_model.pickle')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_snapshot_round_trip(self):
+        schema_model, output = serialize('serialize_schema_stream', schema_payload = CSDL_DOCUMENT, schema_uri = 'Widget_v1.xml')
+        schema.save_schema_model_snapshot(schema_model, self.snapshot_path, 'hash-1')
+        loaded = schema.load_schema_model_snapshot(self.snapshot_path, 'hash-1')
+        self.assertIsInstance(loaded, schema.SchemaModel)
+        self.assertEqual(model_structure(loaded), model_structure(schema_model))
+
+    def test_snapshot_of_other_schema_files_is_not_used(self):
+        schema_model, output = serialize('serialize_schema_stream', schema_payload = CSDL_DOCUMENT, schema_uri = 'Widget_v1.xml')
+        schema.save_schema_model_snapshot(schema_model, self.snapshot_path, 'hash-1')
+        self.assertIsNone(schema.load_schema_model_snapshot(self.snapshot_path, 'hash-2'))
+        self.assertIsNone(schema.load_schema_model_snapshot(os.path.join(self.directory, 'missing.pickle'), 'hash-1'))
+
+
+if __name__ == '__main__':
+    unittest.main()